@@ -0,0 +1,120 @@
+"""
+Cache of verified access tokens with the user they resolved to.
+
+Saves decoding the jwt and reading the user from the database on every authenticated request.
+Entries are keyed by a hash of the token, so tokens are not kept in memory, and expire when the token does.
+The cache is per process, so invalidating a user only reaches the worker that made the change. To bound how long
+other workers keep serving a changed user, entries are kept at most max_ttl_seconds.
+
+Size and max ttl are configured with the environment variables TOKEN_CACHE_MAX_SIZE and TOKEN_CACHE_MAX_TTL_SECONDS.
+"""
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from pydantic import BaseSettings, Field
+
+from app.authentication.models.db.user import User
+from app.authentication.models.v1.token import TokenData
+
+
+class TokenCacheSettings(BaseSettings):
+    max_size: int = Field(10000, ge=0)
+    max_ttl_seconds: float = Field(60, ge=0)
+
+    class Config:
+        env_prefix = "TOKEN_CACHE_"
+
+
+class CachedToken(NamedTuple):
+    token_data: TokenData
+    user: User
+    expires_at: float
+
+
+def _key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """Bounded LRU cache of verified tokens, with expiry and invalidation per user."""
+
+    def __init__(self, max_size: int, max_ttl_seconds: float):
+        self._max_size = max_size
+        self._max_ttl_seconds = max_ttl_seconds
+        self._entries: OrderedDict[str, CachedToken] = OrderedDict()
+        self._keys_by_user: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"TokenCache(size={len(self)}, max_size={self._max_size}, max_ttl_seconds={self._max_ttl_seconds})"
+
+    def get(self, token: str) -> CachedToken | None:
+        """
+        Get the cached token data and user for token.
+        :param token: The encoded jwt.
+        :return: CachedToken, or None if token is not cached or has expired.
+        """
+        key = _key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, token: str, token_data: TokenData, user: User, exp: float) -> None:
+        """
+        Cache a verified token.
+        :param token: The encoded jwt.
+        :param token_data: The decoded token.
+        :param user: The user the token resolved to.
+        :param exp: Expiry of the token as unix timestamp.
+        """
+        if self._max_size == 0:
+            return
+        key = _key(token)
+        expires_at = min(exp, time.time() + self._max_ttl_seconds)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = CachedToken(token_data, user, expires_at)
+            self._keys_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self._max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Removes every cached token of the user. To be called when the user or its roles change."""
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_user.get(entry.user.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry.user.id]
+
+
+@functools.lru_cache(None)
+def get_token_cache() -> TokenCache:
+    """The token cache of this process."""
+    settings = TokenCacheSettings()
+    return TokenCache(settings.max_size, settings.max_ttl_seconds)
@@ -2,57 +2,94 @@ from fastapi import Depends
 
 from app.authentication.errors.invalid_username_or_password_error import InvalidUsernameOrPasswordError
 from app.authentication.models.db.user import User
-from app.database.abstract.document_database import BaseDatastore, DatabaseCollection, DocumentDatabase
+from app.database.abstract.async_document_database import (
+    AsyncBaseDatastore,
+    AsyncDatabaseCollection,
+    AsyncDocumentDatabase,
+)
 from app.database.dependencies.document_database import get_document_database
 from app.logging.log import AppLoggerInjector, AppLogger
 from app.shared.cryptography import password_hasher as hasher
+from app.shared.cryptography.hashing_pool import get_hashing_pool
+from app.shared.errors.errors import ServiceUnavailableError
 
 logger_injector = AppLoggerInjector("AuthenticationDatastore")
 
 
-class AuthenticationDatastore(BaseDatastore):
+class AuthenticationDatastore(AsyncBaseDatastore):
     """Datastore for authentication related database access."""
 
-    def __init__(self, db: DocumentDatabase, logger: AppLogger):
+    def __init__(self, db: AsyncDocumentDatabase, logger: AppLogger):
         super().__init__(db)
         self._logger = logger
 
     @property
-    def _users(self) -> DatabaseCollection:
+    def _users(self) -> AsyncDatabaseCollection:
         return self.db.collection("users")
 
-    def get_user(self, email: str) -> User | None:
+    async def get_user(self, email: str) -> User | None:
         """
         Get user by email.
         :param email: EMail/UserName of user.
         :return: UserDatabaseModel or None if user was not found.
         """
-        self._logger.debug(f"get_user(email={email})")
-        doc = self._users.by_key("email", email)
+        self._logger.debug("get_user(email=%s)", email)
+        doc = await self._users.by_key("email", email)
         if doc is None:
-            self._logger.debug(f"get_user(email={email}): doc is None")
+            self._logger.debug("get_user(email=%s): doc is None", email)
             return None
         return User.create(doc)
 
-    def authenticate_user(self, email: str, password: str) -> User:
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        """
+        Get user by id.
+        :param user_id: ID of user.
+        :return: User or None if user was not found.
+        """
+        self._logger.debug("get_user_by_id(user_id=%s)", user_id)
+        doc = await self._users.by_id(user_id)
+        if doc is None:
+            return None
+        return User.create(doc)
+
+    async def authenticate_user(self, email: str, password: str) -> User:
         """
         Authenticate that provided username and password matches stored.
         :raise InvalidUsernameOrPasswordError: If user can't be found with
         email or if password is not correct.
+        :raise ServiceUnavailableError: If too many passwords are being verified already.
         :param email: UserName.
         :param password: Password in clear text.
         :return: User, if credentials are correct.
         """
-        self._logger.debug(f"authenticate_user(email={email}, password=****)")
-        user = self.get_user(email)
+        self._logger.debug("authenticate_user(email=%s, password=****)", email)
+        user = await self.get_user(email)
         if user is None:
             raise InvalidUsernameOrPasswordError()
-        if not hasher.is_correct_password(password, user.password_hash):
+        if not await get_hashing_pool().is_correct_password(password, user.password_hash):
             raise InvalidUsernameOrPasswordError()
+        if hasher.needs_rehash(user.password_hash):
+            await self._rehash_password(user, password)
         return user
 
+    async def _rehash_password(self, user: User, password: str) -> None:
+        """
+        Replaces the stored hash with one made with the current password hash policy.
+        The login has already succeeded, so failing to rehash is logged and not raised. It is tried again next login.
+        """
+        try:
+            password_hash = await get_hashing_pool().hash_password(password)
+            update_context = self.db.update_context()
+            update_context.set_values({"password_hash": password_hash})
+            await self._users.update_document(user.id, update_context)
+            user.password_hash = password_hash
+        except ServiceUnavailableError:
+            self._logger.debug("_rehash_password(user_id=%s): hashing pool is full, skipping rehash", user.id)
+        except Exception as err:
+            self._logger.error("_rehash_password(user_id=%s): failed to rehash password", user.id, exception=err)
+
 
 def get_authentication_datastore(
-    db: DocumentDatabase = Depends(get_document_database), logger: AppLogger = Depends(logger_injector)
+    db: AsyncDocumentDatabase = Depends(get_document_database), logger: AppLogger = Depends(logger_injector)
 ) -> AuthenticationDatastore:
     return AuthenticationDatastore(db, logger)
@@ -0,0 +1,155 @@
+"""
+Datastore for refresh token sessions.
+
+A session is created at login, and its refresh token is exchanged for a new access token and a new refresh token
+without verifying the password again. Every refresh rotates the refresh token, and moves the expiry forward by
+REFRESH_TOKEN_EXPIRE_DAYS, but never past REFRESH_TOKEN_MAX_LIFETIME_DAYS after the login.
+A rotated refresh token can't be used again. If it is, the token has probably been stolen, and the whole session is
+revoked, so both the thief and the user have to log in again.
+
+Refresh tokens are random with 256 bits of entropy, so a single sha256 is enough to store them. Unlike passwords,
+they can't be guessed, and no slow hash is needed.
+"""
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+
+from fastapi import Depends
+from pydantic import BaseSettings, Field
+from pytz import utc
+
+from app.authentication.errors.invalid_refresh_token_error import InvalidRefreshTokenError
+from app.authentication.models.db.refresh_session import RefreshSession
+from app.database.abstract.async_document_database import (
+    AsyncBaseDatastore,
+    AsyncDatabaseCollection,
+    AsyncDocumentDatabase,
+)
+from app.database.dependencies.document_database import get_document_database
+from app.logging.log import AppLogger, AppLoggerInjector
+
+logger_injector = AppLoggerInjector("RefreshTokenDatastore")
+
+
+class RefreshTokenSettings(BaseSettings):
+    expire_days: float = Field(14, gt=0)
+    max_lifetime_days: float = Field(90, gt=0)
+    previous_hashes_kept: int = Field(20, ge=0)
+
+    class Config:
+        env_prefix = "REFRESH_TOKEN_"
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    """
+    Hash of refresh token, as stored in the database.
+
+    >>> hash_refresh_token("token")
+    '3c469e9d6c5875d37a43f353d4f88e61fcf812c66eee3457465a40b0da4153e0'
+    """
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else utc.localize(value)
+
+
+class RefreshTokenDatastore(AsyncBaseDatastore):
+    """Datastore for refresh token sessions."""
+
+    def __init__(self, db: AsyncDocumentDatabase, logger: AppLogger, settings: RefreshTokenSettings | None = None):
+        super().__init__(db)
+        self._logger = logger
+        self._settings = settings or RefreshTokenSettings()
+
+    @property
+    def _sessions(self) -> AsyncDatabaseCollection:
+        return self.db.collection("refresh_tokens")
+
+    async def create_session(self, user_id: str, scopes: list[str]) -> str:
+        """
+        Starts a refresh token session for a user that has logged in.
+        :param user_id: ID of user.
+        :param scopes: Scopes of the login, used for the access tokens issued on refresh.
+        :return: The refresh token.
+        """
+        self._logger.debug("create_session(user_id=%s, scopes=%s)", user_id, scopes)
+        refresh_token = secrets.token_urlsafe(32)
+        now = datetime.now(utc)
+        absolute_expires_at = now + timedelta(days=self._settings.max_lifetime_days)
+        await self._sessions.add(
+            {
+                "user_id": user_id,
+                "scopes": scopes,
+                "token_hash": hash_refresh_token(refresh_token),
+                "previous_token_hashes": [],
+                "created_at": now,
+                "expires_at": min(now + timedelta(days=self._settings.expire_days), absolute_expires_at),
+                "absolute_expires_at": absolute_expires_at,
+                "revoked": False,
+            }
+        )
+        return refresh_token
+
+    async def rotate(self, refresh_token: str) -> tuple[str, RefreshSession]:
+        """
+        Exchanges a refresh token for a new one.
+        The exchange is atomic, so a refresh token can only be rotated once even with concurrent requests.
+        :raise InvalidRefreshTokenError: If the token is unknown, expired, revoked or already rotated.
+        :param refresh_token: The refresh token from the client.
+        :return: The new refresh token, and the session.
+        """
+        token_hash = hash_refresh_token(refresh_token)
+        doc = await self._sessions.by_key("token_hash", token_hash)
+        if doc is None:
+            await self._revoke_reused(token_hash)
+            raise InvalidRefreshTokenError()
+
+        session = doc.to(lambda d: RefreshSession(**d.to_dict()))
+        new_refresh_token = secrets.token_urlsafe(32)
+        now = datetime.now(utc)
+        update_context = self.db.update_context()
+        update_context.set_values(
+            {
+                "token_hash": hash_refresh_token(new_refresh_token),
+                "previous_token_hashes": [token_hash, *session.previous_token_hashes][
+                    : self._settings.previous_hashes_kept
+                ],
+                "expires_at": min(
+                    now + timedelta(days=self._settings.expire_days), _as_utc(session.absolute_expires_at)
+                ),
+            }
+        )
+        updated = await self._sessions.find_one_and_update(
+            session.id,
+            update_context,
+            filters={"token_hash": token_hash, "revoked": False, "expires_at": {"$gt": now}},
+        )
+        if updated is None:
+            self._logger.debug("rotate(session_id=%s): session is expired, revoked or already rotated", session.id)
+            raise InvalidRefreshTokenError()
+        return new_refresh_token, updated.to(lambda d: RefreshSession(**d.to_dict()))
+
+    async def _revoke_reused(self, token_hash: str) -> None:
+        doc = await self._sessions.by_key("previous_token_hashes", token_hash, ["user_id", "revoked"])
+        if doc is None or doc["revoked"]:
+            return
+        self._logger.warn("Rotated refresh token was used again, revoking session %s of user %s", doc.id, doc["user_id"])
+        await self._sessions.patch_document(doc.id, {"revoked": True})
+
+    async def revoke(self, refresh_token: str) -> None:
+        """
+        Revokes the session of a refresh token. Unknown tokens are ignored.
+        :param refresh_token: The refresh token from the client.
+        """
+        doc = await self._sessions.by_key("token_hash", hash_refresh_token(refresh_token), ["revoked"])
+        if doc is None or doc["revoked"]:
+            return
+        self._logger.debug("revoke(session_id=%s)", doc.id)
+        await self._sessions.patch_document(doc.id, {"revoked": True})
+
+
+def get_refresh_token_datastore(
+    db: AsyncDocumentDatabase = Depends(get_document_database), logger: AppLogger = Depends(logger_injector)
+) -> RefreshTokenDatastore:
+    return RefreshTokenDatastore(db, logger)
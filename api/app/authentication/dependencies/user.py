@@ -2,171 +2,30 @@
 Module for user related dependencies
 """
 from fastapi import Depends, HTTPException, status, Request
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
 from fastapi.security import SecurityScopes
-from jose import jwt, JWTError
+from starlette.routing import BaseRoute
+from jose import JWTError
 
+from app.authentication.cache.token_cache import get_token_cache
 from app.authentication.datastores.authentication_datastore import AuthenticationDatastore, get_authentication_datastore
 from app.authentication.models.db.user import User
-from app.authentication.models.v1.token import TokenData, TokenRoleMap
-from app.shared.utils.request_utils import get_current_request_url_with_additions, get_url
-from .auth import OAUTH2_SCHEME_OPTIONAL, SECRET_KEY, ALGORITHM
+from app.authentication.models.v1.token import TokenData
+from app.authentication.oauth2.scope_rules import compile_scopes
+from app.authentication.oauth2.signing_keys import get_signing_key_store
+from app.shared.utils.request_utils import get_current_request_url_with_additions
+from .auth import OAUTH2_SCHEME_OPTIONAL
 from app.logging.log import AppLogger, AppLoggerInjector
-from app.shared.errors.errors import InvalidOperationError
-from app.authentication.utils.str_utils import remove_brackets
-from ..errors.claim_type_not_supported_error import ClaimTypeNotSupportedError
-
-CLAIM_TYPE_VERIFIED = "verified"
-CLAIM_TYPE_ROLES = "roles"
-CLAIM_TYPE_SELF = "self"
+from app.logging.sla import auth_timer
 
 logger_injector = AppLoggerInjector("dependencies.user")
 
 
-def _get_ref_part(parts: list[str], i: int) -> str | None:
-    ref_part = None
-    try:
-        ref_part = parts[i]
-    except IndexError:
-        pass
-    return ref_part
-
-
-def _get_ref(parts: list[str], i: int, request: Request) -> str | None:
-    ref_part = _get_ref_part(parts, i)
-    if ref_part == "*":
-        return ref_part
-    if ref_part:
-        ref_part = remove_brackets(ref_part)
-        return request.path_params.get(ref_part, None)
-    return None
-
-
-class Scope:
-    def __init__(self, scope_str: str, request: Request):
-        self._scope_str = scope_str
-        self._request = request
-        self._parts = scope_str.split(":")
-        _ensure_correct_scopes_format(scope_str, self._parts, request)
-        self._claim_type = self._parts[0]
-
-    @property
-    def claim_type(self) -> str:
-        return self._claim_type
-
-    def get_verified_value(self) -> bool:
-        return self._get_part(CLAIM_TYPE_VERIFIED, 1).lower() == "true"
-
-    def get_self_ref(self) -> str:
-        return self._get_ref(CLAIM_TYPE_SELF, 1, allow_wildcard=False)
-
-    def get_role_name(self) -> str:
-        return self._get_part(CLAIM_TYPE_ROLES, 1)
-
-    def get_role_ref(self) -> str | None:
-        return self._get_ref(CLAIM_TYPE_ROLES, 2, required=False)
-
-    def _get_ref(self, claim_type: str, index: int, required: bool = True, allow_wildcard: bool = True) -> str | None:
-        ref_name = self._get_part(claim_type, index)
-        if ref_name is None:
-            if required:
-                raise InvalidOperationError(
-                    f"Required ref not found for claim type '{claim_type}'. URL={get_url(self._request)}"
-                )
-            return None
-        if ref_name == "*":
-            if allow_wildcard:
-                return ref_name
-            else:
-                raise InvalidOperationError(
-                    f"Can't have a wildcard on claim type {claim_type}. URL={get_url(self._request)}"
-                )
-        ref = self._request.path_params.get(remove_brackets(ref_name), None)
-        if required:
-            if ref is None:
-                raise InvalidOperationError(f"Can't find ref for '{ref_name}'. URL={get_url(self._request)}")
-        return ref
-
-    def _get_part(self, claim_type: str, index: int) -> str | None:
-        self._ensure_valid_claim_type(claim_type)
-        try:
-            return self._parts[index]
-        except IndexError:
-            return None
-
-    def _ensure_valid_claim_type(self, claim_type: str):
-        if not self._claim_type == claim_type:
-            raise InvalidOperationError(
-                f"Can't call method for claim_type other than {claim_type}: scope_str={self._scope_str}"
-            )
-
-
-class Role:
-    def __init__(self, role_name: str, ref: str | None):
-        self._role_name = role_name
-        self._ref = ref
-
-    def matches(self, token_role_map: TokenRoleMap, authenticated_user: User) -> bool:
-        if self._role_name == CLAIM_TYPE_SELF:
-            return self._ref == authenticated_user.id
-
-        token_roles = token_role_map[self._role_name]
-        if token_roles:
-            if self._ref == "*":
-                return True
-            if self._ref in token_roles:
-                return True
-
-        return False
-
-
-class Roles:
-    """Collection class holding a collection of roles."""
-
-    def __init__(self):
-        self._roles: list[Role] = []
-
-    def __len__(self):
-        return self._roles.__len__()
-
-    def __iter__(self):
-        return self._roles.__iter__()
-
-    def append_role(self, scope: Scope) -> None:
-        if scope.claim_type not in (CLAIM_TYPE_SELF, CLAIM_TYPE_ROLES):
-            return
-        if scope.claim_type == CLAIM_TYPE_SELF:
-            self._append_self(scope)
-        elif scope.claim_type == CLAIM_TYPE_ROLES:
-            self._append_roles(scope)
-        else:
-            raise ValueError("Shit")
-
-    def _append_self(self, scope: Scope):
-        role = CLAIM_TYPE_SELF
-        ref = scope.get_self_ref()
-        self._roles.append(Role(role, ref))
-
-    def _append_roles(self, scope: Scope):
-        role = scope.get_role_name()
-        ref = scope.get_role_ref()
-        self._roles.append(Role(role, ref))
-
-    def match_with_user(self, token_role_map: TokenRoleMap, authenticated_user: User) -> True:
-        for role in self._roles:
-            if role.matches(token_role_map, authenticated_user):
-                return True
-        return False
-
-    def any(self) -> bool:
-        if self._roles:
-            return True
-        return False
-
-
 class SecurityScopeRestrictions:
     """
-    Parses and strictures the scope restrictions set on endpoint for easy
-    verification
+    The scope restrictions set on endpoint, for verification of the authenticated user.
+    The scopes are compiled once per endpoint by scope_rules.compile_scopes, so no parsing is done per request.
     """
 
     def __init__(
@@ -176,30 +35,19 @@ class SecurityScopeRestrictions:
         authenticated_user: User,
     ):
         """
-        Parses and stores the security scopes.
-
-        Supported scopes=
-            roles:role_name:reference[optional]
-            verified:True|False
-            self:{user_id}
+        Gets the compiled rules for the security scopes.
 
         :param security_scopes: SecurityScopes object received from fastapi
         :param request: HTTP request object, needed to acquire resource keys
         to check for access to specific resources
+        :param authenticated_user: The user to check access for.
         """
-        self._security_scopes = security_scopes
-        self._request = request
+        rules = compile_scopes(tuple(security_scopes.scopes))
+        self._rules = rules
+        self._roles = rules.roles
+        self._verified = rules.verified
+        self._path_params = request.path_params
         self._authenticated_user = authenticated_user
-        self._roles = Roles()
-        self._verified: bool | None = None
-
-        for scope in [Scope(s, request) for s in security_scopes.scopes]:
-            if scope.claim_type == CLAIM_TYPE_ROLES or scope.claim_type == CLAIM_TYPE_SELF:
-                self._roles.append_role(scope)
-            elif scope.claim_type == CLAIM_TYPE_VERIFIED:
-                self._verified = scope.get_verified_value()
-            else:
-                raise ClaimTypeNotSupportedError(scope.claim_type)
 
     def user_has_required_roles(self, token: TokenData) -> bool:
         """
@@ -213,12 +61,7 @@ class SecurityScopeRestrictions:
         :return: True if user has any of the required roles or if no roles are
                  required.
         """
-        if token.has_superuser_role():
-            return True
-        if not self._roles.any():
-            return True
-
-        return self._roles.match_with_user(token.get_token_role_map(), self._authenticated_user)
+        return self._rules.user_has_required_roles(token, self._path_params, self._authenticated_user.id)
 
     def check_verified(self, token: TokenData) -> bool:
         """
@@ -227,14 +70,10 @@ class SecurityScopeRestrictions:
         :return: True if verified is not required or if verified is required
         and user is verified
         """
-        if self._verified is None:
-            return True
-        if self._verified == token.verified:
-            return True
-        return False
+        return self._rules.check_verified(token)
 
 
-def get_current_user_if_any(
+async def get_current_user_if_any(
     request: Request,
     security_scopes: SecurityScopes,
     token: str | None = Depends(OAUTH2_SCHEME_OPTIONAL),
@@ -252,20 +91,41 @@ def get_current_user_if_any(
     :param logger: AppLogger
     :return: User model from database.
     """
-    logger.debug(
-        f"get_current_user_if_any(request={request}, security_scopes={security_scopes}, token={token}, "
-        f"users={authentication_datastore})"
-    )
+    logger.debug("get_current_user_if_any(scopes=%s, has_token=%s)", security_scopes.scopes, token is not None)
     if token is None:
         return None
     if security_scopes.scopes:
         authenticate_value = f'Bearer scope="{security_scopes.scope_str}"'
     else:
         authenticate_value = "Bearer"
+    with auth_timer():
+        token_data, user = await _resolve_token(token, authentication_datastore, authenticate_value)
+        has_access = user_has_access(security_scopes, request, token_data, user)
+    if not has_access:
+        request_url: str = get_current_request_url_with_additions(request, include_query=False)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User is not authorized to access endpoint " f"'{request_url}'",
+            headers={"WWW-Authenticate": authenticate_value},
+        )
+    return user
+
+
+async def _resolve_token(
+    token: str, authentication_datastore: AuthenticationDatastore, authenticate_value: str
+) -> tuple[TokenData, User]:
+    """
+    Decodes the token and gets the user it was issued to, from the token cache if the token has been seen before.
+    :raise HTTPException: If the token can't be decoded or the user doesn't exist.
+    """
+    token_cache = get_token_cache()
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.token_data, cached.user
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = get_signing_key_store().key_set().decode(token)
         token_data = TokenData(**payload)
-        print(payload)
         email: str = payload.get("sub")
         if email is None:
             raise HTTPException(
@@ -279,21 +139,16 @@ def get_current_user_if_any(
             detail="Unable to decode jwt token: " + str(err),
             headers={"WWW-Authenticate": authenticate_value},
         ) from err
-    user = authentication_datastore.get_user(email)
+    user = await authentication_datastore.get_user(email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="No user was found for the provided username",
             headers={"WWW-Authenticate": authenticate_value},
         )
-    if not user_has_access(security_scopes, request, token_data, user):
-        request_url: str = get_current_request_url_with_additions(request, include_query=False)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User is not authorized to access endpoint " f"'{request_url}'",
-            headers={"WWW-Authenticate": authenticate_value},
-        )
-    return user
+    if payload.get("exp") is not None:
+        token_cache.put(token, token_data, user, payload["exp"])
+    return token_data, user
 
 
 def get_current_user(
@@ -331,7 +186,6 @@ def user_has_access(
     :return: Bool True if user is authorized to access specific endpoint,
     otherwise False
     """
-    print("Checking if user has access")
     security_scope_restrictions = SecurityScopeRestrictions(security_scopes, request, authenticated_user)
     if security_scope_restrictions.user_has_required_roles(token):
         if security_scope_restrictions.check_verified(token):
@@ -339,18 +193,24 @@ def user_has_access(
     return False
 
 
-def _ensure_correct_scopes_format(scope: str, parts: list[str], request: Request) -> None:
+def compile_route_scopes(routes: list[BaseRoute]) -> int:
     """
-    Verifies that the scope restriction is formatted correctly.
-    :raises HTTPException: 500 Internal Server Error if scope restriction has
-    invalid format.
-    :param scope: raw scope string.
-    :param parts: scope string in parts split by colon.
-    :param request: HTTP request object.
-    :return: None.
+    Compiles the security scopes of every route that depends on the current user, so that invalid scopes fail on
+    startup and not on the first request.
+    :param routes: The routes of the application.
+    :return: Number of distinct sets of scopes compiled.
     """
-    if len(parts) not in (2, 3):
-        raise HTTPException(
-            status.HTTP_500_INTERNAL_SERVER_ERROR,
-            f"endpoint '{str(request.url)}' " f"has invalid security claim setup: '{scope}'",
-        )
+    compiled = set()
+
+    def visit(dependant: Dependant) -> None:
+        if dependant.call is get_current_user_if_any:
+            scopes = tuple(dependant.security_scopes or ())
+            compile_scopes(scopes)
+            compiled.add(scopes)
+        for sub_dependant in dependant.dependencies:
+            visit(sub_dependant)
+
+    for route in routes:
+        if isinstance(route, APIRoute):
+            visit(route.dependant)
+    return len(compiled)
@@ -0,0 +1,15 @@
+from fastapi import HTTPException, status
+
+
+class InvalidRefreshTokenError(HTTPException):
+    """
+    Raised if a refresh token is unknown, expired, revoked or has already been used.
+    """
+
+    def __init__(self):
+        """Creates instance."""
+        super(InvalidRefreshTokenError, self).__init__(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,22 @@
+"""Database model for refresh token sessions."""
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class RefreshSession(BaseModel):
+    """
+    A login that can be renewed with a refresh token.
+    Only the sha256 hash of the current refresh token is stored, along with the hashes of the latest rotated ones so
+    that reuse of a rotated token can be detected.
+    """
+
+    id: str
+    user_id: str
+    scopes: list[str] = Field([])
+    token_hash: str
+    previous_token_hashes: list[str] = Field([])
+    created_at: datetime
+    expires_at: datetime
+    absolute_expires_at: datetime
+    revoked: bool = Field(False)
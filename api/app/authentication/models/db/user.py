@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+
+from app.authentication.utils.role_index import build_role_index
 
 
 def get_ref(role: str):
@@ -19,6 +21,8 @@ class User(BaseModel):
     lastname: str
     roles: list[str]
 
+    _role_index: dict[str, frozenset[str | None]] | None = PrivateAttr(None)
+
     @classmethod
     def create(cls, doc):
         roles = []
@@ -28,7 +32,7 @@ class User(BaseModel):
             if ref:
                 value += f":{ref}"
             roles.append(value)
-        return cls(
+        user = cls(
             id=doc.get("id"),
             password_hash=doc.get("password_hash"),
             email=doc.get("email"),
@@ -37,18 +41,33 @@ class User(BaseModel):
             lastname=doc.get("lastname"),
             roles=roles,
         )
+        user._role_index = build_role_index(roles)
+        return user
+
+    def copy(self, *, update: dict | None = None, **kwargs):
+        copy = super().copy(update=update, **kwargs)
+        if update and "roles" in update:
+            copy._role_index = None
+        return copy
+
+    def role_index(self) -> dict[str, frozenset[str | None]]:
+        """Map of role name to the set of references the user has the role for. None for roles without reference."""
+        if self._role_index is None:
+            self._role_index = build_role_index(self.roles)
+        return self._role_index
 
     def is_superuser(self) -> bool:
-        return any(role for role in self.roles if role == "superuser")
+        return "superuser" in self.role_index()
 
     def get_roles(self, role_name: str) -> list[str]:
-        return [role for role in self.roles if role.split(":")[0] == role_name]
+        return [f"{role_name}:{ref}" if ref else role_name for ref in self.role_index().get(role_name, ())]
+
+    def get_role_refs(self, role_name: str) -> frozenset[str | None]:
+        """The references the user has role_name for."""
+        return self.role_index().get(role_name, frozenset())
 
     def has_role(self, role_name: str, ref: str | None) -> bool:
-        for role in self.get_roles(role_name):
-            if ref:
-                if ref == get_ref(role):
-                    return True
-            else:
-                return True
-        return False
+        refs = self.role_index().get(role_name)
+        if not refs:
+            return False
+        return ref in refs if ref else True
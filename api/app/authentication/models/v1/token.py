@@ -1,5 +1,7 @@
 """Token and TokenData."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from app.authentication.utils.role_index import build_role_index
 
 
 class Token(BaseModel):
@@ -7,26 +9,7 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str
-
-
-class TokenRoleMap:
-    """Map like role collection"""
-
-    def __init__(self, roles: list[str]):
-        self._roles = roles
-        self._map = {}
-
-        for role in roles:
-            parts = role.split(":")
-            role_name = parts[0]
-            ref = parts[1] if len(parts) > 1 else None
-            if role_name in self._map:
-                self._map[role_name].append(ref)
-            else:
-                self._map[role_name] = [ref]
-
-    def __getitem__(self, key) -> list[str]:
-        return self._map.get(key, None)
+    refresh_token: str | None = Field(None)
 
 
 class TokenData(BaseModel):
@@ -40,9 +23,22 @@ class TokenData(BaseModel):
     family_name: str | None
     roles: list[str] = Field([])
 
-    def get_token_role_map(self) -> TokenRoleMap:
-        """Get roles as a dict like map object."""
-        return TokenRoleMap(self.roles)
+    _role_index: dict[str, frozenset[str | None]] | None = PrivateAttr(None)
+
+    def copy(self, *, update: dict | None = None, **kwargs):
+        copy = super().copy(update=update, **kwargs)
+        if update and "roles" in update:
+            copy._role_index = None
+        return copy
+
+    def role_index(self) -> dict[str, frozenset[str | None]]:
+        """
+        Get roles as a map of role name to the set of references the role has.
+        Built on first use and kept, since the token data doesn't change.
+        """
+        if self._role_index is None:
+            self._role_index = build_role_index(self.roles)
+        return self._role_index
 
     def has_superuser_role(self) -> bool:
-        return any((role for role in self.roles if role == "superuser"))
+        return "superuser" in self.role_index()
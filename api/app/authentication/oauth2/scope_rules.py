@@ -0,0 +1,111 @@
+"""
+Security scope restrictions set on endpoints, compiled into rules.
+
+Supported scopes=
+    roles:role_name:reference[optional]
+    verified:True|False
+    self:{user_id}
+
+References are names of path parameters, IE: {company_id}, or * for any reference.
+The scope strings of a route never change, so they are parsed once per distinct set of scopes and the rules are
+shared by every request. Only the path parameters are looked up at request time.
+"""
+import functools
+from typing import Any, Mapping, NamedTuple
+
+from fastapi import HTTPException, status
+
+from app.authentication.errors.claim_type_not_supported_error import ClaimTypeNotSupportedError
+from app.authentication.models.v1.token import TokenData
+from app.authentication.utils.str_utils import remove_brackets
+from app.shared.errors.errors import InvalidOperationError
+
+CLAIM_TYPE_VERIFIED = "verified"
+CLAIM_TYPE_ROLES = "roles"
+CLAIM_TYPE_SELF = "self"
+WILDCARD = "*"
+
+
+class RoleRule(NamedTuple):
+    """
+    Requirement of a role, or of being the user the resource belongs to if role_name is self.
+    ref_slot is the name of the path parameter holding the reference.
+    """
+
+    role_name: str
+    ref_slot: str | None
+    wildcard: bool
+
+    def matches(self, token: TokenData, path_params: Mapping[str, Any], user_id: str) -> bool:
+        if self.role_name == CLAIM_TYPE_SELF:
+            ref = path_params.get(self.ref_slot)
+            if ref is None:
+                raise InvalidOperationError(f"Can't find ref for '{self.ref_slot}'.")
+            return ref == user_id
+
+        refs = token.role_index().get(self.role_name)
+        if not refs:
+            return False
+        if self.wildcard:
+            return True
+        return (path_params.get(self.ref_slot) if self.ref_slot else None) in refs
+
+
+class ScopeRules(NamedTuple):
+    """Compiled scope restrictions of an endpoint."""
+
+    verified: bool | None
+    roles: tuple[RoleRule, ...]
+
+    def user_has_required_roles(self, token: TokenData, path_params: Mapping[str, Any], user_id: str) -> bool:
+        """
+        Will check if user has any of the required roles.
+        If no roles are required, this will always return True.
+        """
+        if not self.roles or token.has_superuser_role():
+            return True
+        return any(role.matches(token, path_params, user_id) for role in self.roles)
+
+    def check_verified(self, token: TokenData) -> bool:
+        """True if verified is not required or if the user is verified."""
+        return self.verified is None or self.verified == token.verified
+
+
+def _compile_scope(scope: str) -> tuple[str, list[str]]:
+    parts = scope.split(":")
+    if len(parts) not in (2, 3):
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f"Invalid security claim setup: '{scope}'")
+    return parts[0], parts[1:]
+
+
+@functools.lru_cache(None)
+def compile_scopes(scopes: tuple[str, ...]) -> ScopeRules:
+    """
+    Compiles the scopes set on an endpoint.
+
+    >>> compile_scopes(("roles:superuser", "roles:company_admin:{company_id}", "verified:True"))
+    ScopeRules(verified=True, roles=(RoleRule(role_name='superuser', ref_slot=None, wildcard=False), \
+RoleRule(role_name='company_admin', ref_slot='company_id', wildcard=False)))
+
+    :param scopes: The scope strings.
+    :return: ScopeRules.
+    :raise HTTPException: 500 if a scope has invalid format.
+    :raise ClaimTypeNotSupportedError: If a scope has an unknown claim type.
+    :raise InvalidOperationError: If a self scope has a wildcard.
+    """
+    verified = None
+    roles = []
+    for scope in scopes:
+        claim_type, values = _compile_scope(scope)
+        if claim_type == CLAIM_TYPE_VERIFIED:
+            verified = values[0].lower() == "true"
+        elif claim_type == CLAIM_TYPE_SELF:
+            if values[0] == WILDCARD:
+                raise InvalidOperationError(f"Can't have a wildcard on claim type {CLAIM_TYPE_SELF}.")
+            roles.append(RoleRule(CLAIM_TYPE_SELF, remove_brackets(values[0]), False))
+        elif claim_type == CLAIM_TYPE_ROLES:
+            ref = values[1] if len(values) > 1 else None
+            roles.append(RoleRule(values[0], None if ref in (None, WILDCARD) else remove_brackets(ref), ref == WILDCARD))
+        else:
+            raise ClaimTypeNotSupportedError(claim_type)
+    return ScopeRules(verified, tuple(roles))
@@ -0,0 +1,251 @@
+"""
+Keys for signing and verifying access tokens.
+
+Tokens are signed with RS256 or ES256 by a private key, and verified with the matching public key. The key id, kid,
+is put in the token header so the verifier can pick the right key while several keys are in use.
+Only the nodes issuing tokens need the private keys. Other API nodes can be given the public keys only, and anything
+else, like the frontend, can get them from the JWKS endpoint.
+
+Keys are PEM files named <kid>.pem in the directory set by TOKEN_SIGNING_KEYS_DIR. RSA keys are used with RS256 and
+P-256 EC keys with ES256. The private key with the greatest kid signs new tokens, unless TOKEN_SIGNING_ACTIVE_KID is
+set. The directory is checked for changes every TOKEN_SIGNING_RELOAD_INTERVAL_SECONDS, so keys are rotated by:
+    1. Adding the new key. With kids that sort by date it becomes the signing key.
+    2. Removing the old key when the last token signed with it has expired.
+Files are parsed once, when they are new or changed, and the parsed keys are shared by every request.
+
+Without TOKEN_SIGNING_KEYS_DIR a key is generated when the process starts. That only works with a single process,
+since tokens signed by one worker can't be verified by another, and all tokens are invalid after a restart.
+"""
+import functools
+import os
+import threading
+import time
+from typing import NamedTuple
+
+from Crypto.PublicKey import ECC, RSA
+from jose import jwk, jwt, JWTError
+from jose.backends.base import Key
+from pydantic import BaseSettings, Field, validator
+
+from app.logging.log import AppLogger
+from app.shared.errors.errors import InvalidOperationError
+
+RS256 = "RS256"
+ES256 = "ES256"
+KEY_FILE_SUFFIX = ".pem"
+
+
+class SigningKeySettings(BaseSettings):
+    keys_dir: str | None = Field(None)
+    active_kid: str | None = Field(None)
+    algorithm: str = Field(RS256)
+    reload_interval_seconds: float = Field(30, ge=0)
+
+    class Config:
+        env_prefix = "TOKEN_SIGNING_"
+
+    @validator("algorithm")
+    def _validate_algorithm(cls, value: str) -> str:
+        if value not in (RS256, ES256):
+            raise ValueError(f"algorithm has to be {RS256} or {ES256}")
+        return value
+
+
+class SigningKey(NamedTuple):
+    """A parsed key. Tokens are verified with the public key, and signed with the private key if there is one."""
+
+    kid: str
+    algorithm: str
+    public_key: Key
+    private_key: Key | None
+
+    @classmethod
+    def create(cls, kid: str, algorithm: str, pem: str) -> "SigningKey":
+        key = jwk.construct(pem, algorithm)
+        if key.is_public():
+            return cls(kid, algorithm, key, None)
+        return cls(kid, algorithm, key.public_key(), key)
+
+    @property
+    def is_private(self) -> bool:
+        return self.private_key is not None
+
+    def public_jwk(self) -> dict:
+        """The public key as a JWK."""
+        return {**self.public_key.to_dict(), "kid": self.kid, "use": "sig"}
+
+
+def parse_key(kid: str, pem: str) -> SigningKey:
+    """
+    Parses a PEM encoded RSA or EC key. The algorithm is given by the key type.
+
+    >>> parse_key("2026-01", ECC.generate(curve="P-256").export_key(format="PEM")).algorithm
+    'ES256'
+
+    :param kid: Key id.
+    :param pem: Private or public key.
+    :return: SigningKey.
+    :raise ValueError: If the key is neither RSA nor P-256 EC.
+    """
+    try:
+        RSA.import_key(pem)
+        algorithm = RS256
+    except ValueError:
+        if ECC.import_key(pem).curve != "NIST P-256":
+            raise ValueError(f"Key '{kid}' has to be on curve P-256")
+        algorithm = ES256
+    return SigningKey.create(kid, algorithm, pem)
+
+
+def generate_key(kid: str, algorithm: str) -> SigningKey:
+    """
+    Generates a new private key.
+    :param kid: Key id.
+    :param algorithm: RS256 or ES256.
+    :return: SigningKey.
+    """
+    if algorithm == ES256:
+        pem = ECC.generate(curve="P-256").export_key(format="PEM")
+    else:
+        pem = RSA.generate(2048).export_key(pkcs=8).decode("utf-8")
+    return SigningKey.create(kid, algorithm, pem)
+
+
+class KeySet:
+    """Immutable set of keys, with the key used for signing."""
+
+    def __init__(self, keys: list[SigningKey], active_kid: str | None = None):
+        """
+        Creates a key set.
+        :param keys: The keys.
+        :param active_kid: Kid of the key to sign with. Defaults to the private key with the greatest kid.
+        :raise InvalidOperationError: If the active kid is not a private key in the set.
+        """
+        self._keys = {key.kid: key for key in keys}
+        private_kids = sorted(key.kid for key in keys if key.is_private)
+        if active_kid is None and private_kids:
+            active_kid = private_kids[-1]
+        if active_kid is not None and active_kid not in private_kids:
+            raise InvalidOperationError(f"There is no private key with kid '{active_kid}'")
+        self._active_kid = active_kid
+        self._jwks = {"keys": [key.public_jwk() for key in self._keys.values()]}
+
+    def __repr__(self):
+        return f"KeySet(kids={sorted(self._keys)}, active_kid={self._active_kid})"
+
+    @property
+    def active_kid(self) -> str | None:
+        return self._active_kid
+
+    def get(self, kid: str) -> SigningKey | None:
+        return self._keys.get(kid)
+
+    def jwks(self) -> dict:
+        """The public keys as a JWK set."""
+        return self._jwks
+
+    def encode(self, claims: dict) -> str:
+        """
+        Signs the claims with the active key.
+        :param claims: Claims to put in token.
+        :return: jwt token as str.
+        :raise InvalidOperationError: If there is no private key to sign with.
+        """
+        if self._active_kid is None:
+            raise InvalidOperationError("There is no private key to sign tokens with")
+        key = self._keys[self._active_kid]
+        return jwt.encode(claims, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid})
+
+    def decode(self, token: str) -> dict:
+        """
+        Verifies the token with the key named in its header, and gets the claims.
+
+        >>> key_set = KeySet([generate_key("2026-01", ES256)])
+        >>> key_set.decode(key_set.encode({"sub": "nisse@perssons.se"}))
+        {'sub': 'nisse@perssons.se'}
+
+        :param token: jwt token.
+        :return: claims.
+        :raise JWTError: If the token is invalid, expired or signed with an unknown key.
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid) if kid is not None else None
+        if key is None:
+            raise JWTError(f"Unknown signing key '{kid}'")
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+
+class SigningKeyStore:
+    """Loads the key set from the keys directory, and loads it again when the key files change."""
+
+    def __init__(self, settings: SigningKeySettings, logger: AppLogger):
+        self._settings = settings
+        self._logger = logger
+        self._lock = threading.Lock()
+        self._parsed: dict[str, tuple[int, SigningKey]] = {}
+        self._files: tuple[tuple[str, int], ...] | None = None
+        self._checked_at = 0.0
+        if settings.keys_dir is None:
+            logger.warn(
+                "TOKEN_SIGNING_KEYS_DIR is not set, signing tokens with a generated key. "
+                "Tokens can only be verified by this process."
+            )
+            self._key_set = KeySet([generate_key("generated", settings.algorithm)])
+        else:
+            self._key_set = self._load()
+
+    @property
+    def reload_interval_seconds(self) -> float:
+        return self._settings.reload_interval_seconds
+
+    def _list_files(self) -> tuple[tuple[str, int], ...]:
+        files = []
+        for entry in os.scandir(self._settings.keys_dir):
+            if entry.is_file() and entry.name.endswith(KEY_FILE_SUFFIX):
+                files.append((entry.path, entry.stat().st_mtime_ns))
+        return tuple(sorted(files))
+
+    def _load(self) -> KeySet:
+        files = self._list_files()
+        parsed = {}
+        for path, mtime in files:
+            cached = self._parsed.get(path)
+            if cached is not None and cached[0] == mtime:
+                parsed[path] = cached
+                continue
+            with open(path, encoding="utf-8") as file:
+                kid = os.path.basename(path)[: -len(KEY_FILE_SUFFIX)]
+                parsed[path] = (mtime, parse_key(kid, file.read()))
+        key_set = KeySet([key for _, key in parsed.values()], self._settings.active_kid)
+        self._parsed = parsed
+        self._files = files
+        self._checked_at = time.monotonic()
+        self._logger.info("Loaded token signing keys %s", key_set)
+        return key_set
+
+    def key_set(self) -> KeySet:
+        """
+        The current key set. Checks the keys directory if the reload interval has passed.
+        If the changed files can't be loaded, the previous key set is kept.
+        """
+        if (
+            self._settings.keys_dir is None
+            or time.monotonic() - self._checked_at < self._settings.reload_interval_seconds
+        ):
+            return self._key_set
+        with self._lock:
+            if time.monotonic() - self._checked_at < self._settings.reload_interval_seconds:
+                return self._key_set
+            try:
+                if self._list_files() != self._files:
+                    self._key_set = self._load()
+            except (OSError, ValueError, InvalidOperationError) as err:
+                self._logger.error("Failed to reload token signing keys, keeping the previous keys", exception=err)
+            self._checked_at = time.monotonic()
+        return self._key_set
+
+
+@functools.lru_cache(None)
+def get_signing_key_store() -> SigningKeyStore:
+    """The signing keys of this process, configured from the environment."""
+    return SigningKeyStore(SigningKeySettings(), AppLogger("signing_keys"))
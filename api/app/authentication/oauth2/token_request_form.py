@@ -0,0 +1,37 @@
+"""
+Form for the oauth2 token endpoint, supporting the password and refresh_token grants.
+"""
+from fastapi import Form, HTTPException, status
+
+GRANT_TYPE_PASSWORD = "password"
+GRANT_TYPE_REFRESH_TOKEN = "refresh_token"
+
+
+class TokenRequestForm:
+    """
+    Like fastapi's OAuth2PasswordRequestFormStrict, but grant_type can also be refresh_token.
+    Which fields are required depends on the grant type:
+        password: username and password.
+        refresh_token: refresh_token.
+    """
+
+    def __init__(
+        self,
+        grant_type: str = Form(..., regex=f"^({GRANT_TYPE_PASSWORD}|{GRANT_TYPE_REFRESH_TOKEN})$"),
+        username: str | None = Form(None),
+        password: str | None = Form(None),
+        refresh_token: str | None = Form(None),
+        scope: str = Form(""),
+    ):
+        """
+        :raise HTTPException: 400 if a field required by the grant type is missing.
+        """
+        if grant_type == GRANT_TYPE_PASSWORD and (username is None or password is None):
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "username and password are required")
+        if grant_type == GRANT_TYPE_REFRESH_TOKEN and refresh_token is None:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "refresh_token is required")
+        self.grant_type = grant_type
+        self.username = username
+        self.password = password
+        self.refresh_token = refresh_token
+        self.scopes = scope.split()
@@ -4,20 +4,18 @@ Routing module for oauth2 token endpoint.
 from datetime import timedelta, datetime
 from pytz import UTC
 
-from fastapi import APIRouter, Depends
-from fastapi.security import OAuth2PasswordRequestFormStrict
-from jose import jwt
+from fastapi import APIRouter, Depends, Form, Response, status
 
 from app.authentication.models.v1.token import Token
 from app.authentication.models.db.user import User
-from app.authentication.dependencies.auth import (
-    ACCESS_TOKEN_EXPIRE_MINUTES,
-    SECRET_KEY,
-    ALGORITHM,
-)
+from app.authentication.dependencies.auth import ACCESS_TOKEN_EXPIRE_MINUTES
 from app.authentication.oauth2.scopes import Scopes
 from app.authentication.oauth2.claim import Claim
+from app.authentication.oauth2.signing_keys import SigningKeyStore, get_signing_key_store
+from app.authentication.oauth2.token_request_form import GRANT_TYPE_REFRESH_TOKEN, TokenRequestForm
 from app.authentication.datastores.authentication_datastore import AuthenticationDatastore, get_authentication_datastore
+from app.authentication.datastores.refresh_token_datastore import RefreshTokenDatastore, get_refresh_token_datastore
+from app.authentication.errors.invalid_refresh_token_error import InvalidRefreshTokenError
 from app.shared.utils.string_values import StringValues
 
 router = APIRouter(prefix="/v1/token", tags=["Token"])
@@ -25,24 +23,60 @@ router = APIRouter(prefix="/v1/token", tags=["Token"])
 
 @router.post("/", response_model=Token)
 async def token(
-    form_data: OAuth2PasswordRequestFormStrict = Depends(),
+    form_data: TokenRequestForm = Depends(),
     datastore: AuthenticationDatastore = Depends(get_authentication_datastore),
+    refresh_tokens: RefreshTokenDatastore = Depends(get_refresh_token_datastore),
 ) -> Token:
-    """Gets oauth2 access token."""
-    user = datastore.authenticate_user(form_data.username, form_data.password)
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    scopes = Scopes(form_data.scopes)
-    claims = get_user_claims(user, scopes)
+    """
+    Gets oauth2 access token, and a refresh token.
+    With grant_type password the password is verified, with grant_type refresh_token the refresh token is exchanged
+    for a new one. Refreshing is cheap, so clients should refresh instead of logging in again.
+    """
+    if form_data.grant_type == GRANT_TYPE_REFRESH_TOKEN:
+        refresh_token, session = await refresh_tokens.rotate(form_data.refresh_token)
+        user = await datastore.get_user_by_id(session.user_id)
+        if user is None:
+            await refresh_tokens.revoke(refresh_token)
+            raise InvalidRefreshTokenError()
+        scopes = session.scopes
+    else:
+        user = await datastore.authenticate_user(form_data.username, form_data.password)
+        scopes = form_data.scopes
+        refresh_token = await refresh_tokens.create_session(user.id, scopes)
+
+    claims = get_user_claims(user, Scopes(scopes))
     access_token = create_access_token(
         data={
             "sub": user.email,
-            "scopes": form_data.scopes,
+            "scopes": scopes,
             "id": user.id,
             **{claim.type: claim.get_value() for claim in claims},
         },
-        expires_delta=access_token_expires,
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
     )
-    return Token(access_token=access_token, token_type="bearer")
+    return Token(access_token=access_token, token_type="bearer", refresh_token=refresh_token)
+
+
+@router.post("/revoke", status_code=status.HTTP_200_OK)
+async def revoke(
+    token: str = Form(...),
+    refresh_tokens: RefreshTokenDatastore = Depends(get_refresh_token_datastore),
+) -> None:
+    """
+    Revokes a refresh token, IE: on logout. Access tokens already issued are valid until they expire.
+    Answers 200 for unknown tokens as well.
+    """
+    await refresh_tokens.revoke(token)
+
+
+@router.get("/jwks")
+async def jwks(response: Response, key_store: SigningKeyStore = Depends(get_signing_key_store)) -> dict:
+    """
+    Public keys for verifying access tokens, as a JWK set.
+    Clients can cache the keys, but should fetch them again when a token has a kid they don't know.
+    """
+    response.headers["Cache-Control"] = f"public, max-age={int(key_store.reload_interval_seconds)}"
+    return key_store.key_set().jwks()
 
 
 def get_user_claims(user: User, scopes: Scopes) -> list[Claim]:
@@ -68,7 +102,7 @@ def get_user_claims(user: User, scopes: Scopes) -> list[Claim]:
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """
-    Creates jwt encoded oauth2 access token.
+    Creates jwt encoded oauth2 access token, signed with the active signing key.
     :param data: Data to put in token.
     :param expires_delta: expiration time of token.
     :return: jwt token as str.
@@ -79,5 +113,4 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     else:
         expire = datetime.now(UTC) + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return get_signing_key_store().key_set().encode(to_encode)
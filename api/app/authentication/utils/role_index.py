@@ -0,0 +1,16 @@
+"""Index of roles in the role_name:reference format used in tokens and on the authenticated user."""
+
+
+def build_role_index(roles: list[str]) -> dict[str, frozenset[str | None]]:
+    """
+    Builds a map of role name to the set of references the role has. None for roles without reference.
+
+    >>> index = build_role_index(["superuser", "company_admin:1", "company_admin:2"])
+    >>> index["superuser"], sorted(index["company_admin"])
+    (frozenset({None}), ['1', '2'])
+    """
+    index: dict[str, set[str | None]] = {}
+    for role in roles:
+        role_name, _, ref = role.partition(":")
+        index.setdefault(role_name, set()).add(ref or None)
+    return {role_name: frozenset(refs) for role_name, refs in index.items()}
@@ -2,7 +2,7 @@ from fastapi import Depends
 
 from app.authentication.models.db.user import User
 from app.company.models.v1.addresses import AddAddressModel
-from app.database.abstract.document_database import DocumentDatabase
+from app.database.abstract.async_document_database import AsyncDocumentDatabase
 from app.database.dependencies.document_database import get_document_database
 from app.company.datastores.company_datastore import CompanyDatastore
 from app.company.models.db.address import Address
@@ -13,31 +13,30 @@ logger_injector = AppLoggerInjector("AddressDatastore")
 
 
 class AddressDatastore(CompanyDatastore):
-    def __init__(self, db: DocumentDatabase, logger: AppLogger):
+    def __init__(self, db: AsyncDocumentDatabase, logger: AppLogger):
         super().__init__(db, logger)
 
-    def get_addresses(self, company_id: str) -> list[Address]:
-        return [
-            Address(**address) for address in self._companies.by_id(company_id, fields=["addresses"]).get("addresses")
-        ]
+    async def get_addresses(self, company_id: str) -> list[Address]:
+        doc = await self._get_company_doc(company_id, ["addresses"])
+        return [Address(**address) for address in doc.get("addresses") or []]
 
-    def add_address(self, company_id: str, model: AddAddressModel, authenticated_user: User) -> Address:
+    async def add_address(self, company_id: str, model: AddAddressModel, authenticated_user: User) -> Address:
         address = Address.from_add_model(self.db.new_id(), model)
         address_dict = address.dict()
         update_context = self.db.update_context()
         update_context.push_to_list("addresses", address_dict)
-        update_context.push_to_list(
-            "changes",
+        await self._companies.update_document(company_id, update_context)
+        await self._add_change(
+            company_id,
             Change.create(
                 self.db.new_id(), f"addresses.[{address.id}]", ChangeType.add, authenticated_user.email, address_dict
-            ).dict(),
+            ),
         )
-        self._companies.update_document(company_id, update_context)
         return address
 
 
 def get_address_datastore(
-    db: DocumentDatabase = Depends(get_document_database),
+    db: AsyncDocumentDatabase = Depends(get_document_database),
     logger: AppLogger = Depends(logger_injector),
 ) -> AddressDatastore:
     return AddressDatastore(db, logger)
@@ -2,39 +2,43 @@
 The company datastore.
 For accessing and manipulating company related data.
 """
+from collections.abc import Iterable
 from datetime import datetime
 
 from fastapi import Depends
 from pytz import utc
 
-from app.authentication.models.db.user import User, get_ref
+from app.authentication.models.db.user import User
 from app.company.models.db.company import Company
 from app.company.models.db.contact import Contact
+from app.company.models.db.lazy_company import LazyCompany
 from app.company.models.shared.enums import CompanyStatus, SortOrder
 from app.company.models.v1.company_api_models import CompanyCreateModel, CompanyUpdateModel
 from app.company.models.v1.contacts import AddContactModel, UpdateContactModel
-from app.database.abstract.document_database import (
-    DocumentDatabase,
-    DatabaseCollection,
-    transaction,
-    BaseDatastore,
-    Document,
+from app.database.abstract.async_document_database import (
+    AsyncDocumentDatabase,
+    AsyncDatabaseCollection,
+    AsyncBaseDatastore,
+    AsyncDocument,
 )
 from app.database.dependencies.document_database import get_document_database
 from app.logging.log import AppLoggerInjector, AppLogger
+from app.shared.datastores.change_datastore import ChangeDatastore
 from app.shared.errors.errors import NotFoundError
 from app.shared.models.db.change import Change, ChangeType
 from app.shared.models.v1.shared import Language
+from app.shared.utils.continuation_token import ContinuationToken
 
 logger_injector = AppLoggerInjector("company_datastore")
 
 
-class CompanyDatastore(BaseDatastore):
+class CompanyDatastore(AsyncBaseDatastore):
     """The datastore class."""
 
-    def __init__(self, db: DocumentDatabase, logger: AppLogger):
+    def __init__(self, db: AsyncDocumentDatabase, logger: AppLogger):
         super().__init__(db)
         self._logger = logger
+        self._change_log = ChangeDatastore(db)
 
     def __str__(self):
         return self.__repr__()
@@ -43,7 +47,7 @@ class CompanyDatastore(BaseDatastore):
         return f"CompanyDatastore(db={self.db}, logger={self._logger})"
 
     @property
-    def _companies(self) -> DatabaseCollection:
+    def _companies(self) -> AsyncDatabaseCollection:
         """
         Accessor for companies collection.
         :return: DatabaseCollection for companies.
@@ -51,30 +55,51 @@ class CompanyDatastore(BaseDatastore):
         return self.db.collection("companies")
 
     @property
-    def _roles(self) -> DatabaseCollection:
+    def _roles(self) -> AsyncDatabaseCollection:
         """Accessor for roles collection."""
         return self.db.collection("roles")
 
-    def get_companies(
+    async def _add_change(self, company_id: str, change: Change) -> None:
+        """Appends change to the change log of the company."""
+        await self._change_log.add_change("companies", company_id, change)
+
+    async def get_company_dicts(
         self,
         skip: int | None = None,
         take: int | None = None,
         sort_by: str | None = None,
         sort_order: SortOrder | None = None,
         authenticated_user: User | None = None,
-    ) -> list[Company]:
+        keyset: bool = False,
+        continuation_token: ContinuationToken | None = None,
+        include_total: bool = False,
+    ) -> tuple[list[dict], int | None]:
         """
-        Gets a list of companies.
-        :param skip: number of companies to skip, for paging.
+        Gets a list of companies, for the listing.
+        The query is built as filter, sort and then skip and take. The brief fields of the companies are returned as
+        the plain dicts read from the database, without building Company models.
+        :param skip: number of companies to skip, for paging. Ignored when keyset paging.
         :param take: number of companies to return, to limit response size.
         :param sort_by: field name to sort by.
         :param sort_order: asc or desc.
         :param authenticated_user: If any.
-        :return: list of companies.
+        :param keyset: Page by the position of the last company on the previous page instead of skipping.
+        :param continuation_token: Position of the last company on the previous page when keyset paging. Sorting
+        is taken from the token.
+        :param include_total: Also count all companies matching the filter, in the same round trip.
+        :return: list of company documents, and total number of companies if include_total, otherwise None.
         """
         self._logger.debug(
-            f"CompanyDatastore.get_companies(skip={skip}, take={take}, sort_by={sort_by}, sort_order={sort_order}, "
-            f"authenticated_user={authenticated_user})"
+            "CompanyDatastore.get_company_dicts(skip=%s, take=%s, sort_by=%s, sort_order=%s, "
+            "authenticated_user=%s, keyset=%s, continuation_token=%s, include_total=%s)",
+            skip,
+            take,
+            sort_by,
+            sort_order,
+            authenticated_user.id if authenticated_user is not None else None,
+            keyset,
+            continuation_token,
+            include_total,
         )
 
         filters = {}
@@ -82,7 +107,7 @@ class CompanyDatastore(BaseDatastore):
             filters["status"] = CompanyStatus.active
         else:
             if not authenticated_user.is_superuser():
-                company_admins = authenticated_user.get_roles("company_admin")
+                company_admins = [ref for ref in authenticated_user.get_role_refs("company_admin") if ref]
                 if not company_admins:
                     filters["status"] = CompanyStatus.active
                 else:
@@ -90,48 +115,83 @@ class CompanyDatastore(BaseDatastore):
                         {
                             "$or": [
                                 {"status": CompanyStatus.active},
-                                *[{"id": get_ref(role)} for role in company_admins],
+                                *[{"id": ref} for ref in company_admins],
                             ]
                         }
                     )
 
-        self._logger.debug(f"Querying companies: filters={filters}")
-        docs = self._companies.get(filters, Company.brief())
-        if skip:
-            docs = docs.skip(skip)
+        self._logger.debug("Querying companies: filters=%s", filters)
+        if continuation_token is not None:
+            keyset = True
+            sort_by = continuation_token.sort_by
+            sort_order = SortOrder(continuation_token.sort_order)
+
+        fields = Company.brief()
+        if sort_by and sort_by.split(".")[0] not in fields:
+            fields.append(sort_by.split(".")[0])
+
+        docs = self._companies.get(filters, fields)
+        if keyset:
+            docs = docs.after(
+                continuation_token.last_id if continuation_token else None,
+                sort_by,
+                continuation_token.last_value if continuation_token else None,
+                sort_order.value if sort_order else None,
+            )
+        else:
+            if sort_by and sort_order:
+                docs = docs.sort(sort_by, sort_order.value)
+            if skip:
+                docs = docs.skip(skip)
         if take:
             docs = docs.take(take)
-        if sort_by:
-            if sort_order:
-                docs = docs.sort(sort_by, sort_order.value)
-
-        result = []
-        for doc in docs.to_list():
-            result.append(Company(**doc))
 
-        self._logger.debug(f"Result from get_companies={result}")
+        if include_total:
+            return await docs.to_dicts_with_total()
+        return await docs.to_dicts(), None
 
-        return result
-
-    def get_company(self, company_id: str, user: User | None) -> Company:
+    async def get_company(self, company_id: str, user: User | None, include: Iterable[str] = ("contacts",)) -> Company:
         """
         Get a single company.
+        Only the brief fields and the sub collections in include are read from the database.
         :param company_id: ID of the company to get.
         :param user: Authenticated user.
+        :param include: Sub collections to load. See Company.sub_collections.
         :return: Company database model object.
         """
-        company_doc = self._get_company_doc(company_id)
+        company_doc = await self._get_company_doc(company_id, Company.brief() + list(include))
         company = Company(**company_doc)
-        if company.status != CompanyStatus.active:
-            if user.is_superuser():
-                return company
-            if user.has_role("company_admin", company_id):
-                return company
-        else:
-            return company
-        raise NotFoundError(f"Company '{company_id}' not found")
+        self._ensure_access(company, user)
+        return company
+
+    async def get_lazy_company(self, company_id: str, user: User | None) -> LazyCompany:
+        """
+        Get a view of a single company where the sub collections are loaded when they are first used.
+        :param company_id: ID of the company to get.
+        :param user: Authenticated user.
+        :return: LazyCompany.
+        """
+        company = Company(**await self._get_company_doc(company_id, Company.brief()))
+        self._ensure_access(company, user)
+
+        async def load(fields: list[str]) -> dict:
+            return (await self._get_company_doc(company_id, fields)).to_dict()
+
+        return LazyCompany(company, load)
+
+    @staticmethod
+    def _ensure_access(company: Company, user: User | None) -> None:
+        """
+        Only active companies are visible to everyone.
+        :raise NotFoundError: If user is not allowed to see the company.
+        """
+        if company.status == CompanyStatus.active:
+            return
+        if user is not None and (user.is_superuser() or user.has_role("company_admin", company.id)):
+            return
+        raise NotFoundError(f"Company '{company.id}' not found")
 
-    def add_company(
+    async def add_company(
         self,
         company: CompanyCreateModel,
         user: User,
@@ -151,13 +211,13 @@ class CompanyDatastore(BaseDatastore):
                 "activation_date": None,
                 "description": {},
                 "contacts": [],
-                "changes": [Change.create(self.db.new_id(), "init", ChangeType.add, user.email, data).dict()],
             }
         )
-        doc = self._companies.add(data)
+        doc = await self._companies.add(data)
+        await self._add_change(doc.id, Change.create(self.db.new_id(), "init", ChangeType.add, user.email, data))
         return Company(**doc)
 
-    def update_company(
+    async def update_company(
         self,
         company_id: str,
         model: CompanyUpdateModel,
@@ -165,49 +225,53 @@ class CompanyDatastore(BaseDatastore):
     ) -> Company:
         """
         Updates a company with given model.
+        The update is done in one atomic operation, that returns the company as it was before the update so that only
+        the fields that actually changed are logged.
         :raise NotFoundError: If company with id is not found.
         :param company_id: ID of company to update.
         :param model: The data to update.
         :param authenticated_user: User performing the update.
         :return: CompanyDatabaseModel. The updated company.
         """
-        company_doc = self._get_company_doc(company_id)
+        values = model.dict()
+        update_context = self.db.update_context()
+        update_context.set_values(values)
+        company_doc = await self._companies.find_one_and_update(
+            company_id, update_context, fields=Company.brief() + ["contacts"], return_updated=False
+        )
+        if company_doc is None:
+            raise NotFoundError(f"Company with id '{company_id}' not found")
 
         company = Company(**company_doc)
-        for key, value in model.__dict__.items():
-            current_value = company.__dict__.get(key)
-            if current_value != value:
-                company.__dict__[key] = value
-                company.changes.append(
-                    Change.create(self.db.new_id(), key, ChangeType.update, authenticated_user.email, value)
-                )
-
-        company_doc = company_doc.replace(company.dict())
-        return Company(**company_doc)
-
-    @transaction
-    def update_company_names(self, company_id: str, names: dict[str, str], user: User) -> Company:
+        changes = [
+            Change.create(self.db.new_id(), key, ChangeType.update, authenticated_user.email, value)
+            for key, value in values.items()
+            if getattr(company, key) != getattr(model, key)
+        ]
+        if changes:
+            await self._change_log.add_changes("companies", company_id, changes)
+        return Company(**{**company.dict(), **values})
+
+    async def update_company_names(self, company_id: str, names: dict[str, str], user: User) -> Company:
         update_context = self.db.update_context()
         update_context.set_values({"name": names})
-        update_context.push_to_list(
-            "changes", Change.create(self.db.new_id(), "name", ChangeType.update, user.email, names).dict()
-        )
-        self._companies.update_document(
+        await self._companies.update_document(
             company_id,
             update_context,
         )
-        return self.get_company(company_id, user)
+        await self._add_change(company_id, Change.create(self.db.new_id(), "name", ChangeType.update, user.email, names))
+        return await self.get_company(company_id, user)
 
-    def update_company_descriptions(self, company_id: str, descriptions: dict[str, str], user: User) -> Company:
+    async def update_company_descriptions(self, company_id: str, descriptions: dict[str, str], user: User) -> Company:
         update_context = self.db.update_context()
         update_context.set_values({"description": descriptions})
-        update_context.push_to_list(
-            "changes", Change.create(self.db.new_id(), "description", ChangeType.update, user.email, descriptions).dict()
+        await self._companies.update_document(company_id, update_context)
+        await self._add_change(
+            company_id, Change.create(self.db.new_id(), "description", ChangeType.update, user.email, descriptions)
         )
-        self._companies.update_document(company_id, update_context)
-        return self.get_company(company_id, user)
+        return await self.get_company(company_id, user)
 
-    def add_contact(
+    async def add_contact(
         self,
         company_id: str,
         model: AddContactModel,
@@ -223,11 +287,10 @@ class CompanyDatastore(BaseDatastore):
         :return: The added contact. ContactDatabaseModel.
         """
         contact = Contact.from_create_contract_model(self.db.new_id(), model.dict(), authenticated_user)
-        self._companies.push_to_list(company_id, "contacts", contact.dict())
+        await self._companies.push_to_list(company_id, "contacts", contact.dict())
         return contact
 
-    @transaction
-    def update_contact(
+    async def update_contact(
         self,
         company_id: str,
         contact_id: str,
@@ -236,33 +299,43 @@ class CompanyDatastore(BaseDatastore):
     ) -> Contact:
         """
         Updates contact on company.
+        Only the contact is updated and returned by the database, the rest of the company is left untouched.
         :param contact_id:
         :param company_id: ID of company to update contact on.
         :param model: Database model object with updated contact data.
         :param authenticated_user: User object for authenticated user. For change logging.
         :return: Updated contact model.
+        :raise NotFoundError: If company or contact does not exist.
         """
-        company_doc = self._get_company_doc(company_id)
-        company = Company(**company_doc)
-        contact = next((c for c in company.contacts if c.id == contact_id), None)
-        if contact is None:
+        update_context = self.db.update_context()
+        update_context.set_in_list(
+            "contacts",
+            contact_id,
+            {
+                "type": model.type,
+                "value": model.value,
+                "description": model.description,
+                "changed_by": authenticated_user.email,
+                "changed_at": datetime.now(utc),
+            },
+        )
+        company_doc = await self._companies.find_one_and_update(
+            company_id, update_context, filters={"contacts.id": contact_id}, fields=["contacts.$"]
+        )
+        if company_doc is None:
+            await self._ensure_company_exists(company_id)
             raise NotFoundError(f"Contact with id '{contact_id}' not found on company '{company_id}'.")
 
-        contact.type = model.type
-        contact.value = model.value
-        contact.description = model.description
-        contact.changed_by = authenticated_user.email
-        contact.changed_at = datetime.now(utc)
-
-        change = Change.create(
-            self.db.new_id(), f"contacts.{contact.id}", ChangeType.update, authenticated_user.email, contact.dict()
+        contact = Contact(**company_doc["contacts"][0])
+        await self._add_change(
+            company_id,
+            Change.create(
+                self.db.new_id(), f"contacts.{contact.id}", ChangeType.update, authenticated_user.email, contact.dict()
+            ),
         )
-        company.changes.append(change)
-
-        company_doc.replace(company.dict())
         return contact
 
-    def delete_contact(self, company_id: str, contact_id: str, user: User) -> None:
+    async def delete_contact(self, company_id: str, contact_id: str, user: User) -> None:
         """
         Delete a contact from company.
 
@@ -274,57 +347,66 @@ class CompanyDatastore(BaseDatastore):
 
         :raises app.errors.NotFoundError: if company or contact does not exist.
         """
-        company_doc = self._get_company_doc(company_id)
-        company = Company(**company_doc)
-        contact = next((c for c in company.contacts if c.id == contact_id), None)
-        if contact is None:
+        update_context = self.db.update_context()
+        update_context.pull_from_list("contacts", contact_id)
+        company_doc = await self._companies.find_one_and_update(
+            company_id, update_context, filters={"contacts.id": contact_id}, fields=["_id"]
+        )
+        if company_doc is None:
+            await self._ensure_company_exists(company_id)
             raise NotFoundError(f"No contact with id '{contact_id}' was found.")
 
-        company.changes.append(
-            Change.create(self.db.new_id(), f"company.contacts.{contact_id}", ChangeType.delete, user.email, None)
+        await self._add_change(
+            company_id,
+            Change.create(self.db.new_id(), f"company.contacts.{contact_id}", ChangeType.delete, user.email, None),
         )
-        company.contacts.remove(contact)
-        company_doc.replace(company.dict())
 
-    def activate_company(self, company_id: str, authenticated_user: User) -> Company:
+    async def activate_company(self, company_id: str, authenticated_user: User) -> Company:
         """Updates a companys status to active."""
-        return self._change_status(company_id, authenticated_user, CompanyStatus.active)
+        return await self._change_status(company_id, authenticated_user, CompanyStatus.active)
 
-    def deactivate_company(self, company_id: str, authenticated_user: User) -> Company:
+    async def deactivate_company(self, company_id: str, authenticated_user: User) -> Company:
         """Updates company status to 'deactivated'."""
-        return self._change_status(company_id, authenticated_user, CompanyStatus.deactivated)
+        return await self._change_status(company_id, authenticated_user, CompanyStatus.deactivated)
 
-    def get_company_languages(self, company_id: str) -> list[Language]:
+    async def get_company_languages(self, company_id: str) -> list[Language]:
         """Get the list of languages configured that a company wants to support."""
-        company_doc = self._get_company_doc(company_id)
+        company_doc = await self._get_company_doc(company_id, ["content_languages_iso"])
         languages = company_doc.to_dict().get("content_languages_iso")
         return languages
 
-    def _get_company_doc(self, company_id: str, fields: list[str] | None = None) -> Document:
+    async def _get_company_doc(self, company_id: str, fields: list[str] | None = None) -> AsyncDocument:
         """
         Get the document of the company with given ID.
         :raise NotFoundError: If there is no company with given ID found.
         :param company_id: ID of company.
         :param fields: The fields that are wished to be returned.
-        :return: Document of type 'app.database.abstract.document_database.Document'
+        :return: Document of type 'app.database.abstract.async_document_database.AsyncDocument'
         """
-        company_doc = self._companies.by_id(company_id, fields)
+        company_doc = await self._companies.by_id(company_id, fields)
         if company_doc is None:
             raise NotFoundError(f"Company with id '{company_id}' not found")
         return company_doc
 
-    def _change_status(self, company_id: str, authenticated_user: User, status: CompanyStatus) -> Company:
+    async def _ensure_company_exists(self, company_id: str) -> None:
+        """
+        :raise NotFoundError: If there is no company with given ID.
+        """
+        if not await self._companies.exists({"id": company_id}):
+            raise NotFoundError(f"Company with id '{company_id}' not found")
+
+    async def _change_status(self, company_id: str, authenticated_user: User, status: CompanyStatus) -> Company:
         update_context = self.db.update_context()
         update_context.set_values({"status": status})
-        update_context.push_to_list(
-            "changes", Change.create(self.db.new_id(), "status", ChangeType.update, authenticated_user.email, status)
+        await self._companies.update_document(company_id, update_context)
+        await self._add_change(
+            company_id, Change.create(self.db.new_id(), "status", ChangeType.update, authenticated_user.email, status)
         )
-        self._companies.update_document(company_id, update_context)
-        return self.get_company(company_id, authenticated_user)
+        return await self.get_company(company_id, authenticated_user)
 
 
 def get_company_datastore(
-    db: DocumentDatabase = Depends(get_document_database),
+    db: AsyncDocumentDatabase = Depends(get_document_database),
     logger: AppLogger = Depends(logger_injector),
 ) -> CompanyDatastore:
     """
@@ -1,9 +1,8 @@
 from fastapi import UploadFile, Depends
 
-from app.database.abstract.document_database import DocumentDatabase
+from app.database.abstract.async_document_database import AsyncDocumentDatabase
 from app.database.dependencies.document_database import get_document_database
 from app.company.datastores.company_datastore import CompanyDatastore
-from app.company.models.db.company import Company
 from app.logging.log import AppLogger, AppLoggerInjector
 from app.shared.io.file_manager import FileManager, get_file_manager
 from app.shared.models.db.change import Change, ChangeType
@@ -13,7 +12,7 @@ logger_injector = AppLoggerInjector("CompanyProfilePictureDatastore")
 
 
 class CompanyProfilePictureDatastore(CompanyDatastore):
-    def __init__(self, db: DocumentDatabase, file_manager: FileManager, logger: AppLogger):
+    def __init__(self, db: AsyncDocumentDatabase, file_manager: FileManager, logger: AppLogger):
         super().__init__(db, logger)
         self._file_manager = file_manager
 
@@ -28,18 +27,17 @@ class CompanyProfilePictureDatastore(CompanyDatastore):
         :return: URL for new file.
         :raise NotFoundError: If company was not found.
         """
-        company = Company(**self._get_company_doc(company_id))
-        file_url = await self._file_manager.save_company_profile_picture(company.id, file)
+        await self._ensure_company_exists(company_id)
+        file_url = await self._file_manager.save_company_profile_picture(company_id, file)
         update_context = self.db.update_context()
         update_context.set_values({"profile_picture_url": file_url})
-        update_context.push_to_list(
-            "changes",
-            Change.create(self.db.new_id(), "profile_picture_url", ChangeType.update, user.email, file_url).dict(),
-        )
-        self._companies.update_document(
+        await self._companies.update_document(
             company_id,
             update_context,
         )
+        await self._add_change(
+            company_id, Change.create(self.db.new_id(), "profile_picture_url", ChangeType.update, user.email, file_url)
+        )
         return file_url
 
     def get_company_profile_picture_physical_path(self, image_file_name: str) -> str:
@@ -47,7 +45,7 @@ class CompanyProfilePictureDatastore(CompanyDatastore):
 
 
 def get_company_profile_picture_datastore(
-    db: DocumentDatabase = Depends(get_document_database),
+    db: AsyncDocumentDatabase = Depends(get_document_database),
     file_manager: FileManager = Depends(get_file_manager),
     logger: AppLogger = Depends(logger_injector),
 ) -> CompanyProfilePictureDatastore:
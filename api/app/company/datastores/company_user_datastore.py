@@ -1,7 +1,8 @@
 from fastapi import Depends
 
 from app.company.errors.invalid_input_error import InvalidInputError
-from app.database.abstract.document_database import DocumentDatabase
+from app.database.abstract.async_document_database import AsyncDocumentDatabase
+from app.database.abstract.document_database import BulkWriteResult
 from app.company.datastores.company_datastore import CompanyDatastore
 from app.user.datastores.user_datastore import UserDatastore, get_user_datastore
 from app.database.dependencies.document_database import get_document_database
@@ -15,11 +16,13 @@ _logger_injector = AppLoggerInjector("CompanyUserDatastore")
 
 
 class CompanyUserDatastore(CompanyDatastore):
-    def __init__(self, db: DocumentDatabase, user_datastore: UserDatastore, logger: AppLogger):
+    def __init__(self, db: AsyncDocumentDatabase, user_datastore: UserDatastore, logger: AppLogger):
         super().__init__(db, logger)
         self._user_datastore = user_datastore
 
-    def add_user_to_company(self, company_id: str, role_name: str, user_id: str, authenticated_user: User) -> list[User]:
+    async def add_user_to_company(
+        self, company_id: str, role_name: str, user_id: str, authenticated_user: User
+    ) -> list[User]:
         """
         Adds user to company with role.
 
@@ -34,29 +37,66 @@ class CompanyUserDatastore(CompanyDatastore):
         :raise app.errors.NotFoundError: If company or user is not found.
         :raise app.errors.InvalidInputError: If provided role is not of type company_role.
         """
-        if not self._companies.exists({"id": company_id}):
+        if not await self._companies.exists({"id": company_id}):
             raise NotFoundError(f"No company with id '{company_id}' was found.")
 
-        if not self._roles.exists({"name": role_name, "type": RoleType.company_role}):
+        if not await self._roles.exists({"name": role_name, "type": RoleType.company_role}):
             raise InvalidInputError("Invalid role")
 
-        self._user_datastore.add_role_to_user(authenticated_user, user_id, role_name, company_id)
-        self._companies.push_to_list(
+        await self._user_datastore.add_role_to_user(authenticated_user, user_id, role_name, company_id)
+        await self._add_change(
             company_id,
-            "changes",
             Change.create(
                 self.db.new_id(),
                 f"company.users.{user_id}",
                 ChangeType.add,
                 authenticated_user.email,
                 f"{role_name}:{user_id}",
-            ).dict(),
+            ),
         )
-        return self._user_datastore.get_company_users(company_id)
+        return await self._user_datastore.get_company_users(company_id)
+
+    async def add_users_to_company(
+        self, company_id: str, role_name: str, user_ids: list[str], authenticated_user: User
+    ) -> BulkWriteResult:
+        """
+        Adds several users to company with role, with one bulk write for the users and one for the change log.
+
+        :param company_id: ID of company to add users to.
+        :param role_name: Name of role to give the users. Has to be role of type company_role.
+        :param user_ids: IDs of the users to receive the role.
+        :param authenticated_user: User performing operation.
+
+        :return: BulkWriteResult with the outcome for each user.
+
+        :raise app.errors.NotFoundError: If company is not found.
+        :raise app.errors.InvalidInputError: If provided role is not of type company_role.
+        """
+        if not await self._companies.exists({"id": company_id}):
+            raise NotFoundError(f"No company with id '{company_id}' was found.")
+
+        if not await self._roles.exists({"name": role_name, "type": RoleType.company_role}):
+            raise InvalidInputError("Invalid role")
+
+        result = await self._user_datastore.add_role_to_users(authenticated_user, user_ids, role_name, company_id)
+        changes = [
+            Change.create(
+                self.db.new_id(),
+                f"company.users.{item.doc_id}",
+                ChangeType.add,
+                authenticated_user.email,
+                f"{role_name}:{item.doc_id}",
+            )
+            for item in result.items
+            if item.ok
+        ]
+        if changes:
+            await self._change_log.add_changes("companies", company_id, changes)
+        return result
 
 
 def get_company_user_datastore(
-    db: DocumentDatabase = Depends(get_document_database),
+    db: AsyncDocumentDatabase = Depends(get_document_database),
     user_datastore: UserDatastore = Depends(get_user_datastore),
     logger: AppLogger = Depends(_logger_injector),
 ) -> CompanyUserDatastore:
@@ -3,7 +3,6 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
-from app.shared.models.db.change import Change
 from app.shared.models.v1.shared import Language
 from .address import Address
 from .contact import Contact
@@ -25,7 +24,6 @@ class Company(BaseModel):
     external_website_url: str | None
     profile_picture_url: str | None
     contacts: list[Contact] | None = Field([])
-    changes: list[Change] = Field([])
     addresses: list[Address] = Field([])
     orders: list[Order] = Field([])
 
@@ -42,3 +40,8 @@ class Company(BaseModel):
             "external_website_url",
             "profile_picture_url",
         ]
+
+    @classmethod
+    def sub_collections(cls):
+        """The fields holding lists of sub documents, that grow with the company."""
+        return ["contacts", "addresses", "orders"]
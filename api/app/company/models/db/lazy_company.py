@@ -0,0 +1,59 @@
+"""LazyCompany"""
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .address import Address
+from .company import Company
+from .contact import Contact
+from .order import Order
+
+
+class LazyCompany:
+    """
+    View of a company where only the brief fields are loaded up front.
+    The sub collections are loaded from the database the first time they are awaited.
+    Brief fields are accessed as attributes, like on Company.
+    """
+
+    def __init__(self, company: Company, load: Callable[[list[str]], Awaitable[dict[str, Any]]]):
+        """
+        Creates a lazy company.
+        :param company: Company with the brief fields loaded.
+        :param load: Loads the given fields of the company document.
+        """
+        self._company = company
+        self._load = load
+        self._loaded: set[str] = set()
+
+    def __getattr__(self, name: str) -> Any:
+        if name in Company.sub_collections():
+            raise AttributeError(f"'{name}' is not loaded, use 'await {name}()' or 'await load()'")
+        return getattr(self._company, name)
+
+    def __repr__(self):
+        return f"LazyCompany({repr(self._company)}, loaded={self._loaded})"
+
+    async def contacts(self) -> list[Contact]:
+        """Get the contacts of the company, loading them if needed."""
+        return (await self.load("contacts")).contacts
+
+    async def addresses(self) -> list[Address]:
+        """Get the addresses of the company, loading them if needed."""
+        return (await self.load("addresses")).addresses
+
+    async def orders(self) -> list[Order]:
+        """Get the orders of the company, loading them if needed."""
+        return (await self.load("orders")).orders
+
+    async def load(self, *sub_collections: str) -> Company:
+        """
+        Loads the given sub collections that are not already loaded, in one read.
+        :param sub_collections: Names of the sub collections. All of them if none are given.
+        :return: The Company model with the loaded sub collections.
+        """
+        missing = [name for name in sub_collections or Company.sub_collections() if name not in self._loaded]
+        if missing:
+            data = await self._load(missing)
+            self._company = Company(**{**self._company.dict(), **{name: data.get(name) or [] for name in missing}})
+            self._loaded.update(missing)
+        return self._company
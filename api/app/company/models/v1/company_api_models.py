@@ -9,7 +9,6 @@ from app.company.models.db.company import Company
 from app.company.models.shared.enums import CompanyStatus, CompanyTypes
 from app.company.models.v1.contacts import ContactListModel
 from app.company.utils.datetime_utils import to_timezone
-from app.shared.models.db.change import Change
 from app.shared.models.v1.base_out_model import BaseOutModel
 from app.shared.models.v1.shared import Language
 from app.shared.utils.lang_utils import select_localized_text
@@ -41,13 +40,8 @@ def _initialize_company_model(
         profile_picture_url=assemble_profile_picture_url(request, router, model.profile_picture_url, lang),
     )
 
-    if isinstance(instance, CompanyOutModel):
-        instance.contacts = model.contacts
-        try:
-            if authenticated_user.is_superuser() or authenticated_user.has_role("company_admin", model.id):
-                instance.changes = model.changes
-        except AttributeError:
-            pass
+    if isinstance(instance, CompanyOutModel) and model.contacts is not None:
+        instance.contacts = [ContactListModel(**contact.dict()) for contact in model.contacts]
 
     return instance
 
@@ -81,12 +75,37 @@ class CompanyOutListModel(BaseOutModel):
         """
         return _initialize_company_model(cls, model, lang, tz, request, router, authenticated_user)
 
+    @classmethod
+    def dict_from_document(
+        cls, doc: dict, lang: Language, tz: str | tzinfo, url: str, request: Request, router: APIRouter
+    ) -> dict:
+        """
+        Creates the output of from_database_model as a plain dict, from a company document read with the brief
+        fields, for the read only listing. No model is built or validated.
+        :param doc: Company document, with id.
+        :param url: The url of the listing, set on every item.
+        """
+        languages = [Language(code) for code in doc.get("content_languages_iso", [])]
+        return {
+            "operations": [],
+            "url": url,
+            "id": doc["id"],
+            "name": select_localized_text(doc.get("name") or {}, lang, languages),
+            "status": doc["status"],
+            "created_date": to_timezone(doc["created_date"], tz),
+            "company_types": doc.get("company_types", []),
+            "content_languages_iso": doc.get("content_languages_iso", []),
+            "activation_date": to_timezone(doc.get("activation_date"), tz),
+            "description": select_localized_text(doc.get("description") or {}, lang, languages),
+            "external_website_url": doc.get("external_website_url"),
+            "profile_picture_url": assemble_profile_picture_url(request, router, doc.get("profile_picture_url"), lang),
+        }
+
 
 class CompanyOutModel(CompanyOutListModel):
     """Company model used when getting a single company."""
 
     contacts: list[ContactListModel] | None
-    changes: list[Change] | None
 
     @classmethod
     def from_database_model(
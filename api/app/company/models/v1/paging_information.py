@@ -3,25 +3,55 @@ Module for paging information dependency.
 """
 from fastapi import Query
 
+from app.shared.utils.continuation_token import ContinuationToken
+
 
 class PagingInformation:
     """
     Data class for paging information.
     """
 
-    def __init__(self, take: int, skip: int):
+    def __init__(
+        self,
+        take: int,
+        skip: int,
+        keyset: bool = False,
+        continuation_token: ContinuationToken | None = None,
+        include_total: bool = False,
+    ):
         self.take = take
         self.skip = skip
+        self.keyset = keyset or continuation_token is not None
+        self.continuation_token = continuation_token
+        self.include_total = include_total
+
+    def __repr__(self):
+        return (
+            f"PagingInformation(take={self.take}, skip={self.skip}, keyset={self.keyset}, "
+            f"continuation_token={self.continuation_token}, include_total={self.include_total})"
+        )
 
 
 def get_paging_information(
     take: int = Query(20),
     skip: int = Query(0),
+    keyset: bool = Query(False),
+    continuation_token: str | None = Query(None),
+    include_total: bool = Query(False),
 ) -> PagingInformation:
     """
     Dependency injection method for Paging information.
+
+    >>> get_paging_information(20, 0, False, None, True)
+    PagingInformation(take=20, skip=0, keyset=False, continuation_token=None, include_total=True)
+
     :param take: Number of items to take. Default=20.
-    :param skip: Number of items to skip. Default=0.
+    :param skip: Number of items to skip. Default=0. Ignored when keyset paging is used.
+    :param keyset: Page with continuation tokens instead of skip. Implied if continuation_token is given.
+    :param continuation_token: Token from next_page of the previous page, when keyset paging.
+    :param include_total: Include total number of items and pages in the response.
     :return: PagingInformation.
+    :raise InvalidContinuationTokenError: If continuation_token can't be decoded.
     """
-    return PagingInformation(take, skip)
+    token = ContinuationToken.decode(continuation_token) if continuation_token else None
+    return PagingInformation(take, skip, keyset, token, include_total)
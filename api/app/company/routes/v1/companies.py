@@ -2,7 +2,7 @@
 Routing module for companies endpoint.
 """
 from fastapi import APIRouter, Depends, Query, Body, Path, Security, File, UploadFile, status, Request
-from fastapi.responses import PlainTextResponse, FileResponse
+from fastapi.responses import PlainTextResponse, FileResponse, ORJSONResponse
 
 from app.company.datastores.company_datastore import (
     CompanyDatastore,
@@ -29,17 +29,21 @@ from app.company.models.v1.company_api_models import (
     CompanyUpdateModel,
     CompanyOutListModel,
 )
+from app.shared.datastores.change_datastore import ChangeDatastore, get_change_datastore
+from app.shared.models.db.change import Change
 from app.shared.models.v1.paging_response_model import PagingResponseModel
 from app.authentication.models.db.user import User
-from app.shared.utils.request_utils import get_url
+from app.shared.utils.continuation_token import ContinuationToken
+from app.shared.utils.request_utils import get_current_request_url_with_additions, get_url
 from app.shared.utils.url_utils import assemble_profile_picture_url
+from app.shared.responses.trusted_model_response import TrustedModelResponse
 
 logger_injector = AppLoggerInjector("companies_router")
 
 router = APIRouter(prefix=BASE_PATH + "/companies", tags=["Companies"])
 
 
-@router.get("/", response_model=PagingResponseModel[CompanyOutListModel])
+@router.get("/", response_model=PagingResponseModel[CompanyOutListModel], response_class=ORJSONResponse)
 async def get_companies(
     sort_by: str | None = Query(None),
     sort_order: SortOrder = Query(SortOrder.asc),
@@ -48,63 +52,93 @@ async def get_companies(
     paging_information: PagingInformation = Depends(get_paging_information),
     authenticated_user: User | None = Depends(get_current_user_if_any),
     logger: AppLogger = Depends(logger_injector),
-) -> PagingResponseModel[CompanyOutListModel]:
-    """Get list of companies wrapped in a paging response."""
+) -> ORJSONResponse:
+    """
+    Get list of companies wrapped in a paging response.
+    Read only fast path: the company documents are turned straight into the output and serialized with orjson,
+    without building and validating Company, CompanyOutListModel and the response model.
+    """
     logger.debug(
-        f"Incoming={get_url(essentials.request)}: sort_by={sort_by}, sort_order={sort_order}, "
+        lambda: f"Incoming={get_url(essentials.request)}: sort_by={sort_by}, sort_order={sort_order}, "
         f"essentials={essentials}, paging_information={paging_information}, user={authenticated_user}"
     )
-    company_datastore = company_datastore.get_companies(
-        paging_information.skip, paging_information.take, sort_by, sort_order, authenticated_user
-    )
-    items: list[CompanyOutListModel] = []
-    for company in company_datastore:
-        item = CompanyOutListModel.from_database_model(
-            company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
-        )
-        items.append(item)
-    response = PagingResponseModel[CompanyOutListModel].create(
-        items,
+    companies, total = await company_datastore.get_company_dicts(
         paging_information.skip,
         paging_information.take,
-        essentials.request,
+        sort_by,
+        sort_order,
+        authenticated_user,
+        paging_information.keyset,
+        paging_information.continuation_token,
+        paging_information.include_total,
+    )
+    url = get_current_request_url_with_additions(essentials.request)
+    items = [
+        CompanyOutListModel.dict_from_document(
+            company, essentials.language, essentials.timezone, url, essentials.request, router
+        )
+        for company in companies
+    ]
+    if paging_information.keyset:
+        next_token = None
+        if companies:
+            token = paging_information.continuation_token
+            next_token = ContinuationToken.after_item(
+                companies[-1],
+                token.sort_by if token else sort_by,
+                token.sort_order if token else sort_order.value,
+            )
+        return ORJSONResponse(
+            PagingResponseModel.create_dict_from_token(
+                items, paging_information.take, next_token, essentials.request, total
+            )
+        )
+    return ORJSONResponse(
+        PagingResponseModel.create_dict(
+            items, paging_information.skip, paging_information.take, essentials.request, total
+        )
     )
-    return response
 
 
-@router.get("/{company_id}", response_model=CompanyOutModel)
+@router.get("/{company_id}", response_model=CompanyOutModel, response_class=TrustedModelResponse)
 async def get_company(
     company_id: str,
     company_datastore: CompanyDatastore = Depends(get_company_datastore),
     essentials: Essentials = Depends(get_essentials),
     authenticated_user: User = Depends(get_current_user_if_any),
-) -> CompanyOutModel:
+) -> TrustedModelResponse:
     """Get a company by id."""
-    company = company_datastore.get_company(company_id, authenticated_user)
-    return CompanyOutModel.from_database_model(
-        company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+    company = await company_datastore.get_company(company_id, authenticated_user)
+    return TrustedModelResponse(
+        CompanyOutModel.from_database_model(
+            company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+        ),
+        response_model=CompanyOutModel,
     )
 
 
-@router.post("/", response_model=CompanyOutModel)
+@router.post("/", response_model=CompanyOutModel, response_class=TrustedModelResponse)
 async def add_company(
     company: CompanyCreateModel = Body(...),
     authenticated_user: User = Security(get_current_user, scopes=("verified:True",)),
     company_datastore: CompanyDatastore = Depends(get_company_datastore),
     company_user_datastore: CompanyUserDatastore = Depends(get_company_user_datastore),
     essentials: Essentials = Depends(get_essentials),
-) -> CompanyOutModel:
+) -> TrustedModelResponse:
     """Add a new company."""
-    created_company = company_datastore.add_company(company, authenticated_user)
-    company_user_datastore.add_user_to_company(
+    created_company = await company_datastore.add_company(company, authenticated_user)
+    await company_user_datastore.add_user_to_company(
         created_company.id, "company_admin", authenticated_user.id, authenticated_user
     )
-    return CompanyOutModel.from_database_model(
-        created_company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+    return TrustedModelResponse(
+        CompanyOutModel.from_database_model(
+            created_company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+        ),
+        response_model=CompanyOutModel,
     )
 
 
-@router.put("/{company_id}", response_model=CompanyOutModel)
+@router.put("/{company_id}", response_model=CompanyOutModel, response_class=TrustedModelResponse)
 async def update_company(
     company_id: str = Path(...),
     company: CompanyUpdateModel = Body(...),
@@ -116,13 +150,16 @@ async def update_company(
     essentials: Essentials = Depends(get_essentials),
 ):
     """Update a company."""
-    company = company_datastore.update_company(company_id, company, authenticated_user)
-    return CompanyOutModel.from_database_model(
-        company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+    company = await company_datastore.update_company(company_id, company, authenticated_user)
+    return TrustedModelResponse(
+        CompanyOutModel.from_database_model(
+            company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+        ),
+        response_model=CompanyOutModel,
     )
 
 
-@router.post("/{company_id}/activate", response_model=CompanyOutModel)
+@router.post("/{company_id}/activate", response_model=CompanyOutModel, response_class=TrustedModelResponse)
 async def activate_company(
     company_id: str = Path(...),
     authenticated_user: User = Security(
@@ -134,15 +171,18 @@ async def activate_company(
     ),
     company_datastore: CompanyDatastore = Depends(get_company_datastore),
     essenties: Essentials = Depends(get_essentials),
-) -> CompanyOutModel:
+) -> TrustedModelResponse:
     """Activates new company."""
-    company = company_datastore.activate_company(company_id, authenticated_user)
-    return CompanyOutModel.from_database_model(
-        company, essenties.language, essenties.timezone, essenties.request, router, authenticated_user
+    company = await company_datastore.activate_company(company_id, authenticated_user)
+    return TrustedModelResponse(
+        CompanyOutModel.from_database_model(
+            company, essenties.language, essenties.timezone, essenties.request, router, authenticated_user
+        ),
+        response_model=CompanyOutModel,
     )
 
 
-@router.post("/{company_id}/deactivate", response_model=CompanyOutModel)
+@router.post("/{company_id}/deactivate", response_model=CompanyOutModel, response_class=TrustedModelResponse)
 async def deactivate_company(
     company_id: str,
     authenticated_user: User = Security(
@@ -156,9 +196,12 @@ async def deactivate_company(
     essentials: Essentials = Depends(get_essentials),
 ):
     """Deactivates a company."""
-    company = company_datastore.deactivate_company(company_id, authenticated_user)
-    return CompanyOutModel.from_database_model(
-        company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+    company = await company_datastore.deactivate_company(company_id, authenticated_user)
+    return TrustedModelResponse(
+        CompanyOutModel.from_database_model(
+            company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+        ),
+        response_model=CompanyOutModel,
     )
 
 
@@ -210,12 +253,12 @@ async def get_company_names(
     logger: AppLogger = Depends(logger_injector),
 ):
     """Get the map of names for company for easy edit and update."""
-    logger.debug(f"Incoming={get_url(request)}: company_id={company_id}, user={user}")
-    company = company_datastore.get_company(company_id, user)
+    logger.debug(lambda: f"Incoming={get_url(request)}: company_id={company_id}, user={user}")
+    company = await company_datastore.get_lazy_company(company_id, user)
     return company.name
 
 
-@router.put("/{company_id}/names", response_model=CompanyOutModel)
+@router.put("/{company_id}/names", response_model=CompanyOutModel, response_class=TrustedModelResponse)
 async def update_company_names(
     company_id: str,
     names: dict[str, str] = Body(...),
@@ -225,9 +268,29 @@ async def update_company_names(
     company_datastore: CompanyDatastore = Depends(get_company_datastore),
     essentials: Essentials = Depends(get_essentials),
 ):
-    company = company_datastore.update_company_names(company_id, names, authenticated_user)
-    return CompanyOutModel.from_database_model(
-        company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+    company = await company_datastore.update_company_names(company_id, names, authenticated_user)
+    return TrustedModelResponse(
+        CompanyOutModel.from_database_model(
+            company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+        ),
+        response_model=CompanyOutModel,
+    )
+
+
+@router.get("/{company_id}/changes", response_model=PagingResponseModel[Change])
+async def get_company_changes(
+    company_id: str,
+    user: User = Security(get_current_user, scopes=("roles:superuser", "roles:company_admin:{company_id}")),
+    change_datastore: ChangeDatastore = Depends(get_change_datastore),
+    paging_information: PagingInformation = Depends(get_paging_information),
+    essentials: Essentials = Depends(get_essentials),
+    logger: AppLogger = Depends(logger_injector),
+) -> PagingResponseModel[Change]:
+    """Get the change log of a company, oldest first."""
+    logger.debug(lambda: f"Incoming={get_url(essentials.request)}: company_id={company_id}, user={user}")
+    changes = await change_datastore.get_changes(company_id, paging_information.skip, paging_information.take)
+    return PagingResponseModel[Change].create(
+        changes, paging_information.skip, paging_information.take, essentials.request
     )
 
 
@@ -237,11 +300,11 @@ async def get_company_descriptions(
     user: User = Security(get_current_user, scopes=("roles:superuser", "roles:company_admin:{company_id}")),
     company_datastore: CompanyDatastore = Depends(get_company_datastore),
 ):
-    company = company_datastore.get_company(company_id, user)
+    company = await company_datastore.get_lazy_company(company_id, user)
     return company.description
 
 
-@router.put("/{company_id}/descriptions", response_model=CompanyOutModel)
+@router.put("/{company_id}/descriptions", response_model=CompanyOutModel, response_class=TrustedModelResponse)
 async def update_company_descriptions(
     company_id: str,
     descriptions: dict[str, str] = Body(...),
@@ -251,9 +314,12 @@ async def update_company_descriptions(
     company_datastore: CompanyDatastore = Depends(get_company_datastore),
     essentials: Essentials = Depends(get_essentials),
 ):
-    company = company_datastore.update_company_descriptions(company_id, descriptions, authenticated_user)
-    return CompanyOutModel.from_database_model(
-        company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+    company = await company_datastore.update_company_descriptions(company_id, descriptions, authenticated_user)
+    return TrustedModelResponse(
+        CompanyOutModel.from_database_model(
+            company, essentials.language, essentials.timezone, essentials.request, router, authenticated_user
+        ),
+        response_model=CompanyOutModel,
     )
 
 
@@ -279,5 +345,5 @@ async def get_profile_picture(
     company_profile_picture_datastore: CompanyProfilePictureDatastore = Depends(get_company_profile_picture_datastore),
     logger: AppLogger = Depends(logger_injector),
 ):
-    logger.debug(f"Incoming={get_url(request)}")
+    logger.debug(lambda: f"Incoming={get_url(request)}")
     return company_profile_picture_datastore.get_company_profile_picture_physical_path(image_file_name)
@@ -15,7 +15,7 @@ async def get_addreses(
     company_id: str,
     ds: AddressDatastore = Depends(get_address_datastore),
 ):
-    return ds.get_addresses(company_id)
+    return await ds.get_addresses(company_id)
 
 
 @router.post("/", response_model=Address)
@@ -27,5 +27,5 @@ async def add_address(
         get_current_user, scopes=("roles:superuser", "roles:company_admin:{company_id}")
     ),
 ):
-    new_address = address_datastore.add_address(company_id, address, authenticated_user)
+    new_address = await address_datastore.add_address(company_id, address, authenticated_user)
     return new_address
@@ -36,7 +36,7 @@ async def add_contact(
     essentials: Essentials = Depends(get_essentials),
 ) -> ContactOutModel:
     """Add a contact to a company."""
-    contact = companies.add_contact(company_id, model, authenticated_user)
+    contact = await companies.add_contact(company_id, model, authenticated_user)
     return ContactOutModel.from_database_model(contact, essentials.request, essentials.timezone)
 
 
@@ -57,7 +57,7 @@ async def update_contact(
     essentials: Essentials = Depends(get_essentials),
 ):
     """Update contact on company."""
-    contact = company_datastore.update_contact(company_id, contact_id, contact, user)
+    contact = await company_datastore.update_contact(company_id, contact_id, contact, user)
     return ContactOutModel.from_database_model(contact, essentials.request, essentials.timezone)
 
 
@@ -71,4 +71,4 @@ async def delete_contact(
     user: User = Security(get_current_user, scopes=("roles:superuser", "roles:company_admin:{company_id}")),
 ) -> None:
     """Delete contact from company."""
-    company_datastore.delete_contact(company_id, contact_id, user)
+    await company_datastore.delete_contact(company_id, contact_id, user)
@@ -13,7 +13,7 @@ router = APIRouter(prefix=BASE_PATH + "/companies/{company_id}/orders", tags=["C
 
 
 @router.post("/", response_model=OrderOutModel)
-def add_order(
+async def add_order(
     company_id: str,
     new_order: AddOrderModel = Body(...),
     essentials: Essentials = Depends(get_essentials),
@@ -21,9 +21,8 @@ def add_order(
     datastore: CompanyOrderDatastore = Depends(get_company_order_datastore),
     product_datastore: ProductDatastore = Depends(get_product_datastore),
 ):
-    order = datastore.add_order(company_id, new_order, authenticated_user)
-    company_languages = datastore.get_company_languages(company_id)
-    product_name = select_localized_text(
-        product_datastore.get_product(new_order.product_id).name, essentials.language, company_languages
-    )
+    order = await datastore.add_order(company_id, new_order, authenticated_user)
+    company_languages = await datastore.get_company_languages(company_id)
+    product = await product_datastore.get_product(new_order.product_id)
+    product_name = select_localized_text(product.name, essentials.language, company_languages)
     return OrderOutModel.from_db_model(order, product_name, essentials.language, company_languages)
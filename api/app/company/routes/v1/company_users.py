@@ -1,9 +1,10 @@
 """
 Routing module for company users endpoint.
 """
-from fastapi import APIRouter, Depends, Security, Path, Request, status
+from fastapi import APIRouter, Body, Depends, Security, Path, Request, status
 
 from app.company.datastores.company_user_datastore import get_company_user_datastore, CompanyUserDatastore
+from app.database.abstract.document_database import BulkWriteResult
 from app.shared.dependencies.essentials import Essentials, get_essentials
 from app.user.datastores.user_datastore import UserDatastore, get_user_datastore
 from app.logging.log import AppLogger, AppLoggerInjector
@@ -11,6 +12,7 @@ from app.authentication.dependencies.user import get_current_user
 from app.user.models.v1.user_api_models import UserOutModel
 from app.user.models.db.user import User
 from app.shared.utils.request_utils import get_url
+from app.shared.responses.trusted_model_response import TrustedModelResponse
 
 logger_injector = AppLoggerInjector("company_users_router")
 
@@ -18,7 +20,7 @@ router = APIRouter(prefix="/v1/{lang}/companies/{company_id}/users", tags=["Comp
 
 
 # TODO: Consider if this should be in the user domain.
-@router.get("/", response_model=list[UserOutModel])
+@router.get("/", response_model=list[UserOutModel], response_class=TrustedModelResponse)
 async def get_company_users(
     request: Request,
     company_id: str = Path(...),
@@ -29,14 +31,22 @@ async def get_company_users(
     user_datastore: UserDatastore = Depends(get_user_datastore),
     logger: AppLogger = Depends(logger_injector),
     essentials: Essentials = Depends(get_essentials),
-) -> list[UserOutModel]:
+) -> TrustedModelResponse:
     """Gets list of users with access to company."""
-    logger.debug(f"Incoming={get_url(request)}: company_id={company_id}, user={user}")
-    users = user_datastore.get_company_users(company_id)
-    return [UserOutModel.from_database_model(u, request, router, essentials.language) for u in users]
+    logger.debug(lambda: f"Incoming={get_url(request)}: company_id={company_id}, user={user}")
+    users = await user_datastore.get_company_users(company_id)
+    return TrustedModelResponse(
+        [UserOutModel.from_database_model(u, request, router, essentials.language) for u in users],
+        response_model=list[UserOutModel],
+    )
 
 
-@router.post("/{user_id}/{role_name}", response_model=list[UserOutModel], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{user_id}/{role_name}",
+    response_model=list[UserOutModel],
+    response_class=TrustedModelResponse,
+    status_code=status.HTTP_201_CREATED,
+)
 async def add_user_to_company_with_role(
     request: Request,
     company_id: str = Path(...),
@@ -45,7 +55,26 @@ async def add_user_to_company_with_role(
     user: User = Security(get_current_user, scopes=("roles:superuser", "roles:company_admin:{company_id}")),
     company_user_datastore: CompanyUserDatastore = Depends(get_company_user_datastore),
     essentials: Essentials = Depends(get_essentials),
-) -> list[UserOutModel]:
+) -> TrustedModelResponse:
     """Adds existing user to company."""
-    users = company_user_datastore.add_user_to_company(company_id, role_name, user_id, user)
-    return [UserOutModel.from_database_model(u, request, router, essentials.language) for u in users]
+    users = await company_user_datastore.add_user_to_company(company_id, role_name, user_id, user)
+    return TrustedModelResponse(
+        [UserOutModel.from_database_model(u, request, router, essentials.language) for u in users],
+        status.HTTP_201_CREATED,
+        response_model=list[UserOutModel],
+    )
+
+
+@router.post("/{role_name}", response_model=BulkWriteResult)
+async def add_users_to_company_with_role(
+    request: Request,
+    company_id: str = Path(...),
+    role_name: str = Path(...),
+    user_ids: list[str] = Body(...),
+    user: User = Security(get_current_user, scopes=("roles:superuser", "roles:company_admin:{company_id}")),
+    company_user_datastore: CompanyUserDatastore = Depends(get_company_user_datastore),
+    logger: AppLogger = Depends(logger_injector),
+) -> BulkWriteResult:
+    """Adds existing users to company in one batch, with the outcome for each user."""
+    logger.debug(lambda: f"Incoming={get_url(request)}: company_id={company_id}, users={len(user_ids)}, user={user}")
+    return await company_user_datastore.add_users_to_company(company_id, role_name, user_ids, user)
@@ -0,0 +1,345 @@
+"""
+Async interface for document database.
+
+Mirrors the interfaces in document_database, but every operation that performs I/O against the database is awaitable,
+so that datastores can be used from async routes without blocking the event loop.
+"""
+from abc import ABCMeta, abstractmethod
+from collections.abc import MutableMapping, AsyncIterator
+from typing import Any, Callable, TypeVar
+
+from app.database.abstract.document_database import (
+    BulkWriteResult,
+    DocumentDatabaseBulkOperations,
+    DocumentDatabaseUpdateContext,
+)
+
+T = TypeVar("T")
+
+
+class AsyncDocument(MutableMapping, metaclass=ABCMeta):
+    """
+    Representation of a document.
+    Can be accessed like a dict. Operations writing to the database are awaitable.
+    """
+
+    @abstractmethod
+    def __getitem__(self, item):
+        """
+        Get item from doc.
+        :param item: The item to get.
+        :return: An item.
+        """
+
+    @abstractmethod
+    def __setitem__(self, key, value):
+        """
+        Set item in the doc.
+        :param key: Key of item to set.
+        :param value: New value for item.
+        :return: None.
+        """
+
+    @abstractmethod
+    def __delitem__(self, key):
+        """
+        Deletes an item from the doc.
+        :param key: Key of item to delete.
+        :return: None.
+        """
+
+    @abstractmethod
+    def __iter__(self):
+        """
+        Iterate items in the doc.
+        :return: Iterator for the doc.
+        """
+
+    @abstractmethod
+    def __len__(self):
+        """
+        Get the number of items for the doc.
+        :return: Number of items as int.
+        """
+
+    @property
+    @abstractmethod
+    def id(self) -> str:
+        """
+        Easy accessor prop for doc id.
+        :return: id as str.
+        """
+
+    def to(self, convert: Callable[["AsyncDocument"], T]) -> T:
+        """
+        Convinience method to convert doc to another type with converter
+        passed as argument.
+        :param convert: Converter function.
+        :return: Type converted to by the callable.
+        """
+        return convert(self)
+
+    @abstractmethod
+    def to_dict(self) -> dict:
+        """
+        Returns a dict with the same data as in the document.
+        :return: Doc as dict.
+        """
+
+    @abstractmethod
+    async def replace(self, data: MutableMapping) -> "AsyncDocument":
+        """
+        Replace data in document.
+        :param data: Data to replace with.
+        :return: The updated document.
+        """
+
+    @abstractmethod
+    async def delete(self) -> None:
+        """
+        Delete the document from database.
+        :return: None.
+        """
+
+
+class AsyncDocumentCollection(metaclass=ABCMeta):
+    """
+    A cursor to a collection of documents.
+    Building the cursor does not touch the database, fetching the documents does and is therefore awaitable.
+    Can also be iterated with 'async for'.
+    """
+
+    @abstractmethod
+    def __aiter__(self) -> AsyncIterator[AsyncDocument]:
+        """
+        Iterate the documents in the cursor without loading all of them in memory at once.
+        :return: Async iterator of AsyncDocument.
+        """
+
+    @abstractmethod
+    async def to_list(self) -> list[AsyncDocument]:
+        """
+        Converts the cursor to an in memory list of documents.
+        :return: List of AsyncDocument.
+        """
+
+    @abstractmethod
+    async def to_list_with_total(self) -> tuple[list[AsyncDocument], int]:
+        """
+        Fetches the documents together with the total number of documents matching the filter.
+        See DocumentCollection.to_list_with_total.
+        """
+
+    @abstractmethod
+    async def to_dicts(self) -> list[dict]:
+        """
+        Fetches the documents as plain dicts. See DocumentCollection.to_dicts.
+        :return: List of dict.
+        """
+
+    @abstractmethod
+    async def to_dicts_with_total(self) -> tuple[list[dict], int]:
+        """
+        Fetches the documents as plain dicts, together with the total count. See DocumentCollection.to_dicts.
+        :return: Tuple of list of dict and total count.
+        """
+
+    @abstractmethod
+    def skip(self, skip: int | None) -> "AsyncDocumentCollection":
+        """
+        Skip a number of documents.
+        :param skip: Number to skip.
+        :return: Updated cursor.
+        """
+
+    @abstractmethod
+    def take(self, take: int | None) -> "AsyncDocumentCollection":
+        """
+        Take only a certain number of documents.
+        :param take: The number to take.
+        :return: Updated cursor.
+        """
+
+    @abstractmethod
+    def sort(self, sort_by: str | None, sort_order: str | None) -> "AsyncDocumentCollection":
+        """
+        Sort the documents in the cursor.
+        :param sort_by: field to sort by.
+        :param sort_order: asc or desc.
+        :return: Updated cursor.
+        """
+
+    @abstractmethod
+    def after(
+        self,
+        last_id: str | None,
+        sort_by: str | None = None,
+        last_value: Any = None,
+        sort_order: str | None = None,
+    ) -> "AsyncDocumentCollection":
+        """
+        Keyset pagination. See DocumentCollection.after.
+        """
+
+
+class AsyncDatabaseCollection(metaclass=ABCMeta):
+    """
+    Referencing a collection in the database.
+    """
+
+    @abstractmethod
+    def get_all(self, fields: list[str] | None = None) -> AsyncDocumentCollection:
+        """
+        Get a cursor for all documents in the collection.
+        :param fields: The fields to select from the documents. If None, all fields are returned.
+        :return: AsyncDocumentCollection cursor wrapper.
+        """
+
+    @abstractmethod
+    def get(
+        self,
+        filters: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+    ) -> AsyncDocumentCollection:
+        """
+        Get a cursor for all documents fitting the filter from the collection.
+        :param filters: Syntax depends on the implementation.
+        :param fields: The fields to select from the documents. If None, all fields are returned.
+        :return: AsyncDocumentCollection cursor wrapper.
+        """
+
+    @abstractmethod
+    async def by_id(self, doc_id: str, fields: list[str] | None = None) -> AsyncDocument | None:
+        """
+        Get a document by its document id.
+        :param doc_id: The id of the document.
+        :param fields: The fields to select from the document. If None, all fields are returned.
+        :return: The document or None if no document was found.
+        """
+
+    @abstractmethod
+    async def by_key(self, key: str, value: Any, fields: list[str] | None = None) -> AsyncDocument | None:
+        """
+        Get document by key other than id.
+        :param key: Name of the field to use as key.
+        :param value: Value of the key field.
+        :param fields: The fields to select from the document. If None, all fields are returned.
+        :return: AsyncDocument or None if no document was found.
+        """
+
+    @abstractmethod
+    async def exists(self, filters: dict[str, Any]) -> bool:
+        """
+        Check if document exists.
+        :param filters: Filter parameters to specify conditions for search.
+        :return: True or False.
+        """
+
+    @abstractmethod
+    async def add(self, data: dict, verify: bool = False) -> AsyncDocument:
+        """
+        Add a document to the collection.
+        See DatabaseCollection.add.
+        """
+
+    @abstractmethod
+    async def add_many(self, data: list[dict], ordered: bool = True, verify: bool = False) -> list[AsyncDocument]:
+        """
+        Add documents to the collection in one round trip.
+        See DatabaseCollection.add_many.
+        """
+
+    @abstractmethod
+    async def patch_document(self, doc_id: str, updates: dict[str, Any]) -> None:
+        """
+        Updates the specified fields for document with given id.
+        See DatabaseCollection.patch_document.
+
+        :raise app.errors.NotFoundError:
+        If there's no document with the given key
+        """
+
+    @abstractmethod
+    async def push_to_list(self, doc_id: str, sub_collection_path: str, new_sub_collection_value: Any) -> None:
+        """
+        Adds sub document to sub collection of document.
+
+        :param doc_id: ID of document containing sub collection.
+        :param sub_collection_path: Path to sub collection. IE: name_of_subcollection
+        :param new_sub_collection_value: Value to add to sub collection.
+        :return: None.
+
+        :raise NotFoundError: If no document with doc_id exists.
+        """
+
+    @abstractmethod
+    async def update_document(self, doc_id: str, updates: DocumentDatabaseUpdateContext) -> None:
+        """Updates individual document."""
+
+    @abstractmethod
+    async def find_one_and_update(
+        self,
+        doc_id: str,
+        updates: DocumentDatabaseUpdateContext,
+        filters: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+        return_updated: bool = True,
+    ) -> AsyncDocument | None:
+        """
+        Updates individual document and returns it, in one atomic operation.
+        See DatabaseCollection.find_one_and_update.
+        """
+
+    @abstractmethod
+    async def bulk_write(self, operations: DocumentDatabaseBulkOperations, ordered: bool = True) -> BulkWriteResult:
+        """
+        Executes a batch of operations in as few round trips as the database allows.
+        See DatabaseCollection.bulk_write.
+        """
+
+    @abstractmethod
+    def like(self, field: str, value: str) -> AsyncDocumentCollection:
+        """
+        Gets AsyncDocumentCollection with documents matching where any part of given field matches value.
+
+        :param field: Name of field. Nested fields are accessed by the dot '.' operator. value.subvalue
+        :param value: The value to match with. Whole field will be searched for value.
+            Equivilent to sql LIKE '%myValue%'.
+
+        :return: AsyncDocumentCollection with documents matching search.
+        """
+
+
+class AsyncDocumentDatabase(metaclass=ABCMeta):
+    """
+    Async database wrapper.
+    """
+
+    @abstractmethod
+    def collection(self, collection_name: str) -> AsyncDatabaseCollection:
+        """
+        Gets a database collection by name.
+        :param collection_name: Name of collection.
+        :return: AsyncDatabaseCollection.
+        """
+
+    @abstractmethod
+    def update_context(self) -> DocumentDatabaseUpdateContext:
+        """Returns an update context use to build update queries."""
+
+    @abstractmethod
+    def bulk_operations(self) -> DocumentDatabaseBulkOperations:
+        """Returns a builder for a batch of operations to pass to AsyncDatabaseCollection.bulk_write."""
+
+    @abstractmethod
+    def new_id(self) -> str:
+        """Generates a new document id."""
+
+    @abstractmethod
+    def is_valid_id(self, doc_id: str) -> bool:
+        """Returns True if doc_id has the format of a document id."""
+
+
+class AsyncBaseDatastore:
+    def __init__(self, db: AsyncDocumentDatabase):
+        self.db = db
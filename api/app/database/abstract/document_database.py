@@ -6,6 +6,8 @@ from collections.abc import MutableMapping
 from enum import Enum
 from typing import Any, Callable, TypeVar
 
+from pydantic import BaseModel, Field
+
 from app.logging.log import AppLoggerInjector
 
 logger_injector = AppLoggerInjector("document_database")
@@ -24,6 +26,19 @@ T = TypeVar("T")
 OutT = TypeVar("OutT")
 
 
+class IndexDefinition(BaseModel):
+    """
+    Database agnostic description of an index on a collection.
+
+    keys is a list of (field_name, order) where order is "asc" or "desc".
+    Nested fields are accessed by the dot '.' operator.
+    """
+
+    name: str
+    keys: list[tuple[str, str]]
+    unique: bool = Field(False)
+
+
 class DocumentDatabaseUpdateContext(metaclass=ABCMeta):
     @abstractmethod
     def set_values(self, value_dict: dict[str, Any]) -> None:
@@ -36,11 +51,97 @@ class DocumentDatabaseUpdateContext(metaclass=ABCMeta):
     def push_to_list(self, list_name: str, data: Any) -> None:
         """Append given data to document sub collection of list_name."""
 
+    @abstractmethod
+    def unset_values(self, *fields: str) -> None:
+        """Remove given fields from the document."""
+
+    @abstractmethod
+    def set_in_list(self, list_name: str, item_id: str, value_dict: dict[str, Any]) -> None:
+        """
+        Set values on the sub document with item_id in sub collection list_name, without touching the rest of the list.
+        Keys in value_dict are field names of the sub document.
+        """
+
+    @abstractmethod
+    def pull_from_list(self, list_name: str, item_id: str) -> None:
+        """Remove the sub document with item_id from sub collection list_name."""
+
     @abstractmethod
     def to_implementation_specific_update_syntax(self) -> Any:
         """To be called by database implementation to get the update context converted to the syntax it requires."""
 
 
+class BulkWriteItemResult(BaseModel):
+    """
+    Outcome of one operation in a bulk write.
+
+    doc_id is the id of the document the operation was made on, None for upserts that matched an existing document.
+    """
+
+    index: int
+    operation: str
+    doc_id: str | None
+    ok: bool
+    error: str | None = Field(None)
+
+
+class BulkWriteResult(BaseModel):
+    """Outcome of a bulk write, with the result of each operation in the order they were added."""
+
+    items: list[BulkWriteItemResult]
+    inserted_count: int = Field(0)
+    matched_count: int = Field(0)
+    modified_count: int = Field(0)
+    upserted_count: int = Field(0)
+    deleted_count: int = Field(0)
+
+    @property
+    def ok(self) -> bool:
+        """True if every operation succeeded."""
+        return all(item.ok for item in self.items)
+
+    @property
+    def failed(self) -> list[BulkWriteItemResult]:
+        return [item for item in self.items if not item.ok]
+
+
+class DocumentDatabaseBulkOperations(metaclass=ABCMeta):
+    """
+    Builder for a batch of mixed write operations on one collection, executed with DatabaseCollection.bulk_write.
+    """
+
+    @abstractmethod
+    def insert(self, data: dict) -> str:
+        """
+        Insert a new document.
+        :param data: The data for the document.
+        :return: The id the document will get.
+        """
+
+    @abstractmethod
+    def update(self, doc_id: str, updates: DocumentDatabaseUpdateContext) -> None:
+        """Update document with doc_id."""
+
+    @abstractmethod
+    def upsert(self, filters: dict[str, Any], updates: DocumentDatabaseUpdateContext) -> None:
+        """
+        Update the document matching filters, or insert it if there is none.
+        Fields in filters with a single value are set on the inserted document.
+        """
+
+    @abstractmethod
+    def delete(self, doc_id: str) -> None:
+        """Delete document with doc_id."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of operations added."""
+
+    @abstractmethod
+    def to_implementation_specific_operations(self) -> Any:
+        """To be called by database implementation to get the operations converted to the syntax it requires."""
+
+
 class Document(MutableMapping, metaclass=ABCMeta):
     """
     Representation of a document.
@@ -138,6 +239,29 @@ class DocumentCollection(metaclass=ABCMeta):
         :return: List of Document.
         """
 
+    @abstractmethod
+    def to_list_with_total(self) -> tuple[list[Document], int]:
+        """
+        Fetches the documents together with the total number of documents matching the filter, in one round trip.
+        The total ignores skip, take and after, so it can be used to calculate the number of pages.
+        :return: Tuple of list of Document and total count.
+        """
+
+    @abstractmethod
+    def to_dicts(self) -> list[dict]:
+        """
+        Read only fast path for listings. Fetches the documents as plain dicts, with the id as "id", without
+        wrapping them in Document.
+        :return: List of dict.
+        """
+
+    @abstractmethod
+    def to_dicts_with_total(self) -> tuple[list[dict], int]:
+        """
+        Fetches the documents as plain dicts, together with the total count. See to_dicts and to_list_with_total.
+        :return: Tuple of list of dict and total count.
+        """
+
     @abstractmethod
     def skip(self, skip: int | None) -> "DocumentCollection":
         """
@@ -163,6 +287,25 @@ class DocumentCollection(metaclass=ABCMeta):
         :return: Updated cursor.
         """
 
+    @abstractmethod
+    def after(
+        self,
+        last_id: str | None,
+        sort_by: str | None = None,
+        last_value: Any = None,
+        sort_order: str | None = None,
+    ) -> "DocumentCollection":
+        """
+        Keyset pagination. Orders the documents by sort_by and then by id, and only includes the documents that come
+        after the document with last_id and last_value.
+        Replaces any ordering set by sort.
+        :param last_id: ID of the last document on the previous page. None for the first page.
+        :param sort_by: field to sort by. None to sort by id only.
+        :param last_value: Value of sort_by field on the last document on the previous page.
+        :param sort_order: asc or desc.
+        :return: Updated cursor.
+        """
+
 
 class DatabaseCollection(metaclass=ABCMeta):
     """
@@ -218,13 +361,25 @@ class DatabaseCollection(metaclass=ABCMeta):
         """
 
     @abstractmethod
-    def add(self, data: dict) -> Document:
+    def add(self, data: dict, verify: bool = False) -> Document:
         """
         Add a document to the collection.
         :param data: The data to put in the document.
+        :param verify: Read the document back from the database instead of returning it built from data and the
+        generated id. Gives values as stored, IE: datetimes truncated to the precision of the database.
         :return: The created document.
         """
 
+    @abstractmethod
+    def add_many(self, data: list[dict], ordered: bool = True, verify: bool = False) -> list[Document]:
+        """
+        Add documents to the collection in one round trip.
+        :param data: The data for each document.
+        :param ordered: Stop at the first failing document. If False, the rest of the documents are still added.
+        :param verify: Read the documents back from the database. See add.
+        :return: The created documents, in the same order as data.
+        """
+
     @abstractmethod
     def patch_document(self, doc_id: str, updates: dict[str, Any]) -> None:
         """
@@ -260,6 +415,38 @@ class DatabaseCollection(metaclass=ABCMeta):
     def update_document(self, doc_id: str, updates: DocumentDatabaseUpdateContext) -> None:
         """Updates individual document."""
 
+    @abstractmethod
+    def find_one_and_update(
+        self,
+        doc_id: str,
+        updates: DocumentDatabaseUpdateContext,
+        filters: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+        return_updated: bool = True,
+    ) -> Document | None:
+        """
+        Updates individual document and returns it, in one atomic operation.
+
+        :param doc_id: ID of document to update.
+        :param updates: The updates.
+        :param filters: Additional conditions the document has to match to be updated. IE: that a sub document exists.
+        :param fields: The fields to return. If None, all fields are returned.
+        :param return_updated: Return the document as it is after the update. If False, as it was before.
+        :return: The document, or None if no document with doc_id matching filters exists.
+        """
+
+    @abstractmethod
+    def bulk_write(self, operations: DocumentDatabaseBulkOperations, ordered: bool = True) -> BulkWriteResult:
+        """
+        Executes a batch of operations in as few round trips as the database allows.
+
+        :param operations: The operations, built with DocumentDatabase.bulk_operations.
+        :param ordered: Execute the operations in order and stop at the first failing one.
+            If False, the database may execute them in any order and all operations are attempted.
+        :return: BulkWriteResult with the outcome of each operation.
+            Failing operations are reported in the result instead of raising.
+        """
+
     @abstractmethod
     def like(self, field: str, value: str) -> DocumentCollection:
         """
@@ -272,6 +459,29 @@ class DatabaseCollection(metaclass=ABCMeta):
         :return: DocumentCollection with documents matching search.
         """
 
+    @abstractmethod
+    def list_indexes(self) -> list[IndexDefinition]:
+        """
+        Get the indexes that currently exist on the collection.
+        :return: List of IndexDefinition.
+        """
+
+    @abstractmethod
+    def create_index(self, index: IndexDefinition) -> None:
+        """
+        Creates index on the collection.
+        :param index: Definition of the index.
+        :return: None.
+        """
+
+    @abstractmethod
+    def drop_index(self, index_name: str) -> None:
+        """
+        Drops index from the collection.
+        :param index_name: Name of the index.
+        :return: None.
+        """
+
 
 class DocumentDatabase(metaclass=ABCMeta):
     """
@@ -294,14 +504,22 @@ class DocumentDatabase(metaclass=ABCMeta):
     def update_context(self) -> DocumentDatabaseUpdateContext:
         """Returns an update context use to build update queries."""
 
+    @abstractmethod
+    def bulk_operations(self) -> DocumentDatabaseBulkOperations:
+        """Returns a builder for a batch of operations to pass to DatabaseCollection.bulk_write."""
+
     @abstractmethod
     def new_id(self) -> str:
         """Generates a new document id."""
 
+    @abstractmethod
+    def is_valid_id(self, doc_id: str) -> bool:
+        """Returns True if doc_id has the format of a document id."""
+
 
 def transaction(function):
     def wrapper(self: "BaseDatastore", *args, **kwargs):
-        logger.debug(f"transaction decorator is called. self={self}, *args={args}, **kwargs={kwargs}")
+        logger.debug("transaction decorator is called. self=%s, *args=%s, **kwargs=%s", self, args, kwargs)
         return self.db.transaction(self, function, *args, **kwargs)
 
     return wrapper
@@ -6,8 +6,8 @@ from pymongo.database import Database as MongoDatabase
 
 from app.logging.log import AppLoggerInjector, AppLogger
 from app.database.dependencies.mongo import get_mongo_db
-from app.database.abstract.document_database import DocumentDatabase
-from app.database.mongo.mongo_document_database import MongoDocumentDatabase
+from app.database.abstract.async_document_database import AsyncDocumentDatabase
+from app.database.mongo.async_mongo_document_database import AsyncMongoDocumentDatabase
 
 logger_injector = AppLoggerInjector("MongoDocumentDatabase")
 
@@ -15,13 +15,13 @@ logger_injector = AppLoggerInjector("MongoDocumentDatabase")
 def get_document_database(
     db: MongoDatabase = Depends(get_mongo_db),
     logger: AppLogger = Depends(logger_injector),
-) -> DocumentDatabase:
+) -> AsyncDocumentDatabase:
     """
     Get document database reference.
     Abstracts away actual underlying database engine.
     :param db: Reference to db client. MongoDB in this case.
     :param logger: AppLogger instance.
-    :return: New MongoDocumentDatabase which implements DocumentDatabase
+    :return: New AsyncMongoDocumentDatabase which implements AsyncDocumentDatabase
     interface.
     """
-    return MongoDocumentDatabase(db, logger)
+    return AsyncMongoDocumentDatabase(db, logger)
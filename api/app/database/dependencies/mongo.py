@@ -7,11 +7,29 @@ from fastapi import Depends
 from pymongo import MongoClient
 from pymongo.database import Database
 
+from app.database.mongo.mongo_metrics import get_mongo_metrics
+from app.database.mongo.mongo_settings import MongoSettings
+from app.logging.sla import RequestTimingListener
+
+
+@functools.lru_cache(None)
+def get_mongo_settings() -> MongoSettings:
+    """Returns the MongoClient settings, read from the environment once per process."""
+    return MongoSettings()
+
 
 @functools.lru_cache(None)
 def get_local_mongo_client() -> MongoClient:
-    """Returns a MongoClient for local mongo db."""
-    client = MongoClient("mongodb://localhost:27017/produce_exchange_hub?retryWrites=true&w=majority")
+    """
+    Returns the MongoClient for the configured mongo db, with the pool metrics listeners and the listener timing
+    database calls for the SLA log registered.
+    """
+    settings = get_mongo_settings()
+    client = MongoClient(
+        settings.uri,
+        event_listeners=[get_mongo_metrics(), RequestTimingListener()],
+        **settings.client_options(),
+    )
     return client
 
 
@@ -0,0 +1,36 @@
+"""
+Command line interface for index provisioning.
+
+Usage:
+    python -m app.database.indexes diff
+    python -m app.database.indexes apply [--drop-unknown]
+"""
+import argparse
+
+from app.database.dependencies.mongo import get_local_mongo_client, get_mongo_db
+from app.database.indexes.provisioning import plan_indexes, apply_index_plan
+from app.database.mongo.mongo_document_database import MongoDocumentDatabase
+from app.logging.log import AppLogger
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.database.indexes", description="Diff or apply index registry.")
+    parser.add_argument("command", choices=("diff", "apply"))
+    parser.add_argument("--drop-unknown", action="store_true", help="Drop indexes that are not in the registry.")
+    args = parser.parse_args()
+
+    logger = AppLogger("indexes")
+    db = MongoDocumentDatabase(get_mongo_db(get_local_mongo_client()), logger)
+    plans = plan_indexes(db)
+    for plan in plans:
+        for line in plan.describe():
+            print(line)
+    if not any(plan.has_changes() for plan in plans):
+        print("Indexes are up to date.")
+
+    if args.command == "apply":
+        apply_index_plan(db, plans, logger, args.drop_unknown)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compares the indexes in the registry with the indexes in the database and applies the difference.
+"""
+from pydantic import BaseModel, Field
+
+from app.database.abstract.document_database import DocumentDatabase, IndexDefinition
+from app.database.indexes.registry import INDEXES
+from app.logging.log import AppLogger
+
+DEFAULT_INDEX_NAME = "_id_"
+
+
+class CollectionIndexPlan(BaseModel):
+    """The changes needed for the indexes of one collection to match the registry."""
+
+    collection_name: str
+    missing: list[IndexDefinition] = Field([])
+    changed: list[IndexDefinition] = Field([])
+    unknown: list[IndexDefinition] = Field([])
+
+    def has_changes(self) -> bool:
+        return bool(self.missing or self.changed)
+
+    def describe(self) -> list[str]:
+        lines = [f"+ {self.collection_name}.{index.name} {index.keys} unique={index.unique}" for index in self.missing]
+        lines += [f"~ {self.collection_name}.{index.name} {index.keys} unique={index.unique}" for index in self.changed]
+        lines += [f"? {self.collection_name}.{index.name} {index.keys} (not in registry)" for index in self.unknown]
+        return lines
+
+
+def plan_indexes(
+    db: DocumentDatabase, registry: dict[str, list[IndexDefinition]] | None = None
+) -> list[CollectionIndexPlan]:
+    """
+    Diffs the indexes in the database against the registry.
+
+    :param db: Database to diff.
+    :param registry: Index definitions by collection name. Defaults to INDEXES.
+    :return: One CollectionIndexPlan per collection in the registry.
+    """
+    if registry is None:
+        registry = INDEXES
+
+    plans = []
+    for collection_name, wanted in registry.items():
+        existing = {index.name: index for index in db.collection(collection_name).list_indexes()}
+        plan = CollectionIndexPlan(collection_name=collection_name)
+        for index in wanted:
+            current = existing.get(index.name)
+            if current is None:
+                plan.missing.append(index)
+            elif current != index:
+                plan.changed.append(index)
+        wanted_names = {index.name for index in wanted}
+        plan.unknown = [
+            index for name, index in existing.items() if name != DEFAULT_INDEX_NAME and name not in wanted_names
+        ]
+        plans.append(plan)
+    return plans
+
+
+def apply_index_plan(
+    db: DocumentDatabase, plans: list[CollectionIndexPlan], logger: AppLogger, drop_unknown: bool = False
+) -> None:
+    """
+    Creates missing indexes and recreates indexes that differ from the registry.
+
+    :param db: Database to apply the plan to.
+    :param plans: Result of plan_indexes.
+    :param logger: AppLogger.
+    :param drop_unknown: If True, indexes that are not in the registry are dropped.
+    :return: None.
+    """
+    for plan in plans:
+        collection = db.collection(plan.collection_name)
+        for index in plan.changed:
+            logger.info("Recreating index %s.%s", plan.collection_name, index.name)
+            collection.drop_index(index.name)
+            collection.create_index(index)
+        for index in plan.missing:
+            logger.info("Creating index %s.%s", plan.collection_name, index.name)
+            collection.create_index(index)
+        if drop_unknown:
+            for index in plan.unknown:
+                logger.info("Dropping index %s.%s", plan.collection_name, index.name)
+                collection.drop_index(index.name)
+
+
+def ensure_indexes(db: DocumentDatabase, logger: AppLogger) -> None:
+    """
+    Creates the indexes in the registry that don't exist. Called on application startup.
+    Changed indexes are only logged, recreating them drops the index for a while, unique indexes included, so that is
+    left to python -m app.database.indexes apply. Indexes not in the registry are left alone.
+    """
+    plans = plan_indexes(db)
+    for plan in plans:
+        collection = db.collection(plan.collection_name)
+        for index in plan.missing:
+            logger.info("Creating index %s.%s", plan.collection_name, index.name)
+            collection.create_index(index)
+        for index in plan.changed:
+            logger.warn(
+                "Index %s.%s differs from the registry, recreate it with: python -m app.database.indexes apply",
+                plan.collection_name,
+                index.name,
+            )
+    if not any(plan.has_changes() for plan in plans):
+        logger.debug("All indexes in registry already exist")
@@ -0,0 +1,51 @@
+"""
+Declarative registry of the indexes every collection is supposed to have.
+
+Keyed by collection name. The default _id index is not listed since it always exists.
+Indexes are provisioned on application startup and can be diffed and applied with:
+    python -m app.database.indexes diff
+    python -m app.database.indexes apply
+"""
+from app.database.abstract.document_database import IndexDefinition
+from app.shared.models.v1.shared import Language
+
+INDEXES: dict[str, list[IndexDefinition]] = {
+    "users": [
+        # AuthenticationDatastore.get_user, on every authenticated request.
+        IndexDefinition(name="email_1", keys=[("email", "asc")], unique=True),
+        # UserDatastore.get_users_with_role.
+        IndexDefinition(
+            name="roles.role_name_1_roles.reference_1",
+            keys=[("roles.role_name", "asc"), ("roles.reference", "asc")],
+        ),
+        # UserDatastore.get_company_users.
+        IndexDefinition(name="roles.reference_1", keys=[("roles.reference", "asc")]),
+    ],
+    "refresh_tokens": [
+        # RefreshTokenDatastore.rotate and revoke look up sessions by the hash of the current refresh token.
+        IndexDefinition(name="token_hash_1", keys=[("token_hash", "asc")], unique=True),
+        # RefreshTokenDatastore revokes the session when a rotated refresh token is used again.
+        IndexDefinition(name="previous_token_hashes_1", keys=[("previous_token_hashes", "asc")]),
+    ],
+    "roles": [
+        # RoleDatastore.get_role and add_role duplicate check.
+        IndexDefinition(name="name_1", keys=[("name", "asc")], unique=True),
+    ],
+    "companies": [
+        # CompanyDatastore.get_company_dicts filters on status and lists newest first.
+        IndexDefinition(name="status_1_created_date_-1", keys=[("status", "asc"), ("created_date", "desc")]),
+    ],
+    "changes": [
+        # ChangeDatastore.get_changes lists the changes of one entity in time order.
+        IndexDefinition(name="entity_id_1_changed_at_1", keys=[("entity_id", "asc"), ("changed_at", "asc")]),
+        # move_changes migration skips changes that have already been moved.
+        IndexDefinition(name="change_id_1", keys=[("change_id", "asc")], unique=True),
+    ],
+    "products": [
+        # ProductDatastore.get_product_dicts searches by name in the requested language.
+        *[
+            IndexDefinition(name=f"name.{language.value}_1", keys=[(f"name.{language.value}", "asc")])
+            for language in Language
+        ]
+    ],
+}
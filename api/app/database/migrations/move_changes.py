@@ -0,0 +1,56 @@
+"""
+Moves the embedded changes arrays of companies, users and roles to the changes collection.
+
+Safe to run more than once, changes already in the changes collection are not copied again.
+Usage:
+    python -m app.database.migrations.move_changes
+"""
+from app.database.abstract.document_database import DocumentDatabase
+from app.database.dependencies.mongo import get_local_mongo_client, get_mongo_db
+from app.database.mongo.mongo_document_database import MongoDocumentDatabase
+from app.logging.log import AppLogger
+from app.shared.datastores.change_datastore import CHANGES_COLLECTION, to_change_document
+from app.shared.models.db.change import Change
+
+ENTITY_COLLECTIONS = ("companies", "users", "roles")
+
+
+def move_changes(db: DocumentDatabase, logger: AppLogger) -> int:
+    """
+    Copies every embedded change to the changes collection and removes the changes field from the entity.
+
+    :param db: Database to migrate.
+    :param logger: AppLogger.
+    :return: Number of changes copied.
+    """
+    change_log = db.collection(CHANGES_COLLECTION)
+    moved = 0
+    for collection_name in ENTITY_COLLECTIONS:
+        collection = db.collection(collection_name)
+        docs = list(collection.get({"changes": {"$exists": True}}, ["changes"]).to_list())
+        logger.info("Moving changes of %s documents in '%s'", len(docs), collection_name)
+        for doc in docs:
+            changes = [Change(**data) for data in doc["changes"] or []]
+            copied = set()
+            if changes:
+                copies = change_log.get({"change_id": {"$in": [change.id for change in changes]}}, ["change_id"])
+                copied = {copy["change_id"] for copy in copies.to_list()}
+            new_changes = [
+                to_change_document(collection_name, doc.id, change) for change in changes if change.id not in copied
+            ]
+            change_log.add_many(new_changes)
+            moved += len(new_changes)
+            update_context = db.update_context()
+            update_context.unset_values("changes")
+            collection.update_document(doc.id, update_context)
+    logger.info("Moved %s changes to '%s'", moved, CHANGES_COLLECTION)
+    return moved
+
+
+def main() -> None:
+    logger = AppLogger("migrations")
+    move_changes(MongoDocumentDatabase(get_mongo_db(get_local_mongo_client()), logger), logger)
+
+
+if __name__ == "__main__":
+    main()
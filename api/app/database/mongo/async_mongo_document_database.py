@@ -0,0 +1,307 @@
+"""
+Async MongoDb implementation of the async document database interface.
+
+Wraps the pymongo based implementation in mongo_document_database and runs every call that does I/O against the
+database in the threadpool, the same way Motor does it, so that the event loop is free to serve other requests
+while waiting for MongoDB.
+"""
+from collections.abc import MutableMapping, Iterator, AsyncIterator
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+from pymongo.database import Database as MongoDatabase
+
+from app.database.abstract.async_document_database import (
+    AsyncDocument,
+    AsyncDocumentCollection,
+    AsyncDatabaseCollection,
+    AsyncDocumentDatabase,
+)
+from app.database.abstract.document_database import (
+    BulkWriteResult,
+    DocumentDatabaseBulkOperations,
+    DocumentDatabaseUpdateContext,
+)
+from app.database.mongo.mongo_document_database import (
+    MongoDocument,
+    MongoDocumentCollection,
+    MongoDatabaseCollection,
+    MongoDocumentDatabase,
+)
+from app.logging.log import AppLogger
+
+ITERATION_BATCH_SIZE = 100
+
+
+def _next_batch(documents: Iterator[MongoDocument], size: int) -> list[MongoDocument]:
+    """Pulls up to size documents from the iterator. To be run in the threadpool since it might hit the database."""
+    batch = []
+    for doc in documents:
+        batch.append(doc)
+        if len(batch) >= size:
+            break
+    return batch
+
+
+class AsyncMongoDocument(AsyncDocument):
+    """
+    Mongo db document.
+    Reads are forwarded to the wrapped MongoDocument, writes are done through the async collection.
+    """
+
+    def __init__(self, document: MongoDocument, collection: "AsyncMongoDatabaseCollection"):
+        """
+        Creates a new document.
+
+        :param document: The MongoDocument with the document data.
+        :param collection: reference to async collection for performing operations on the document.
+        """
+        super().__init__()
+        self._document = document
+        self._collection = collection
+
+    def __getitem__(self, key: str):
+        return self._document[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._document[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._document[key]
+
+    def __iter__(self):
+        return self._document.__iter__()
+
+    def __len__(self) -> int:
+        return self._document.__len__()
+
+    def __str__(self):
+        return str(self._document)
+
+    def __repr__(self):
+        return f"AsyncMongoDocument({repr(self._document)}, {repr(self._collection)})"
+
+    @property
+    def id(self) -> str:
+        return self._document.id
+
+    def to_dict(self) -> dict:
+        return self._document.to_dict()
+
+    async def replace(self, data: MutableMapping) -> AsyncDocument:
+        """
+        Replaces document data with given data and gives back the updated
+        document.
+        :param data: Updated data as a mutable mapping.
+        :return: Updated document.
+        """
+        if isinstance(data, AsyncDocument):
+            data = data.to_dict()
+        await self._collection.replace(self.id, data)
+        return await self._collection.by_id(self.id, None)
+
+    async def delete(self) -> None:
+        """
+        delete document from database.
+        :return:
+        """
+        await self._collection.delete(self.id)
+
+
+class AsyncMongoDocumentCollection(AsyncDocumentCollection):
+    """
+    A collection of documents.
+    Wraps MongoDocumentCollection. Building the cursor is done in place, fetching the documents is done in the
+    threadpool.
+    """
+
+    def __init__(self, documents: MongoDocumentCollection, collection: "AsyncMongoDatabaseCollection") -> None:
+        """
+        Creates an async mongo document collection.
+        :param documents: The wrapped MongoDocumentCollection.
+        :param collection: Reference to async db collection.
+        """
+        self._documents = documents
+        self._collection = collection
+
+    def __str__(self):
+        return str(self._documents)
+
+    def __repr__(self):
+        return f"AsyncMongoDocumentCollection({repr(self._documents)}, {repr(self._collection)})"
+
+    async def __aiter__(self) -> AsyncIterator[AsyncDocument]:
+        """
+        Iterates the cursor, fetching ITERATION_BATCH_SIZE documents per trip to the threadpool.
+        """
+        documents = iter(self._documents.to_list())
+        while True:
+            batch = await run_in_threadpool(_next_batch, documents, ITERATION_BATCH_SIZE)
+            for doc in batch:
+                yield AsyncMongoDocument(doc, self._collection)
+            if len(batch) < ITERATION_BATCH_SIZE:
+                break
+
+    async def to_list(self) -> list[AsyncDocument]:
+        """
+        Fetches the whole cursor of documents into memory.
+        :return: list of AsyncDocument.
+        """
+        docs = await run_in_threadpool(lambda: list(self._documents.to_list()))
+        return [AsyncMongoDocument(doc, self._collection) for doc in docs]
+
+    async def to_list_with_total(self) -> tuple[list[AsyncDocument], int]:
+        """
+        Fetches the documents and the total count in the threadpool.
+        :return: Tuple of list of AsyncDocument and total count.
+        """
+        docs, total = await run_in_threadpool(self._documents.to_list_with_total)
+        return [AsyncMongoDocument(doc, self._collection) for doc in docs], total
+
+    async def to_dicts(self) -> list[dict]:
+        """See base class."""
+        return await run_in_threadpool(self._documents.to_dicts)
+
+    async def to_dicts_with_total(self) -> tuple[list[dict], int]:
+        """See base class."""
+        return await run_in_threadpool(self._documents.to_dicts_with_total)
+
+    def skip(self, skip: int | None) -> AsyncDocumentCollection:
+        self._documents.skip(skip)
+        return self
+
+    def take(self, take: int | None) -> AsyncDocumentCollection:
+        self._documents.take(take)
+        return self
+
+    def sort(self, sort_by: str | None, sort_order: str | None) -> AsyncDocumentCollection:
+        self._documents.sort(sort_by, sort_order)
+        return self
+
+    def after(
+        self,
+        last_id: str | None,
+        sort_by: str | None = None,
+        last_value: Any = None,
+        sort_order: str | None = None,
+    ) -> AsyncDocumentCollection:
+        self._documents.after(last_id, sort_by, last_value, sort_order)
+        return self
+
+
+class AsyncMongoDatabaseCollection(AsyncDatabaseCollection):
+    """
+    Represents a database collection.
+    Wraps MongoDatabaseCollection and runs its calls in the threadpool.
+    """
+
+    def __init__(self, collection: MongoDatabaseCollection):
+        """
+        Creates an async mongo database collection.
+        :param collection: The wrapped MongoDatabaseCollection.
+        """
+        self._collection = collection
+
+    def __str__(self):
+        return str(self._collection)
+
+    def __repr__(self):
+        return f"AsyncMongoDatabaseCollection({repr(self._collection)})"
+
+    def _wrap(self, doc: MongoDocument | None) -> AsyncDocument | None:
+        if doc is None:
+            return None
+        return AsyncMongoDocument(doc, self)
+
+    def get_all(self, fields: list[str] | None = None) -> AsyncDocumentCollection:
+        return AsyncMongoDocumentCollection(self._collection.get_all(fields), self)
+
+    def get(self, filters: dict[str, Any] | None = None, fields: list[str] | None = None) -> AsyncDocumentCollection:
+        return AsyncMongoDocumentCollection(self._collection.get(filters, fields), self)
+
+    async def by_id(self, doc_id: str, fields: list[str] | None = None) -> AsyncDocument | None:
+        return self._wrap(await run_in_threadpool(self._collection.by_id, doc_id, fields))
+
+    async def by_key(self, key: str, value: Any, fields: list[str] | None = None) -> AsyncDocument | None:
+        return self._wrap(await run_in_threadpool(self._collection.by_key, key, value, fields))
+
+    async def exists(self, filters: dict[str, Any]) -> bool:
+        return await run_in_threadpool(self._collection.exists, filters)
+
+    async def add(self, data: dict, verify: bool = False) -> AsyncDocument:
+        return self._wrap(await run_in_threadpool(self._collection.add, data, verify))
+
+    async def add_many(self, data: list[dict], ordered: bool = True, verify: bool = False) -> list[AsyncDocument]:
+        docs = await run_in_threadpool(self._collection.add_many, data, ordered, verify)
+        return [self._wrap(doc) for doc in docs]
+
+    async def patch_document(self, doc_id: str, updates: dict[str, Any]) -> None:
+        await run_in_threadpool(self._collection.patch_document, doc_id, updates)
+
+    async def push_to_list(self, doc_id: str, sub_collection_path: str, new_sub_collection_value: Any) -> None:
+        await run_in_threadpool(self._collection.push_to_list, doc_id, sub_collection_path, new_sub_collection_value)
+
+    async def update_document(self, doc_id: str, updates: DocumentDatabaseUpdateContext) -> None:
+        await run_in_threadpool(self._collection.update_document, doc_id, updates)
+
+    async def find_one_and_update(
+        self,
+        doc_id: str,
+        updates: DocumentDatabaseUpdateContext,
+        filters: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+        return_updated: bool = True,
+    ) -> AsyncDocument | None:
+        return self._wrap(
+            await run_in_threadpool(
+                self._collection.find_one_and_update, doc_id, updates, filters, fields, return_updated
+            )
+        )
+
+    async def bulk_write(self, operations: DocumentDatabaseBulkOperations, ordered: bool = True) -> BulkWriteResult:
+        return await run_in_threadpool(self._collection.bulk_write, operations, ordered)
+
+    async def replace(self, doc_id: str, data: dict) -> None:
+        """Replaces data for document."""
+        await run_in_threadpool(self._collection.replace, doc_id, data)
+
+    async def delete(self, doc_id: str) -> None:
+        """Deletes a document."""
+        await run_in_threadpool(self._collection.delete, doc_id)
+
+    def like(self, field: str, value: str) -> AsyncDocumentCollection:
+        return AsyncMongoDocumentCollection(self._collection.like(field, value), self)
+
+
+class AsyncMongoDocumentDatabase(AsyncDocumentDatabase):
+    """
+    Async wrapper for MongoDB database.
+    """
+
+    def __init__(self, db: MongoDatabase, logger: AppLogger):
+        self._db = db
+        self._logger = logger
+        self._document_database = MongoDocumentDatabase(db, logger)
+
+    def __str__(self):
+        return str(self._db)
+
+    def collection(self, collection_name: str) -> AsyncDatabaseCollection:
+        """
+        Gets database collection by name.
+        :param collection_name: Name of collection.
+        :return: Async database collection to perform operations on the selected collection.
+        """
+        return AsyncMongoDatabaseCollection(self._document_database.collection(collection_name))
+
+    def update_context(self) -> DocumentDatabaseUpdateContext:
+        return self._document_database.update_context()
+
+    def bulk_operations(self) -> DocumentDatabaseBulkOperations:
+        return self._document_database.bulk_operations()
+
+    def new_id(self) -> str:
+        return self._document_database.new_id()
+
+    def is_valid_id(self, doc_id: str) -> bool:
+        return self._document_database.is_valid_id(doc_id)
@@ -0,0 +1,113 @@
+"""
+Conversion between the documents of the api and BSON.
+
+Enum values are encoded by the type registry of the collections, see codec_options, when pymongo encodes the BSON. So
+values don't have to be looked for before a write. What a codec can't do, since it only sees values, is done in a
+single pass by to_mongo:
+    id to _id as ObjectId, in filters and documents.
+    Enum keys to their values, since BSON keys have to be str.
+Both are done in place, without copying the dicts, see to_mongo. Read documents are converted back by from_mongo,
+once.
+"""
+from enum import Enum
+from typing import Any
+
+from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeRegistry
+
+
+def _encode_fallback(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+TYPE_REGISTRY = TypeRegistry(fallback_encoder=_encode_fallback)
+
+
+def codec_options(base: CodecOptions) -> CodecOptions:
+    """
+    base with the type registry encoding enums.
+
+    >>> import bson
+    >>> from app.company.models.shared.enums import CompanyStatus
+    >>> bson.decode(bson.encode({"status": CompanyStatus.active}, codec_options=codec_options(CodecOptions())))
+    {'status': 'active'}
+    """
+    return base.with_options(type_registry=TYPE_REGISTRY)
+
+
+def _to_object_ids(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {operator: _to_object_ids(ids) for operator, ids in value.items()}
+    if isinstance(value, list):
+        return [ObjectId(item) for item in value]
+    return ObjectId(value)
+
+
+def to_mongo(data: Any, map_ids: bool = True) -> Any:
+    """
+    Prepares data for pymongo in place. Enum values are left to the codec.
+    data is changed: id keys are replaced by _id and Enum keys by their values, in nested dicts and lists too. Pass a
+    copy if the dict is used again. MongoDatabaseCollection copies the top level of the filters and data it is given.
+
+    >>> to_mongo({"id": "62e00647e98e01ef28be554b"})
+    {'_id': ObjectId('62e00647e98e01ef28be554b')}
+
+    >>> to_mongo({"col": {"id": "62e00647e98e01ef28be554b"}})
+    {'col': {'_id': ObjectId('62e00647e98e01ef28be554b')}}
+
+    >>> to_mongo({"v": [{"id": "62e00647e98e01ef28be554b"}]})
+    {'v': [{'_id': ObjectId('62e00647e98e01ef28be554b')}]}
+
+    >>> to_mongo({"id": {"$in": ["62e00647e98e01ef28be554b"]}})
+    {'_id': {'$in': [ObjectId('62e00647e98e01ef28be554b')]}}
+
+    >>> from app.shared.models.v1.shared import Language
+    >>> to_mongo({"name": {Language.SV: "Företag"}, "id": "1"}, map_ids=False)
+    {'name': {'SV': 'Företag'}, 'id': '1'}
+
+    :param data: Filter, document or update.
+    :param map_ids: If id fields should be renamed to _id and converted to ObjectId.
+    :return: data.
+    """
+    if isinstance(data, dict):
+        renamed = None
+        for key, value in data.items():
+            if isinstance(value, (dict, list)) and not (map_ids and key == "id"):
+                to_mongo(value, map_ids)
+            if isinstance(key, Enum) or (map_ids and key == "id"):
+                renamed = renamed or []
+                renamed.append(key)
+        for key in renamed or ():
+            value = data.pop(key)
+            if isinstance(key, Enum):
+                data[key.value] = value
+            else:
+                data["_id"] = _to_object_ids(value)
+    elif isinstance(data, list):
+        for value in data:
+            if isinstance(value, (dict, list)):
+                to_mongo(value, map_ids)
+    return data
+
+
+def from_mongo(doc: dict) -> dict:
+    """
+    Copy of document with _id as id and str, for the api. The only copy made when reading a document.
+
+    >>> from_mongo({"_id": ObjectId("62e00647e98e01ef28be554b")})
+    {'id': '62e00647e98e01ef28be554b'}
+
+    >>> from_mongo({"field": {"_id": ObjectId("62e00647e98e01ef28be554b")}})
+    {'field': {'id': '62e00647e98e01ef28be554b'}}
+    """
+    result = {}
+    for key, value in doc.items():
+        if key == "_id":
+            result["id"] = str(value)
+        elif isinstance(value, dict):
+            result[key] = from_mongo(value)
+        else:
+            result[key] = value
+    return result
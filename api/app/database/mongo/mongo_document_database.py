@@ -5,11 +5,12 @@ from collections.abc import MutableMapping, Iterable
 from datetime import datetime
 from typing import Any
 
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, InsertOne, UpdateOne, DeleteOne
 from pymongo.client_session import ClientSession
 from pymongo.collection import Collection as MongoCollection, ObjectId
 from pymongo.cursor import Cursor
 from pymongo.database import Database as MongoDatabase
+from pymongo.errors import BulkWriteError
 
 from app.database.abstract.document_database import (
     Document,
@@ -17,58 +18,65 @@ from app.database.abstract.document_database import (
     DocumentCollection,
     DatabaseCollection,
     DocumentDatabaseUpdateContext,
+    DocumentDatabaseBulkOperations,
+    BulkWriteItemResult,
+    BulkWriteResult,
+    IndexDefinition,
 )
 from app.logging.log import AppLogger
 from app.shared.errors.errors import InvalidOperationError, NotFoundError
-from app.database.mongo.enum_utils import enums_to_string
+from app.database.mongo.bson_conversion import codec_options, from_mongo, to_mongo
 
 
-def _convert_str_id_to_object_id(data: Any) -> dict:
-    """
-    Converts data dict id field to mongodb _id field.
+def _to_mongo_order(order: str) -> int:
+    return DESCENDING if order == "desc" else ASCENDING
 
-    >>> _convert_str_id_to_object_id({"id": "62e00647e98e01ef28be554b"})
-    {'_id': ObjectId('62e00647e98e01ef28be554b')}
 
-    >>> _convert_str_id_to_object_id({"col": {"id": "62e00647e98e01ef28be554b"}})
-    {'col': {'_id': ObjectId('62e00647e98e01ef28be554b')}}
+def _from_mongo_order(order: Any) -> str:
+    """Text, hashed and other special index types are kept as they are."""
+    if order == ASCENDING:
+        return "asc"
+    if order == DESCENDING:
+        return "desc"
+    return str(order)
 
-    >>> _convert_str_id_to_object_id({"v": [{"id": "62e00647e98e01ef28be554b"}]})
-    {'v': [{'_id': ObjectId('62e00647e98e01ef28be554b')}]}
-    """
-    if isinstance(data, dict):
-        data_copy = data.copy()
-        for key, value in data_copy.items():
-            if key == "id":
-                data["_id"] = ObjectId(value)
-                del data["id"]
-            else:
-                data[key] = _convert_str_id_to_object_id(value)
-    elif isinstance(data, list):
-        for index, value in enumerate(data):
-            data[index] = _convert_str_id_to_object_id(value)
-    return data
-
-
-def _convert_object_id_to_str_id(data: dict) -> dict:
+
+def _projection(fields: list[str] | None) -> dict[str, int] | None:
+    return {field: 1 for field in fields} if fields else None
+
+
+def _keyset_filter(sort_by: str | None, last_value: Any, last_id: ObjectId, order: int) -> dict[str, Any]:
     """
-    >>> _convert_object_id_to_str_id({"_id": ObjectId("62e00647e98e01ef28be554b")})
-    {'id': '62e00647e98e01ef28be554b'}
+    Builds filter matching the documents that come after (last_value, last_id) when sorted by sort_by and then _id.
+    Null and missing values sort before everything else in mongodb, and are matched by neither $gt nor $lt, so they
+    need to be handled separately.
 
-    >>> _convert_object_id_to_str_id({"field": {"_id": ObjectId("62e00647e98e01ef28be554b")}})
-    {'field': {'id': '62e00647e98e01ef28be554b'}}
+    >>> _keyset_filter(None, None, ObjectId("62e00647e98e01ef28be554b"), ASCENDING)
+    {'_id': {'$gt': ObjectId('62e00647e98e01ef28be554b')}}
 
-    :param data:
-    :return:
+    >>> _keyset_filter("name", None, ObjectId("62e00647e98e01ef28be554b"), DESCENDING)
+    {'name': None, '_id': {'$lt': ObjectId('62e00647e98e01ef28be554b')}}
     """
-    data = data.copy()
-    for key, value in data.copy().items():
-        if key == "_id":
-            data["id"] = str(value)
-            del data["_id"]
-        elif isinstance(value, dict):
-            data[key] = _convert_object_id_to_str_id(value)
-    return data
+    compare = "$gt" if order == ASCENDING else "$lt"
+    if sort_by is None:
+        return {"_id": {compare: last_id}}
+
+    same_value = {sort_by: last_value, "_id": {compare: last_id}}
+    if last_value is None:
+        if order == ASCENDING:
+            return {"$or": [same_value, {sort_by: {"$ne": None}}]}
+        return same_value
+
+    conditions = [{sort_by: {compare: last_value}}, same_value]
+    if order == DESCENDING:
+        conditions.append({sort_by: None})
+    return {"$or": conditions}
+
+
+def _array_filters(updates: DocumentDatabaseUpdateContext) -> list[dict[str, Any]] | None:
+    if isinstance(updates, MongoDBUpdateContext):
+        return updates.array_filters() or None
+    return None
 
 
 def _ensure_updated(update_result, doc_id, collection_name):
@@ -80,6 +88,9 @@ class MongoDBUpdateContext(DocumentDatabaseUpdateContext):
     def __init__(self):
         self._set_updates = []
         self._list_push_updates = {}
+        self._unset_fields = []
+        self._list_pull_ids = {}
+        self._array_filters = []
 
     def set_values(self, value_dict: dict[str, Any]) -> None:
         self._set_updates.append(value_dict)
@@ -90,6 +101,34 @@ class MongoDBUpdateContext(DocumentDatabaseUpdateContext):
         else:
             self._list_push_updates[list_name] = [data]
 
+    def unset_values(self, *fields: str) -> None:
+        self._unset_fields.extend(fields)
+
+    def set_in_list(self, list_name: str, item_id: str, value_dict: dict[str, Any]) -> None:
+        """
+        Uses an array filter, so only the matching element is updated.
+
+        >>> context = MongoDBUpdateContext()
+        >>> context.set_in_list("contacts", "62e00647e98e01ef28be554b", {"value": "nisse@perssons.se"})
+        >>> context.to_implementation_specific_update_syntax()
+        {'$set': {'contacts.$[i0].value': 'nisse@perssons.se'}}
+        >>> context.array_filters()
+        [{'i0.id': '62e00647e98e01ef28be554b'}]
+        """
+        alias = f"i{len(self._array_filters)}"
+        self._array_filters.append({f"{alias}.id": item_id})
+        self._set_updates.append({f"{list_name}.$[{alias}].{key}": value for key, value in value_dict.items()})
+
+    def pull_from_list(self, list_name: str, item_id: str) -> None:
+        if list_name in self._list_pull_ids:
+            self._list_pull_ids[list_name].append(item_id)
+        else:
+            self._list_pull_ids[list_name] = [item_id]
+
+    def array_filters(self) -> list[dict[str, Any]]:
+        """Array filters to pass along with the update, for the elements updated by set_in_list."""
+        return self._array_filters
+
     def to_implementation_specific_update_syntax(self) -> Any:
         data = {}
         if any(self._set_updates):
@@ -106,9 +145,116 @@ class MongoDBUpdateContext(DocumentDatabaseUpdateContext):
                     item = value[0]
                     if item is not None:
                         data["$push"][key] = item
+
+        if self._list_pull_ids:
+            data["$pull"] = {}
+            for key, ids in self._list_pull_ids.items():
+                data["$pull"][key] = {"id": ids[0]} if len(ids) == 1 else {"id": {"$in": ids}}
+
+        if self._unset_fields:
+            data["$unset"] = {field: "" for field in self._unset_fields}
         return data
 
 
+class MongoDBBulkOperations(DocumentDatabaseBulkOperations):
+    """
+    Collects the operations as pymongo write models, each with the name of the operation and the document id.
+    Ids for inserted documents are generated here, so they are known even if the batch fails half way.
+
+    >>> operations = MongoDBBulkOperations()
+    >>> operations.delete("62e00647e98e01ef28be554b")
+    >>> operations.to_implementation_specific_operations()
+    [('delete', '62e00647e98e01ef28be554b', DeleteOne({'_id': ObjectId('62e00647e98e01ef28be554b')}, None))]
+    """
+
+    def __init__(self):
+        self._operations = []
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def insert(self, data: dict) -> str:
+        data = to_mongo(dict(data), map_ids=False)
+        data["_id"] = ObjectId()
+        self._operations.append(("insert", str(data["_id"]), InsertOne(data)))
+        return str(data["_id"])
+
+    def update(self, doc_id: str, updates: DocumentDatabaseUpdateContext) -> None:
+        self._operations.append(
+            (
+                "update",
+                doc_id,
+                UpdateOne(
+                    {"_id": ObjectId(doc_id)},
+                    to_mongo(updates.to_implementation_specific_update_syntax(), map_ids=False),
+                    array_filters=_array_filters(updates),
+                ),
+            )
+        )
+
+    def upsert(self, filters: dict[str, Any], updates: DocumentDatabaseUpdateContext) -> None:
+        filters = to_mongo(dict(filters))
+        self._operations.append(
+            (
+                "upsert",
+                None,
+                UpdateOne(
+                    filters,
+                    to_mongo(updates.to_implementation_specific_update_syntax(), map_ids=False),
+                    upsert=True,
+                    array_filters=_array_filters(updates),
+                ),
+            )
+        )
+
+    def delete(self, doc_id: str) -> None:
+        self._operations.append(("delete", doc_id, DeleteOne({"_id": ObjectId(doc_id)})))
+
+    def to_implementation_specific_operations(self) -> list[tuple[str, str | None, Any]]:
+        return self._operations
+
+
+def _to_bulk_write_result(
+    operations: list[tuple[str, str | None, Any]], details: dict, ordered: bool
+) -> BulkWriteResult:
+    """
+    Maps the result document of a pymongo bulk write to a BulkWriteResult, with one item per operation.
+    In an ordered batch the operations after the first failing one are never executed, and reported as failed.
+
+    >>> ops = [("insert", "a", None), ("insert", "b", None), ("insert", "c", None)]
+    >>> details = {"nInserted": 1, "writeErrors": [{"index": 1, "errmsg": "E11000 duplicate key error"}]}
+    >>> [(item.ok, item.error) for item in _to_bulk_write_result(ops, details, True).items]
+    [(True, None), (False, 'E11000 duplicate key error'), (False, 'Not executed, a previous operation failed.')]
+    >>> [item.ok for item in _to_bulk_write_result(ops, details, False).items]
+    [True, False, True]
+    """
+    errors = {error["index"]: error["errmsg"] for error in details.get("writeErrors", [])}
+    upserted = {item["index"]: str(item["_id"]) for item in details.get("upserted", [])}
+    first_error = min(errors) if errors else None
+    items = []
+    for index, (operation, doc_id, _) in enumerate(operations):
+        error = errors.get(index)
+        if error is None and ordered and first_error is not None and index > first_error:
+            error = "Not executed, a previous operation failed."
+        items.append(
+            BulkWriteItemResult(
+                index=index,
+                operation=operation,
+                doc_id=upserted.get(index, doc_id),
+                ok=error is None,
+                error=error,
+            )
+        )
+    return BulkWriteResult(
+        items=items,
+        inserted_count=details.get("nInserted", 0),
+        matched_count=details.get("nMatched", 0),
+        modified_count=details.get("nModified", 0),
+        upserted_count=details.get("nUpserted", 0),
+        deleted_count=details.get("nRemoved", 0),
+    )
+
+
 class MongoDocument(Document):
     """
     Mongo db document.
@@ -167,13 +313,11 @@ class MongoDocument(Document):
     def __iter__(self) -> Iterable:
         """
         Iterable implementation.
-        Returns a copy of the dictionary containing the data, with the id
-        inserted as "id" instead of mongoDB default "_id".
+        Iterates the keys of the document without copying it, with the id
+        as "id" instead of mongoDB default "_id".
         :return: Iterable for dict.
         """
-        clone = self._doc.copy()
-        clone = _convert_object_id_to_str_id(clone)
-        return clone.__iter__()
+        return ("id" if key == "_id" else key for key in self._doc)
 
     def __len__(self) -> int:
         """
@@ -201,7 +345,7 @@ class MongoDocument(Document):
         Gets document as dict.
         :return: dict.
         """
-        return _convert_object_id_to_str_id(self._doc)
+        return from_mongo(self._doc)
 
     def replace(self, data: MutableMapping) -> Document:
         """
@@ -229,24 +373,40 @@ class MongoDocument(Document):
 class MongoDocumentCollection(DocumentCollection):
     """
     A collection of documents.
-    Technically wraps a mongodb cursor to be able to filter selection before
-    fetching all data.
+    Collects filter, sorting and paging before fetching any data. The mongodb cursor is created when the
+    documents are iterated.
     """
 
-    def __init__(self, cursor: Cursor, collection: "MongoDatabaseCollection") -> None:
+    def __init__(
+        self,
+        mongo_collection: MongoCollection,
+        filters: dict[str, Any] | None,
+        projection: dict[str, int] | None,
+        collection: "MongoDatabaseCollection",
+    ) -> None:
         """
         Creates a mongo document collection.
-        :param cursor: Reference to db cursor.
+        :param mongo_collection: Reference to pymongo collection to query.
+        :param filters: Query filter in pymongo syntax.
+        :param projection: Projection in pymongo syntax, or None for all fields.
         :param collection: Reference to db collection
         """
-        self._cursor = cursor
+        self._mongo_collection = mongo_collection
+        self._filters = filters or {}
+        self._projection = projection
         self._collection = collection
+        self._skip: int | None = None
+        self._limit: int | None = None
+        self._sort: list[tuple[str, int]] = []
+        self._after_filter: dict[str, Any] | None = None
 
     def __str__(self):
-        return f"{str(self._cursor)}, {str(self._collection)}"
+        return f"{self._mongo_collection.name}, filters={self._query()}, sort={self._sort}"
 
     def __repr__(self):
-        return f"MongoDocumentCollection({repr(self._cursor)}, {repr(self._collection)})"
+        return (
+            f"MongoDocumentCollection({repr(self._mongo_collection)}, {repr(self._query())}, {repr(self._collection)})"
+        )
 
     def skip(self, skip: int | None) -> "DocumentCollection":
         """
@@ -255,7 +415,7 @@ class MongoDocumentCollection(DocumentCollection):
         :return: A reference to itself for chaining calls.
         """
         if skip is not None:
-            self._cursor = self._cursor.skip(skip)
+            self._skip = skip
         return self
 
     def take(self, take: int | None) -> "DocumentCollection":
@@ -266,7 +426,7 @@ class MongoDocumentCollection(DocumentCollection):
         :return: A reference to itself for chaining calls.
         """
         if take is not None:
-            self._cursor = self._cursor.limit(take)
+            self._limit = take
         return self
 
     def sort(self, sort_by: str | None, sort_order: str | None) -> "DocumentCollection":
@@ -277,21 +437,87 @@ class MongoDocumentCollection(DocumentCollection):
         :return: A reference to self for chaining calls.
         """
         if sort_by is not None:
-            order = ASCENDING
-            if sort_order == "desc":
-                order = DESCENDING
-            self._cursor = self._cursor.sort(sort_by, order)
+            self._sort = [(sort_by, _to_mongo_order(sort_order))]
+        return self
+
+    def after(
+        self,
+        last_id: str | None,
+        sort_by: str | None = None,
+        last_value: Any = None,
+        sort_order: str | None = None,
+    ) -> "DocumentCollection":
+        """See base class."""
+        order = _to_mongo_order(sort_order)
+        self._sort = [(sort_by, order), ("_id", order)] if sort_by else [("_id", order)]
+        if last_id is not None:
+            self._after_filter = _keyset_filter(sort_by, last_value, ObjectId(last_id), order)
         return self
 
+    def _query(self) -> dict[str, Any]:
+        if self._after_filter is None:
+            return self._filters
+        if not self._filters:
+            return self._after_filter
+        return {"$and": [self._filters, self._after_filter]}
+
+    def _cursor(self) -> Cursor:
+        cursor = self._mongo_collection.find(self._query(), self._projection)
+        if self._sort:
+            cursor = cursor.sort(self._sort)
+        if self._skip is not None:
+            cursor = cursor.skip(self._skip)
+        if self._limit is not None:
+            cursor = cursor.limit(self._limit)
+        return cursor
+
     def to_list(self) -> list[Document]:
         """
         Converts the whole cursor of documents to an in memory document
         collection.
         :return: list of Document.
         """
-        for doc in self._cursor:
+        for doc in self._cursor():
             yield MongoDocument(doc, self._collection)
 
+    def _page_with_total(self) -> tuple[list[dict], int]:
+        """
+        Runs a $facet aggregation that returns the page and the total count of documents matching the filter.
+        """
+        page: list[dict[str, Any]] = [{"$match": self._after_filter or {}}]
+        if self._sort:
+            page.append({"$sort": dict(self._sort)})
+        if self._skip:
+            page.append({"$skip": self._skip})
+        if self._limit:
+            page.append({"$limit": self._limit})
+        if self._projection:
+            page.append({"$project": self._projection})
+        pipeline = [
+            {"$match": self._filters},
+            {"$facet": {"items": page, "total": [{"$count": "count"}]}},
+        ]
+        result = next(self._mongo_collection.aggregate(pipeline), None) or {}
+        total = result.get("total") or [{"count": 0}]
+        return result.get("items", []), total[0]["count"]
+
+    def to_list_with_total(self) -> tuple[list[Document], int]:
+        """
+        Gets the page and the total count of documents matching the filter, with one $facet aggregation.
+        :return: Tuple of list of Document and total count.
+        """
+        docs, total = self._page_with_total()
+        return [MongoDocument(doc, self._collection) for doc in docs], total
+
+    def to_dicts(self) -> list[dict]:
+        """See base class."""
+        return [from_mongo(doc) for doc in self._cursor()]
+
+    def to_dicts_with_total(self) -> tuple[list[dict], int]:
+        """See base class."""
+        docs, total = self._page_with_total()
+        return [from_mongo(doc) for doc in docs], total
+
 
 class MongoDatabaseCollection(DatabaseCollection):
     """
@@ -335,16 +561,41 @@ class MongoDatabaseCollection(DatabaseCollection):
             return None
         return MongoDocument(doc, self)
 
-    def add(self, data: dict) -> Document:
+    def add(self, data: dict, verify: bool = False) -> Document:
         """
         Add a new document to the database.
+        The document is built from data and the generated id, without reading it back, unless verify is set.
 
         :param data: The data for the document.
+        :param verify: Read the document back from the database.
         :return: The newly created document.
         """
-        data = enums_to_string(data)
+        data = to_mongo(dict(data), map_ids=False)
         result = self._mongo_collection.insert_one(data)
-        return self.by_id(result.inserted_id)
+        if verify:
+            return self.by_id(str(result.inserted_id))
+        data["_id"] = result.inserted_id
+        return MongoDocument(data, self)
+
+    def add_many(self, data: list[dict], ordered: bool = True, verify: bool = False) -> list[Document]:
+        """
+        Add new documents to the database with one insert_many.
+
+        :param data: The data for each document.
+        :param ordered: Stop at the first failing document.
+        :param verify: Read the documents back from the database.
+        :return: The newly created documents.
+        """
+        if not data:
+            return []
+        data = [to_mongo(dict(item), map_ids=False) for item in data]
+        result = self._mongo_collection.insert_many(data, ordered=ordered)
+        if verify:
+            docs = {doc["_id"]: doc for doc in self._mongo_collection.find({"_id": {"$in": result.inserted_ids}})}
+            return [MongoDocument(docs[doc_id], self) for doc_id in result.inserted_ids if doc_id in docs]
+        for item, doc_id in zip(data, result.inserted_ids):
+            item["_id"] = doc_id
+        return [MongoDocument(item, self) for item in data]
 
     def get_all(self, fields: list[str] | None = None) -> DocumentCollection:
         """
@@ -352,9 +603,7 @@ class MongoDatabaseCollection(DatabaseCollection):
         in the database collection.
         Note that no documents are fetched when calling this method.
         """
-        return MongoDocumentCollection(
-            self._mongo_collection.find(projection={field: 1 for field in fields} if fields else None), self
-        )
+        return MongoDocumentCollection(self._mongo_collection, None, _projection(fields), self)
 
     def get(self, filters: dict[str, Any] = None, fields: list[str] | None = None) -> DocumentCollection:
         """
@@ -362,11 +611,9 @@ class MongoDatabaseCollection(DatabaseCollection):
         """
         if filters is None:
             filters = {}
-        filters = enums_to_string(filters)
-        filters = _convert_str_id_to_object_id(filters)
-        self._logger.debug(f"MongoDatabaseCollection.get(filters={filters})")
-        cursor = self._mongo_collection.find(filters, {field: 1 for field in fields} if fields else None)
-        return MongoDocumentCollection(cursor, self)
+        filters = to_mongo(dict(filters))
+        self._logger.debug("MongoDatabaseCollection.get(filters=%s)", filters)
+        return MongoDocumentCollection(self._mongo_collection, filters, _projection(fields), self)
 
     def exists(self, filters: dict[str, Any]) -> bool:
         """
@@ -377,13 +624,14 @@ class MongoDatabaseCollection(DatabaseCollection):
 
         :return: True if document exists, else False.
         """
-        filters = _convert_str_id_to_object_id(filters)
-        filters = enums_to_string(filters)
+        filters = to_mongo(dict(filters))
         return self._mongo_collection.count_documents(filters, limit=1) > 0
 
     def patch_document(self, doc_id: str, updates: dict[str, Any]) -> None:
         """See base class."""
-        update_result = self._mongo_collection.update_one({"_id": ObjectId(doc_id)}, {"$set": enums_to_string(updates)})
+        update_result = self._mongo_collection.update_one(
+            {"_id": ObjectId(doc_id)}, {"$set": to_mongo(dict(updates), map_ids=False)}
+        )
         _ensure_updated(update_result, doc_id, self._mongo_collection.name)
 
     def push_to_list(
@@ -391,20 +639,62 @@ class MongoDatabaseCollection(DatabaseCollection):
     ) -> None:
         """See base class."""
         update_result = self._mongo_collection.update_one(
-            {"_id": ObjectId(doc_id)}, {"$push": {sub_collection_path: enums_to_string(new_sub_collection_value)}}
+            {"_id": ObjectId(doc_id)},
+            {"$push": {sub_collection_path: to_mongo(new_sub_collection_value, map_ids=False)}},
         )
         _ensure_updated(update_result, doc_id, self._mongo_collection.name)
 
     def update_document(self, doc_id: str, updates: DocumentDatabaseUpdateContext) -> None:
-        data = updates.to_implementation_specific_update_syntax()
-        data = enums_to_string(data)
-        update_result = self._mongo_collection.update_one({"_id": ObjectId(doc_id)}, data)
+        data = to_mongo(updates.to_implementation_specific_update_syntax(), map_ids=False)
+        update_result = self._mongo_collection.update_one(
+            {"_id": ObjectId(doc_id)}, data, array_filters=_array_filters(updates)
+        )
         _ensure_updated(update_result, doc_id, self._mongo_collection.name)
 
+    def find_one_and_update(
+        self,
+        doc_id: str,
+        updates: DocumentDatabaseUpdateContext,
+        filters: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+        return_updated: bool = True,
+    ) -> Document | None:
+        """See base class."""
+        query = {"_id": ObjectId(doc_id)}
+        if filters:
+            query.update(to_mongo(dict(filters), map_ids=False))
+        doc = self._mongo_collection.find_one_and_update(
+            query,
+            to_mongo(updates.to_implementation_specific_update_syntax(), map_ids=False),
+            projection=_projection(fields),
+            array_filters=_array_filters(updates),
+            return_document=ReturnDocument.AFTER if return_updated else ReturnDocument.BEFORE,
+        )
+        if doc is None:
+            return None
+        return MongoDocument(doc, self)
+
+    def bulk_write(self, operations: DocumentDatabaseBulkOperations, ordered: bool = True) -> BulkWriteResult:
+        """See base class."""
+        operations = operations.to_implementation_specific_operations()
+        if not operations:
+            return BulkWriteResult(items=[])
+        try:
+            result = self._mongo_collection.bulk_write([request for _, _, request in operations], ordered=ordered)
+            details = result.bulk_api_result
+        except BulkWriteError as error:
+            details = error.details
+            self._logger.warn(
+                "MongoDatabaseCollection.bulk_write: %s of %s operations failed in collection='%s'",
+                len(details.get("writeErrors", [])),
+                len(operations),
+                self._mongo_collection.name,
+            )
+        return _to_bulk_write_result(operations, details, ordered)
+
     def replace(self, doc_id: str, data: dict) -> None:
         """Replaces data for document."""
-        data = _convert_str_id_to_object_id(data)
-        data = enums_to_string(data)
+        data = to_mongo(dict(data))
         self._mongo_collection.replace_one({"_id": ObjectId(doc_id)}, data)
 
     def delete(self, doc_id: str) -> None:
@@ -412,8 +702,30 @@ class MongoDatabaseCollection(DatabaseCollection):
         self._mongo_collection.delete_one({"_id": ObjectId(doc_id)})
 
     def like(self, field: str, value: str) -> DocumentCollection:
-        cursor = self._mongo_collection.find({field: {"$regex": value}})
-        return MongoDocumentCollection(cursor, self)
+        return MongoDocumentCollection(self._mongo_collection, {field: {"$regex": value}}, None, self)
+
+    def list_indexes(self) -> list[IndexDefinition]:
+        """See base class."""
+        return [
+            IndexDefinition(
+                name=name,
+                keys=[(field, _from_mongo_order(order)) for field, order in info["key"]],
+                unique=info.get("unique", False),
+            )
+            for name, info in self._mongo_collection.index_information().items()
+        ]
+
+    def create_index(self, index: IndexDefinition) -> None:
+        """See base class."""
+        self._mongo_collection.create_index(
+            [(field, _to_mongo_order(order)) for field, order in index.keys],
+            name=index.name,
+            unique=index.unique,
+        )
+
+    def drop_index(self, index_name: str) -> None:
+        """See base class."""
+        self._mongo_collection.drop_index(index_name)
 
 
 class MongoDocumentDatabase(DocumentDatabase):
@@ -434,16 +746,21 @@ class MongoDocumentDatabase(DocumentDatabase):
         :param collection_name: Name of collection.
         :return: Database collection to perform operations on the selected collection.
         """
-        return MongoDatabaseCollection(self._db.get_collection(collection_name), self._logger)
+        collection = self._db.get_collection(collection_name, codec_options=codec_options(self._db.codec_options))
+        return MongoDatabaseCollection(collection, self._logger)
 
     def transaction(self, datastore, function, *args, **kwargs):
         self._logger.debug(
-            f"MongoDocumentDatabase.transaction(self={self}, datastore={datastore}, function={function}, "
-            f"*args={args}, **kwargs={kwargs})"
+            "MongoDocumentDatabase.transaction(self=%s, datastore=%s, function=%s, *args=%s, **kwargs=%s)",
+            self,
+            datastore,
+            function,
+            args,
+            kwargs,
         )
 
         def callback(session: ClientSession):
-            self._logger.debug(f"MongoDocumentDatabase.transaction.callback(session={session})")
+            self._logger.debug("MongoDocumentDatabase.transaction.callback(session=%s)", session)
             temp_db = self._db
             self._db = session.client.get_database()
             result = function(datastore, *args, **kwargs)
@@ -457,5 +774,11 @@ class MongoDocumentDatabase(DocumentDatabase):
     def update_context(self) -> DocumentDatabaseUpdateContext:
         return MongoDBUpdateContext()
 
+    def bulk_operations(self) -> DocumentDatabaseBulkOperations:
+        return MongoDBBulkOperations()
+
     def new_id(self) -> str:
         return str(ObjectId())
+
+    def is_valid_id(self, doc_id: str) -> bool:
+        return ObjectId.is_valid(doc_id)
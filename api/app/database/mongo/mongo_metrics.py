@@ -0,0 +1,201 @@
+"""
+Connection pool and command metrics for the MongoClient, collected with pymongo event listeners.
+
+Listeners are called synchronously on the thread doing the database call, so everything here has to be cheap.
+The metrics are per process, since every uvicorn worker has its own MongoClient and pool.
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from pymongo.monitoring import (
+    CommandFailedEvent,
+    CommandListener,
+    CommandStartedEvent,
+    CommandSucceededEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutStartedEvent,
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionClosedEvent,
+    ConnectionCreatedEvent,
+    ConnectionPoolListener,
+    ConnectionReadyEvent,
+    PoolClearedEvent,
+    PoolClosedEvent,
+    PoolCreatedEvent,
+    PoolReadyEvent,
+)
+
+# Upper bounds in milliseconds. Values above the last bound are counted in the "+Inf" bucket.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """
+    Histogram with fixed buckets, not cumulative.
+
+    >>> histogram = LatencyHistogram((1, 10))
+    >>> for value in (0.5, 3, 10, 42):
+    ...     histogram.observe(value)
+    >>> histogram.to_dict()
+    {'count': 4, 'sum_ms': 55.5, 'max_ms': 42, 'buckets': {'1': 1, '10': 2, '+Inf': 1}}
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self._counts[bisect_left(self._buckets, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def to_dict(self) -> dict:
+        buckets = {str(bound): count for bound, count in zip(self._buckets, self._counts)}
+        buckets["+Inf"] = self._counts[-1]
+        return {"count": self.count, "sum_ms": round(self.sum_ms, 3), "max_ms": self.max_ms, "buckets": buckets}
+
+
+class _PoolState:
+    def __init__(self):
+        self.open_connections = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.check_out_failures: dict[str, int] = {}
+        self.cleared = 0
+        self.check_out_wait = LatencyHistogram()
+
+    def to_dict(self) -> dict:
+        return {
+            "open_connections": self.open_connections,
+            "checked_out": self.checked_out,
+            "max_checked_out": self.max_checked_out,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "check_out_failures": dict(self.check_out_failures),
+            "cleared": self.cleared,
+            "check_out_wait": self.check_out_wait.to_dict(),
+        }
+
+
+class MongoMetrics(ConnectionPoolListener, CommandListener):
+    """
+    Keeps track of pool state per server address and latency per command name.
+    Register with MongoClient(event_listeners=[metrics]).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: dict[str, _PoolState] = {}
+        self._check_out_started: dict[tuple[str, int], float] = {}
+        self._commands: dict[str, LatencyHistogram] = {}
+        self._command_failures: dict[str, int] = {}
+
+    def _pool(self, address) -> _PoolState:
+        key = f"{address[0]}:{address[1]}"
+        if key not in self._pools:
+            self._pools[key] = _PoolState()
+        return self._pools[key]
+
+    def pool_created(self, event: PoolCreatedEvent) -> None:
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event: PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: PoolClearedEvent) -> None:
+        with self._lock:
+            self._pool(event.address).cleared += 1
+
+    def pool_closed(self, event: PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self._pool(event.address).open_connections += 1
+
+    def connection_ready(self, event: ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: ConnectionClosedEvent) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.open_connections = max(pool.open_connections - 1, 0)
+
+    def connection_check_out_started(self, event: ConnectionCheckOutStartedEvent) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.waiting += 1
+            pool.max_waiting = max(pool.max_waiting, pool.waiting)
+            self._check_out_started[(str(event.address), threading.get_ident())] = time.perf_counter()
+
+    def _check_out_done(self, address) -> _PoolState:
+        pool = self._pool(address)
+        pool.waiting = max(pool.waiting - 1, 0)
+        started = self._check_out_started.pop((str(address), threading.get_ident()), None)
+        if started is not None:
+            pool.check_out_wait.observe((time.perf_counter() - started) * 1000)
+        return pool
+
+    def connection_check_out_failed(self, event: ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            pool = self._check_out_done(event.address)
+            pool.check_out_failures[event.reason] = pool.check_out_failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event: ConnectionCheckedOutEvent) -> None:
+        with self._lock:
+            pool = self._check_out_done(event.address)
+            pool.checked_out += 1
+            pool.max_checked_out = max(pool.max_checked_out, pool.checked_out)
+
+    def connection_checked_in(self, event: ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.checked_out = max(pool.checked_out - 1, 0)
+
+    def started(self, event: CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        with self._lock:
+            if event.command_name not in self._commands:
+                self._commands[event.command_name] = LatencyHistogram()
+            self._commands[event.command_name].observe(event.duration_micros / 1000)
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        with self._lock:
+            self._command_failures[event.command_name] = self._command_failures.get(event.command_name, 0) + 1
+            if event.command_name not in self._commands:
+                self._commands[event.command_name] = LatencyHistogram()
+            self._commands[event.command_name].observe(event.duration_micros / 1000)
+
+    def snapshot(self) -> dict:
+        """
+        Copy of the current metrics, safe to serialize.
+        :return: dict with pid, pools keyed by server address and commands keyed by command name.
+        """
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "pools": {address: pool.to_dict() for address, pool in self._pools.items()},
+                "commands": {
+                    name: {**histogram.to_dict(), "failures": self._command_failures.get(name, 0)}
+                    for name, histogram in self._commands.items()
+                },
+            }
+
+
+@functools.lru_cache(None)
+def get_mongo_metrics() -> MongoMetrics:
+    """The metrics registered on the MongoClient of this process."""
+    return MongoMetrics()
@@ -0,0 +1,51 @@
+"""
+Connection settings for the MongoClient, loaded from environment variables prefixed with MONGO_.
+
+IE: MONGO_URI, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_WAIT_QUEUE_TIMEOUT_MS, MONGO_READ_PREFERENCE and
+MONGO_COMPRESSORS.
+The pool is per process, so with several uvicorn workers the total number of connections to the database is
+workers * max_pool_size.
+"""
+from typing import Any
+
+from pydantic import BaseSettings, Field, validator
+
+READ_PREFERENCES = ("primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest")
+
+
+class MongoSettings(BaseSettings):
+    uri: str = Field("mongodb://localhost:27017/produce_exchange_hub?retryWrites=true&w=majority")
+    max_pool_size: int = Field(100, ge=0)
+    min_pool_size: int = Field(0, ge=0)
+    wait_queue_timeout_ms: int | None = Field(None, gt=0)
+    read_preference: str = Field("primary")
+    compressors: str | None = Field(None)
+
+    class Config:
+        env_prefix = "MONGO_"
+
+    @validator("read_preference")
+    def _validate_read_preference(cls, value: str) -> str:
+        if value not in READ_PREFERENCES:
+            raise ValueError(f"read_preference has to be one of {', '.join(READ_PREFERENCES)}")
+        return value
+
+    def client_options(self) -> dict[str, Any]:
+        """
+        Keyword arguments for MongoClient.
+        Options not set are left out, so that options given in the uri apply.
+
+        >>> MongoSettings(max_pool_size=10, wait_queue_timeout_ms=500, compressors="zstd,zlib").client_options()
+        {'maxPoolSize': 10, 'minPoolSize': 0, 'readPreference': 'primary', 'waitQueueTimeoutMS': 500, \
+'compressors': 'zstd,zlib'}
+        """
+        options = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "readPreference": self.read_preference,
+        }
+        if self.wait_queue_timeout_ms is not None:
+            options["waitQueueTimeoutMS"] = self.wait_queue_timeout_ms
+        if self.compressors:
+            options["compressors"] = self.compressors
+        return options
@@ -1,62 +1,82 @@
 from fastapi import Depends
 
-from app.database.abstract.document_database import BaseDatastore, DocumentDatabase, DatabaseCollection
+from app.database.abstract.async_document_database import (
+    AsyncBaseDatastore,
+    AsyncDocumentDatabase,
+    AsyncDatabaseCollection,
+)
+from app.database.abstract.document_database import BulkWriteResult
 from app.database.dependencies.document_database import get_document_database
 from app.knowlege.models.db.product import Product
 from app.shared.models.v1.shared import Language
 
 
-class ProductDatastore(BaseDatastore):
+class ProductDatastore(AsyncBaseDatastore):
     """Datastore handling product related things."""
 
-    def __init__(self, db: DocumentDatabase):
+    def __init__(self, db: AsyncDocumentDatabase):
         super().__init__(db)
 
     @property
-    def _products(self) -> DatabaseCollection:
+    def _products(self) -> AsyncDatabaseCollection:
         return self.db.collection("products")
 
-    def get_product(self, product_id: str) -> Product:
+    async def get_product(self, product_id: str) -> Product:
         """Get product by id"""
-        product_doc = self._products.by_id(product_id)
+        product_doc = await self._products.by_id(product_id)
         return Product(**product_doc)
 
-    def get_products(self, language: Language, name_search: str) -> list[Product]:
+    async def get_product_dicts(self, language: Language, name_search: str) -> list[dict]:
         """
-        Get products according to filter.
+        Get products according to filter, for the listing. The products are returned as the plain dicts read from the
+        database, without building Product models.
 
         :param language: Langauge to search in.
         :param name_search: Used for prefix search.
-        :return: list of Product
+        :return: list of product documents.
         """
         if language and name_search:
-            product_docs = self._products.like(f"name.{language.value}", name_search).to_list()
-        else:
-            product_docs = self._products.get_all().to_list()
+            return await self._products.like(f"name.{language.value}", name_search).to_dicts()
+        return await self._products.get_all().to_dicts()
 
-        for doc in product_docs:
-            yield Product(**doc)
-
-    def add_product(self, product_name: str, language: Language) -> Product:
+    async def add_product(self, product_name: str, language: Language) -> Product:
         """
         Add new product.
         :param product_name: The product in the given localization.
         :param language: The language of the product name.
         :return: The newly added product.
         """
-        product_doc = self._products.add({"name": {language.value: product_name.title()}})
+        product_doc = await self._products.add({"name": {language.value: product_name.title()}})
         return Product(**product_doc)
 
-    def update_product(self, product_id: str, product: Product) -> Product:
+    async def import_products(self, product_names: list[str], language: Language) -> BulkWriteResult:
+        """
+        Import a product catalogue with one bulk write.
+        Products are matched on their name in the given language, so importing the same catalogue again
+        doesn't create duplicates.
+
+        :param product_names: The products in the given localization.
+        :param language: The language of the product names.
+        :return: BulkWriteResult with one item per unique product name.
+        """
+        operations = self.db.bulk_operations()
+        for name in dict.fromkeys(product_name.title() for product_name in product_names):
+            update_context = self.db.update_context()
+            update_context.set_values({f"name.{language.value}": name})
+            operations.upsert({f"name.{language.value}": name}, update_context)
+        return await self._products.bulk_write(operations, ordered=False)
+
+    async def update_product(self, product_id: str, product: Product) -> Product:
         """
         Update product.
         :param product_id: ID of product.
         :param product: The updated product model.
         :return: The updated product.
         """
-        doc = self._products.by_id(product_id).replace(product.dict())
+        doc = await self._products.by_id(product_id)
+        doc = await doc.replace(product.dict())
         return Product(**doc)
 
 
-def get_product_datastore(db: DocumentDatabase = Depends(get_document_database)) -> ProductDatastore:
+def get_product_datastore(db: AsyncDocumentDatabase = Depends(get_document_database)) -> ProductDatastore:
     return ProductDatastore(db)
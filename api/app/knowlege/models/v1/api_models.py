@@ -10,6 +10,10 @@ class AddProductModel(BaseModel):
     name: str
 
 
+class ImportProductsModel(BaseModel):
+    names: list[str]
+
+
 class ProductOutModel(BaseModel):
     id: str
     name: str
@@ -18,6 +22,11 @@ class ProductOutModel(BaseModel):
     def from_db_model(cls, product: Product, language: Language) -> "ProductOutModel":
         return cls(id=product.id, name=select_localized_text(product.name, language, []))
 
+    @classmethod
+    def dict_from_document(cls, doc: dict, language: Language) -> dict:
+        """The output of from_db_model as a plain dict, from a product document, for the read only listing."""
+        return {"id": doc["id"], "name": select_localized_text(doc.get("name") or {}, language, [])}
+
 
 class ProductUpdateModel(BaseModel):
     name: dict[Language, str]
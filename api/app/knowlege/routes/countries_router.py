@@ -9,4 +9,4 @@ router = APIRouter(prefix=BASE_PATH + "/countries", tags=["Country"])
 
 @router.get("/", response_model=list[Country])
 async def get_countries(ds: CountryDatastore = Depends(get_country_datastore)):
-    return ds.get_countries()
+    return await ds.get_countries()
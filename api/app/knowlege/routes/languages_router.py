@@ -9,4 +9,4 @@ router = APIRouter(prefix=BASE_PATH + "/languages", tags=["Language"])
 
 @router.get("/", response_model=list[Language])
 async def get_languages(ds: LanguageDatastore = Depends(get_language_datastore)):
-    return ds.get_languages()
+    return await ds.get_languages()
@@ -4,41 +4,54 @@ Products router.
 Intended to help with auto-completion in UI.
 """
 from fastapi import APIRouter, Body, Depends, Security, Path
+from fastapi.responses import ORJSONResponse
 
 from app.shared.config.routing_config import BASE_PATH
 from app.knowlege.datastores.product_datastore import ProductDatastore, get_product_datastore
 from app.shared.dependencies.essentials import Essentials, get_essentials
 from app.logging.log import AppLoggerInjector, AppLogger
 from app.authentication.dependencies.user import get_current_user
-from app.knowlege.models.v1.api_models import ProductOutModel, AddProductModel, ProductUpdateModel
+from app.database.abstract.document_database import BulkWriteResult
+from app.knowlege.models.v1.api_models import (
+    ProductOutModel,
+    AddProductModel,
+    ProductUpdateModel,
+    ImportProductsModel,
+)
 from app.authentication.models.db.user import User
 from app.shared.utils.request_utils import get_url
+from app.shared.responses.trusted_model_response import TrustedModelResponse
 
 router = APIRouter(prefix=BASE_PATH + "/products", tags=["Products"])
 _logger_injector = AppLoggerInjector("products_router")
 
 
-@router.get("/", response_model=list[ProductOutModel])
+@router.get("/", response_model=list[ProductOutModel], response_class=ORJSONResponse)
 async def get_products(
     essentials: Essentials = Depends(get_essentials),
     product_datastore: ProductDatastore = Depends(get_product_datastore),
-):
+) -> ORJSONResponse:
     """Get all products."""
     return await search_products(None, essentials, product_datastore)
 
 
-@router.get("/{name_search}", response_model=list[ProductOutModel])
+@router.get("/{name_search}", response_model=list[ProductOutModel], response_class=ORJSONResponse)
 async def search_products(
     name_search: str | None = Path(None),
     essentials: Essentials = Depends(get_essentials),
     product_datastore: ProductDatastore = Depends(get_product_datastore),
-):
-    """Get products matching name query."""
-    products = product_datastore.get_products(essentials.language, name_search.title() if name_search else None)
-    return [ProductOutModel.from_db_model(product, essentials.language) for product in products]
+) -> ORJSONResponse:
+    """
+    Get products matching name query.
+    Read only fast path: the product documents are turned straight into the output and serialized with orjson.
+    """
+    products = await product_datastore.get_product_dicts(
+        essentials.language, name_search.title() if name_search else None
+    )
+    return ORJSONResponse([ProductOutModel.dict_from_document(product, essentials.language) for product in products])
 
 
-@router.post("/", response_model=ProductOutModel)
+@router.post("/", response_model=ProductOutModel, response_class=TrustedModelResponse)
 async def add_product(
     product: AddProductModel = Body(...),
     product_datastore: ProductDatastore = Depends(get_product_datastore),
@@ -48,14 +61,32 @@ async def add_product(
 ):
     """Add new product."""
     logger.debug(
-        f"Incoming={get_url(essentials.request)}: lang={essentials.language}, product={product}, "
+        lambda: f"Incoming={get_url(essentials.request)}: lang={essentials.language}, product={product}, "
         f"authenticated_user={authenticated_user}"
     )
-    product = product_datastore.add_product(product.name, essentials.language)
-    return ProductOutModel.from_db_model(product, essentials.language)
+    product = await product_datastore.add_product(product.name, essentials.language)
+    return TrustedModelResponse(
+        ProductOutModel.from_db_model(product, essentials.language), response_model=ProductOutModel
+    )
 
 
-@router.put("/{product_id}", response_model=ProductOutModel)
+@router.post("/import", response_model=BulkWriteResult)
+async def import_products(
+    model: ImportProductsModel = Body(...),
+    product_datastore: ProductDatastore = Depends(get_product_datastore),
+    authenticated_user: User = Security(get_current_user, scopes=("roles:superuser",)),
+    logger: AppLogger = Depends(_logger_injector),
+    essentials: Essentials = Depends(get_essentials),
+):
+    """Import a product catalogue. Products that already exist with the same name are left as they are."""
+    logger.debug(
+        lambda: f"Incoming={get_url(essentials.request)}: lang={essentials.language}, products={len(model.names)}, "
+        f"authenticated_user={authenticated_user}"
+    )
+    return await product_datastore.import_products(model.names, essentials.language)
+
+
+@router.put("/{product_id}", response_model=ProductOutModel, response_class=TrustedModelResponse)
 async def update_product(
     product_id: str,
     model: ProductUpdateModel = Body(...),
@@ -66,7 +97,10 @@ async def update_product(
 ):
     """Update product."""
     logger.debug(
-        f"Incoming={get_url(essentials.request)}: product_id={product_id}, authenticated_user={authenticated_user}"
+        lambda: f"Incoming={get_url(essentials.request)}: product_id={product_id}, "
+        f"authenticated_user={authenticated_user}"
+    )
+    product = await product_datastore.update_product(product_id, model.to_db_model(product_id))
+    return TrustedModelResponse(
+        ProductOutModel.from_db_model(product, essentials.language), response_model=ProductOutModel
     )
-    product = product_datastore.update_product(product_id, model.to_db_model(product_id))
-    return ProductOutModel.from_db_model(product, essentials.language)
@@ -1,24 +1,95 @@
-"""Dependencies for logging"""
+"""
+Dependencies for logging
+
+Loggers don't write to the console or the log file themselves. Records are put on a bounded queue by a QueueHandler,
+and a QueueListener thread formats them and does the writing. So logging from a request never waits for disk or
+console I/O. If the queue is full the record is dropped instead, and counted per level in dropped_records.
+Queue size is configured with LOG_QUEUE_SIZE and the log file with LOG_FILE_PATH.
+
+The level is INFO unless set with LOG_LEVEL, and can be set per logger name with LOG_LEVELS, IE:
+    LOG_LEVEL=WARNING LOG_LEVELS="CompanyDatastore=DEBUG,dependencies.user=DEBUG"
+Messages are only formatted if the level is enabled. Pass the values as %-style arguments, or pass a callable as the
+message, instead of building an f-string:
+    logger.debug("get_companies(filters=%s)", filters)
+    logger.debug(lambda: f"Result from get_companies={[company.id for company in result]}")
+"""
+import atexit
+import copy
 import functools
+import threading
 from abc import ABCMeta
-from logging import DEBUG, StreamHandler, getLogger, Formatter, Handler
-from logging.handlers import TimedRotatingFileHandler
-from typing import Any, Callable
+from logging import DEBUG, ERROR, INFO, WARNING, StreamHandler, getLogger, getLevelName, Formatter, Handler, LogRecord
+from logging import Logger
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from queue import Full, Queue
+from typing import Any
 
-LOG_LEVEL = DEBUG
-LOG_FILE_PATH = "C:/logs/produce_exchange_hub.log"
-# SLA_LOG_FILE_PATH = "C:/logs/produce_exchange_hub.sla.log"
+from fastapi import Request
+from pydantic import BaseSettings, Field, validator
+
+HANDLER_LOG_LEVEL = DEBUG
 
 DEFAULT_FORMATTER = Formatter("%(asctime)s|%(levelname)s|%(threadName)s|%(name)s|%(message)s")
-# SLA_FORMATTER = Formatter("%(asctime)s|%(levelname)s|%(threadName)s|%(name)s|%(message)s")
+
+
+def _parse_level(level: str) -> int:
+    value = getLevelName(level.strip().upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level '{level}'")
+    return value
+
+
+class LogSettings(BaseSettings):
+    file_path: str = Field("C:/logs/produce_exchange_hub.log")
+    queue_size: int = Field(10000, gt=0)
+    level: str = Field("INFO")
+    levels: str = Field("")
+
+    class Config:
+        env_prefix = "LOG_"
+
+    @validator("level")
+    def _validate_level(cls, value: str) -> str:
+        _parse_level(value)
+        return value
+
+    @validator("levels")
+    def _validate_levels(cls, value: str) -> str:
+        for item in filter(None, value.split(",")):
+            name, separator, level = item.partition("=")
+            if not separator or not name.strip():
+                raise ValueError(f"levels has to be name=LEVEL pairs separated by comma, got '{item}'")
+            _parse_level(level)
+        return value
+
+    def level_for(self, logger_name: str) -> int:
+        """
+        Level of a logger. Set by name in levels, otherwise level.
+
+        >>> LogSettings(level="warning", levels="CompanyDatastore=DEBUG").level_for("CompanyDatastore")
+        10
+        >>> LogSettings(level="warning", levels="CompanyDatastore=DEBUG").level_for("main")
+        30
+        """
+        for item in filter(None, self.levels.split(",")):
+            name, _, level = item.partition("=")
+            if name.strip() == logger_name:
+                return _parse_level(level)
+        return _parse_level(self.level)
+
+
+@functools.lru_cache(None)
+def get_log_settings() -> LogSettings:
+    """The log settings of this process, read from the environment."""
+    return LogSettings()
 
 
 @functools.lru_cache(None)
 def get_file_handler() -> Handler | None:
     """Injection method for file handler for logger."""
     try:
-        file_handler = TimedRotatingFileHandler(LOG_FILE_PATH, "midnight", 1, 5, "utf8", False, True)
-        file_handler.setLevel(LOG_LEVEL)
+        file_handler = TimedRotatingFileHandler(get_log_settings().file_path, "midnight", 1, 5, "utf8", False, True)
+        file_handler.setLevel(HANDLER_LOG_LEVEL)
         file_handler.setFormatter(DEFAULT_FORMATTER)
         return file_handler
     except Exception as err:
@@ -31,7 +102,7 @@ def get_console_handler() -> Handler | None:
     """Injection method for console handler for logger."""
     try:
         console_handler = StreamHandler()
-        console_handler.setLevel(LOG_LEVEL)
+        console_handler.setLevel(HANDLER_LOG_LEVEL)
         console_handler.setFormatter(DEFAULT_FORMATTER)
         return console_handler
     except Exception as err:
@@ -39,14 +110,110 @@ def get_console_handler() -> Handler | None:
     return None
 
 
-# sla_handler = TimedRotatingFileHandler(SLA_LOG_FILE_PATH, "midnight", 1, 5, "utf8", False, True)
-# sla_handler.setLevel(LOG_LEVEL)
-# sla_handler.setFormatter(SLA_FORMATTER)
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks. Records that don't fit in the queue are dropped and counted.
 
+    >>> handler = DroppingQueueHandler(Queue(1))
+    >>> for message in ("first", "second", "third"):
+    ...     handler.handle(LogRecord("test", DEBUG, __file__, 1, message, None, None))
+    True
+    True
+    True
+    >>> handler.dropped_records
+    {'DEBUG': 2}
+    """
+
+    def __init__(self, queue: Queue):
+        super().__init__(queue)
+        self._dropped_lock = threading.Lock()
+        self._dropped: dict[str, int] = {}
+
+    @property
+    def dropped_records(self) -> dict[str, int]:
+        """Number of dropped records per level name."""
+        with self._dropped_lock:
+            return dict(self._dropped)
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        """
+        Merges the message arguments into the message, so that later changes to the arguments don't show in the log.
+        Formatting is left to the handlers of the listener.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
-def _log(log_function: Callable, message: Any, exception: Exception = None) -> None:
-    """Wraps the log function."""
-    log_function(str(message), exc_info=exception)
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            with self._dropped_lock:
+                self._dropped[record.levelname] = self._dropped.get(record.levelname, 0) + 1
+
+
+class _BlockingSentinelQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Waits for room in the queue when stopping. put_nowait would fail if the queue is full.
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """The queue handler loggers write to, and the listener thread that writes the queued records to the handlers."""
+
+    def __init__(self, queue_size: int, handlers: list[Handler]):
+        self._queue = Queue(queue_size)
+        self.queue_handler = DroppingQueueHandler(self._queue)
+        self._listener = _BlockingSentinelQueueListener(
+            self._queue, *(h for h in handlers if h is not None), respect_handler_level=True
+        )
+        self._listener.start()
+        self._stopped = False
+
+    @property
+    def queued(self) -> int:
+        """Number of records waiting to be written."""
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queued,
+            "queue_size": self._queue.maxsize,
+            "dropped": self.queue_handler.dropped_records,
+        }
+
+    def stop(self) -> None:
+        """Writes the records already queued, and stops the listener thread."""
+        if not self._stopped:
+            self._stopped = True
+            self._listener.stop()
+
+
+@functools.lru_cache(None)
+def get_log_pipeline() -> LogPipeline:
+    """The log pipeline of this process. The listener is stopped, and the queue flushed, on exit."""
+    pipeline = LogPipeline(get_log_settings().queue_size, [get_console_handler(), get_file_handler()])
+    atexit.register(pipeline.stop)
+    return pipeline
+
+
+def _log(logger: Logger, level: int, context: str, message: Any, args: tuple, exception: BaseException | None) -> None:
+    """
+    Wraps the log function. Nothing is formatted, and callable messages are not called, if the level is disabled.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if callable(message):
+        message = message()
+    if args:
+        # The context is passed as an argument, so that a % in it isn't taken for a placeholder.
+        logger.log(level, f"%s{message}", context, *args, exc_info=exception)
+    else:
+        logger.log(level, f"{context}{message}", exc_info=exception)
+
+
+_configure_lock = threading.Lock()
+_configured_loggers: set[str] = set()
 
 
 class BaseLogger(metaclass=ABCMeta):
@@ -54,92 +221,91 @@ class BaseLogger(metaclass=ABCMeta):
     Wrapps python logger.
 
     A wrapper is being used because we want to provide a cleaner interface with better type checking for calls.
+    The python logger is configured by the first wrapper created for a name. Later ones leave it alone, since setLevel
+    clears the level cache of every logger in the process.
     """
 
     def __init__(self, logger_name: str, log_level: int, handlers: list[Handler]):
         self.logger = getLogger(logger_name)
-        self.logger.setLevel(log_level)
-        for handler in (h for h in handlers if h is not None):
-            self.logger.addHandler(handler)
+        self._context = ""
+        with _configure_lock:
+            if logger_name not in _configured_loggers:
+                self.logger.setLevel(log_level)
+                for handler in (h for h in handlers if h is not None):
+                    self.logger.addHandler(handler)
+                _configured_loggers.add(logger_name)
+
+    def bind(self, **fields: Any) -> "BaseLogger":
+        """
+        Gets a logger that puts fields first in every message. Shares the python logger, so it's only a copy.
+
+        >>> AppLogger("bind_example").bind(method="GET", path="/v1/companies")._context
+        'method=GET|path=/v1/companies|'
 
-    def debug(self, message: Any, exception: Exception = None) -> None:
+        :param fields: Context, IE: of the current request.
+        :return: Logger of same type.
+        """
+        bound = copy.copy(self)
+        bound._context = self._context + "".join(f"{key}={value}|" for key, value in fields.items())
+        return bound
+
+    def debug(self, message: Any, *args: Any, exception: BaseException | None = None) -> None:
         """
         Logs message and exception information if any.
 
         :param message: Message can be of any type but will be converted to str using the str constructor.
+            If it's callable, it's called to get the message, but only if the level is enabled.
+        :param args: Arguments for %-style placeholders in message, only merged if the level is enabled.
         :param exception: Exception raised.
         :return: None.
         """
-        _log(self.logger.debug, message, exception)
+        _log(self.logger, DEBUG, self._context, message, args, exception)
 
-    def info(self, message: Any, exception: Exception = None) -> None:
+    def info(self, message: Any, *args: Any, exception: BaseException | None = None) -> None:
         """Logs info level log."""
-        _log(self.logger.info, message, exception)
+        _log(self.logger, INFO, self._context, message, args, exception)
 
-    def warn(self, message: Any, exception: Exception = None) -> None:
+    def warn(self, message: Any, *args: Any, exception: BaseException | None = None) -> None:
         """Logs warning level message."""
-        _log(self.logger.warning, message, exception)
+        _log(self.logger, WARNING, self._context, message, args, exception)
 
-    def error(self, message: Any, exception: Exception = None) -> None:
+    def error(self, message: Any, *args: Any, exception: BaseException | None = None) -> None:
         """Logs error level message."""
-        _log(self.logger.error, message, exception)
+        _log(self.logger, ERROR, self._context, message, args, exception)
 
 
 class AppLogger(BaseLogger):
     """Standard logger for logging debug, info, warning and error information"""
 
     def __init__(self, logger_name: str):
-        super().__init__(logger_name, LOG_LEVEL, [get_console_handler(), get_file_handler()])
-
-
-# class SLALogger(BaseLogger):
-#     """Used for logging to SLA log"""
-#
-#     def __init__(self):
-#         super().__init__("sla", LOG_LEVEL, [sla_handler])
-#
-#     def log_sla(
-#         self,
-#         call_start_time: datetime,
-#         call_end_time: datetime,
-#         request: Request,
-#         response: Response | None = None,
-#         exception: BaseException | None = None,
-#     ) -> None:
-#         """Logs call to sla log."""
-#         time_delta = call_end_time - call_start_time
-#         call_status = "OK" if exception is None else "FAILED"
-#         http_status = response.status_code if response is not None else "NoResponse"
-#         detail = "None"
-#         if response is not None:
-#             if not is_successfull(response.status_code):
-#                 if response.body is not None:
-#                     pass
-#
-#         message = f"{get_url(request)}"
-#         message += f"|{time_delta.microseconds}"
-#         message += f"|{call_start_time.strftime(DATE_FORMAT)}"
-#         message += f"|{call_end_time.strftime(DATE_FORMAT)}"
-#         message += f"|{call_status}"
-#         message += f"|{http_status}"
-#         message += f"|{detail}"
-#
-#         _log(self.logger.info, message)
+        super().__init__(logger_name, get_log_settings().level_for(logger_name), [get_log_pipeline().queue_handler])
+
+
+@functools.lru_cache(None)
+def get_app_logger(logger_name: str) -> AppLogger:
+    """The AppLogger for a name, created once per process."""
+    return AppLogger(logger_name)
 
 
 class AppLoggerInjector:
     """
     Injector for AppLogger class.
+    When injected in a request, the logger is bound to the method and path of the request.
 
     >>> injector = AppLoggerInjector("my_logger")
     >>> logger: AppLogger = injector()
     >>> isinstance(logger, AppLogger)
     True
+    >>> injector() is logger
+    True
 
     """
 
     def __init__(self, logger_name: str):
         self.logger_name = logger_name
 
-    def __call__(self) -> AppLogger:
-        return AppLogger(self.logger_name)
+    def __call__(self, request: Request = None) -> AppLogger:
+        logger = get_app_logger(self.logger_name)
+        if request is None:
+            return logger
+        return logger.bind(method=request.method, path=request.url.path)
@@ -0,0 +1,219 @@
+"""
+SLA log. One JSON line per request, IE:
+    {"method": "GET", "route": "/v1/companies/{company_id}", "status": 200, "latency_ms": 12.31, "db_ms": 8.02,
+     "db_calls": 2, "auth_ms": 3.1, "response_bytes": 1432, "sampled": true}
+
+route is the path template of the matched route, so requests to the same endpoint can be grouped.
+db_ms and db_calls are summed from the pymongo command events of the request, and auth_ms is the time spent
+authenticating the access token, database time included.
+
+Settings are read from environment variables prefixed with SLA_:
+    SLA_ENABLED, SLA_FILE_PATH, SLA_SAMPLE_RATE (0-1, of requests that are fast and successful),
+    SLA_SLOW_THRESHOLD_MS (slower requests are always logged, as are server errors).
+"""
+import atexit
+import contextlib
+import functools
+import json
+import random
+import time
+from contextvars import ContextVar
+from logging import Formatter, Handler
+from logging.handlers import TimedRotatingFileHandler
+
+from pydantic import BaseSettings, Field
+from pymongo.monitoring import CommandFailedEvent, CommandListener, CommandStartedEvent, CommandSucceededEvent
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.logging.log import HANDLER_LOG_LEVEL, BaseLogger, LogPipeline, get_console_handler, get_log_settings
+
+SLA_FORMATTER = Formatter("%(message)s")
+
+
+class SLASettings(BaseSettings):
+    enabled: bool = Field(True)
+    file_path: str = Field("C:/logs/produce_exchange_hub.sla.log")
+    sample_rate: float = Field(1.0, ge=0, le=1)
+    slow_threshold_ms: float = Field(1000, ge=0)
+
+    class Config:
+        env_prefix = "SLA_"
+
+
+@functools.lru_cache(None)
+def get_sla_settings() -> SLASettings:
+    """The SLA settings of this process, read from the environment."""
+    return SLASettings()
+
+
+class RequestTimings:
+    """Time spent in the database and in authentication during one request."""
+
+    __slots__ = ("db_ms", "db_calls", "auth_ms")
+
+    def __init__(self):
+        self.db_ms = 0.0
+        self.db_calls = 0
+        self.auth_ms = 0.0
+
+
+# Copied into the threadpool by run_in_threadpool, so pymongo events from the database calls of a request find it.
+_request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def current_request_timings() -> RequestTimings | None:
+    """The timings of the request being handled, None outside of requests or if the SLA log is disabled."""
+    return _request_timings.get()
+
+
+class RequestTimingListener(CommandListener):
+    """Adds the duration of every database command to the timings of the current request."""
+
+    def started(self, event: CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        self._add(event.duration_micros)
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        self._add(event.duration_micros)
+
+    @staticmethod
+    def _add(duration_micros: int) -> None:
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.db_ms += duration_micros / 1000
+            timings.db_calls += 1
+
+
+@contextlib.contextmanager
+def auth_timer():
+    """
+    Adds the time spent in the block to auth_ms of the current request.
+
+    >>> token = _request_timings.set(RequestTimings())
+    >>> with auth_timer():
+    ...     time.sleep(0.001)
+    >>> current_request_timings().auth_ms >= 1
+    True
+    >>> _request_timings.reset(token)
+    """
+    timings = _request_timings.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.auth_ms += (time.perf_counter() - start) * 1000
+
+
+@functools.lru_cache(None)
+def get_sla_file_handler() -> Handler | None:
+    """Injection method for file handler for the SLA log."""
+    try:
+        sla_handler = TimedRotatingFileHandler(get_sla_settings().file_path, "midnight", 1, 5, "utf8", False, True)
+        sla_handler.setLevel(HANDLER_LOG_LEVEL)
+        sla_handler.setFormatter(SLA_FORMATTER)
+        return sla_handler
+    except Exception as err:
+        print(f"Failed to create SLA logging file handler: {str(err)}")
+    return None
+
+
+@functools.lru_cache(None)
+def get_sla_log_pipeline() -> LogPipeline:
+    """Queue and writer thread of the SLA log. Separate from the application log, so SLA lines end up in own file."""
+    pipeline = LogPipeline(get_log_settings().queue_size, [get_sla_file_handler() or get_console_handler()])
+    atexit.register(pipeline.stop)
+    return pipeline
+
+
+class SLALogger(BaseLogger):
+    """Used for logging to SLA log"""
+
+    def __init__(self, pipeline: LogPipeline | None = None):
+        super().__init__("sla", HANDLER_LOG_LEVEL, [(pipeline or get_sla_log_pipeline()).queue_handler])
+        self.logger.propagate = False
+
+    def log_sla(self, entry: dict) -> None:
+        """Logs call to sla log, as one line of JSON."""
+        self.info(lambda: json.dumps(entry, separators=(",", ":")))
+
+
+class SLAMiddleware:
+    """
+    ASGI middleware writing the SLA log.
+    A plain ASGI middleware rather than a starlette BaseHTTPMiddleware, so the response isn't buffered or run in a
+    separate task.
+    """
+
+    def __init__(self, app: ASGIApp, settings: SLASettings | None = None, sla_logger: SLALogger | None = None):
+        self._app = app
+        self._settings = settings or get_sla_settings()
+        self._sla_logger = sla_logger
+        self._route_templates: dict[object, str] | None = None
+
+    def _route_template(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._route_templates is None:
+            routes: list[BaseRoute] = getattr(scope.get("app"), "routes", [])
+            templates = {}
+            for route in routes:
+                route_endpoint = getattr(route, "endpoint", None)
+                if route_endpoint is not None and route_endpoint not in templates:
+                    templates[route_endpoint] = getattr(route, "path", "unmatched")
+            self._route_templates = templates
+        return self._route_templates.get(endpoint, "unmatched")
+
+    def _should_log(self, status: int, latency_ms: float) -> tuple[bool, bool]:
+        """:return: Whether to log, and whether it was picked by sampling."""
+        if status >= 500 or latency_ms >= self._settings.slow_threshold_ms:
+            return True, False
+        if self._settings.sample_rate >= 1:
+            return True, True
+        return random.random() < self._settings.sample_rate, True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._settings.enabled:
+            await self._app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        status = 500
+        response_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self._app(scope, receive, send_wrapper)
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            _request_timings.reset(token)
+            log, sampled = self._should_log(status, latency_ms)
+            if log:
+                if self._sla_logger is None:
+                    self._sla_logger = SLALogger()
+                self._sla_logger.log_sla(
+                    {
+                        "method": scope["method"],
+                        "route": self._route_template(scope),
+                        "status": status,
+                        "latency_ms": round(latency_ms, 3),
+                        "db_ms": round(timings.db_ms, 3),
+                        "db_calls": timings.db_calls,
+                        "auth_ms": round(timings.auth_ms, 3),
+                        "response_bytes": response_bytes,
+                        "sampled": sampled,
+                    }
+                )
@@ -1,14 +1,22 @@
 """Main file for application."""
 
 from fastapi import FastAPI, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.authentication.dependencies.user import compile_route_scopes
+from app.database.dependencies.mongo import get_local_mongo_client, get_mongo_db
+from app.database.indexes.provisioning import ensure_indexes
+from app.database.mongo.mongo_document_database import MongoDocumentDatabase
 from app.logging.log import AppLogger
+from app.logging.sla import SLAMiddleware
+from app.shared.cryptography.hashing_pool import get_hashing_pool
 from app.shared.errors.errors import ErrorModel
 from .authentication.routes.v1 import token
 from .user.routes.v1 import users, user_roles, roles
 from .shared.routes.v1 import timezones
+from .shared.routes.internal import metrics
 from .knowlege.routes import products_router, countries_router, languages_router
 from .company.routes.v1 import companies, company_addresses, company_users, company_contacts, company_orders
 from app.shared.utils.request_utils import get_url
@@ -39,6 +47,10 @@ app.include_router(products_router.router)
 app.include_router(countries_router.router)
 app.include_router(languages_router.router)
 
+app.include_router(metrics.router)
+
+logger.info("Compiled %s security scope rules", compile_route_scopes(app.routes))
+
 origins = [
     "*",
 ]
@@ -50,6 +62,23 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(SLAMiddleware)
+
+
+@app.on_event("startup")
+async def provision_indexes():
+    """Makes sure all indexes in the index registry exist before serving requests."""
+    try:
+        db = MongoDocumentDatabase(get_mongo_db(get_local_mongo_client()), logger)
+        await run_in_threadpool(ensure_indexes, db, logger)
+    except Exception as err:
+        logger.error("Failed to provision indexes", exception=err)
+
+
+@app.on_event("shutdown")
+def shutdown_hashing_pool():
+    """Stops the password hashing threads."""
+    get_hashing_pool().shutdown()
 
 
 @app.exception_handler(Exception)
@@ -64,19 +93,3 @@ def base_exception_handler(request: Request, err: Exception):
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ErrorModel.create(status.HTTP_500_INTERNAL_SERVER_ERROR, str(err), get_url(request)).dict(),
     )
-
-
-# @app.middleware("http")
-# async def sla_log(request: Request, call_next):
-#     """
-#     Logs sla log.
-#     :param request: HTTP request.
-#     :param call_next: Next call to make.
-#     """
-#     start_time = datetime.now()
-#     call_start = datetime.now(utc)
-#     response: Response = await call_next(request)
-#     if response.status_code not in(307, 308):
-#         time_delta = datetime.now() - start_time
-#         call_end = datetime.now(utc)
-#     return response
@@ -0,0 +1,86 @@
+"""
+Runs password hashing and verification in a dedicated, size limited thread pool.
+
+PBKDF2 with a million iterations takes a long time, and running it on the event loop stalls every other request
+served by the same worker. pycryptodome does the iterations in C without holding the GIL, so a thread pool is enough
+to keep the event loop free.
+To keep a burst of logins from queuing up without bound, at most max_pending operations can be queued or running at
+the same time. Beyond that ServiceUnavailableError is raised, which answers 503 to the client.
+
+Size is configured with the environment variables PASSWORD_HASHING_MAX_WORKERS and PASSWORD_HASHING_MAX_PENDING.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from pydantic import BaseSettings, Field
+
+from app.shared.cryptography import password_hasher as hasher
+from app.shared.errors.errors import ServiceUnavailableError
+
+T = TypeVar("T")
+
+
+class HashingPoolSettings(BaseSettings):
+    max_workers: int = Field(2, gt=0)
+    max_pending: int = Field(16, gt=0)
+
+    class Config:
+        env_prefix = "PASSWORD_HASHING_"
+
+
+class HashingPool:
+    """Awaitable api for password_hasher, backed by a bounded thread pool."""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        """
+        Creates a hashing pool.
+        :param max_workers: Number of passwords that can be hashed in parallel.
+        :param max_pending: Number of operations that can be queued or running before new ones are rejected.
+        """
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="password_hashing")
+        self._max_pending = max(max_pending, max_workers)
+        self._pending = 0
+
+    def __repr__(self):
+        return f"HashingPool(pending={self._pending}, max_pending={self._max_pending})"
+
+    @property
+    def pending(self) -> int:
+        """Number of operations queued or running."""
+        return self._pending
+
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        # Only touched from the event loop thread, so no lock is needed for the counter.
+        if self._pending >= self._max_pending:
+            raise ServiceUnavailableError("Too many password operations in progress. Try again later.")
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash_password(self, password: str, salt: bytes | None = None) -> str:
+        """
+        See password_hasher.hash_password.
+        :raise ServiceUnavailableError: If the pool is full.
+        """
+        return await self._run(hasher.hash_password, password, salt if salt is not None else hasher.generate_salt())
+
+    async def is_correct_password(self, in_password: str, hashed_password: str) -> bool:
+        """
+        See password_hasher.is_correct_password.
+        :raise ServiceUnavailableError: If the pool is full.
+        """
+        return await self._run(hasher.is_correct_password, in_password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@functools.lru_cache(None)
+def get_hashing_pool() -> HashingPool:
+    """The hashing pool of this process, sized from the environment."""
+    settings = HashingPoolSettings()
+    return HashingPool(settings.max_workers, settings.max_pending)
@@ -1,64 +1,186 @@
 """
 Contains methods for hashing, verifying and generating salt for passwords
+
+Hashes are stored in a self describing format, with the algorithm and its cost parameters next to the salt and digest:
+    $pbkdf2-sha512$i=1000000$<salt>$<digest>
+    $scrypt$n=32768,r=8,p=1$<salt>$<digest>
+Salt and digest are urlsafe base64 encoded without padding.
+Hashes from before the format was introduced are base64 encoded digest + 256 byte salt, made with PBKDF2-SHA512 and
+1000000 iterations. They can still be verified, and needs_rehash tells when a stored hash should be replaced.
+
+The algorithm and cost for new hashes are configured with environment variables prefixed with PASSWORD_HASH_.
 """
 import base64
+import functools
+import hmac
 
-from Crypto.Protocol.KDF import PBKDF2
+from Crypto.Protocol.KDF import PBKDF2, scrypt
 from Crypto.Hash import SHA512
 from Crypto.Random import get_random_bytes
+from pydantic import BaseSettings, Field, validator
+
+PBKDF2_SHA512 = "pbkdf2-sha512"
+SCRYPT = "scrypt"
+DIGEST_LENGTH = 64
+LEGACY_ITERATIONS = 1000000
+
+
+class PasswordHashPolicy(BaseSettings):
+    """Algorithm and cost used for new password hashes."""
+
+    algorithm: str = Field(PBKDF2_SHA512)
+    pbkdf2_iterations: int = Field(1000000, gt=0)
+    scrypt_n: int = Field(2**15, gt=1)
+    scrypt_r: int = Field(8, gt=0)
+    scrypt_p: int = Field(1, gt=0)
+    salt_length: int = Field(32, ge=16)
+
+    class Config:
+        env_prefix = "PASSWORD_HASH_"
+
+    @validator("algorithm")
+    def _validate_algorithm(cls, value: str) -> str:
+        if value not in (PBKDF2_SHA512, SCRYPT):
+            raise ValueError(f"algorithm has to be {PBKDF2_SHA512} or {SCRYPT}")
+        return value
+
+    @validator("scrypt_n")
+    def _validate_scrypt_n(cls, value: int) -> int:
+        if value & (value - 1):
+            raise ValueError("scrypt_n has to be a power of 2")
+        return value
+
+    def parameters(self) -> dict[str, int]:
+        """
+        Cost parameters for the configured algorithm, as stored in the hash.
+
+        >>> PasswordHashPolicy(algorithm="scrypt", scrypt_n=1024).parameters()
+        {'n': 1024, 'r': 8, 'p': 1}
+        """
+        if self.algorithm == SCRYPT:
+            return {"n": self.scrypt_n, "r": self.scrypt_r, "p": self.scrypt_p}
+        return {"i": self.pbkdf2_iterations}
+
+
+@functools.lru_cache(None)
+def get_password_hash_policy() -> PasswordHashPolicy:
+    """The password hash policy of this process, read from the environment."""
+    return PasswordHashPolicy()
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).decode("utf-8").rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
 
+def _derive(password: str, salt: bytes, algorithm: str, parameters: dict[str, int]) -> bytes:
+    if algorithm == PBKDF2_SHA512:
+        return PBKDF2(password, salt, DIGEST_LENGTH, parameters["i"], hmac_hash_module=SHA512)
+    if algorithm == SCRYPT:
+        return scrypt(password, salt, DIGEST_LENGTH, N=parameters["n"], r=parameters["r"], p=parameters["p"])
+    raise ValueError(f"Unsupported password hash algorithm '{algorithm}'")
 
-def generate_salt() -> bytes:
+
+def _encode(algorithm: str, parameters: dict[str, int], salt: bytes, digest: bytes) -> str:
+    encoded_parameters = ",".join(f"{key}={value}" for key, value in parameters.items())
+    return f"${algorithm}${encoded_parameters}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def _parse(hashed_password: str) -> tuple[str, dict[str, int], bytes, bytes]:
+    """
+    Splits a stored hash into algorithm, parameters, salt and digest.
+
+    >>> _parse("$scrypt$n=1024,r=8,p=1$c2FsdA$ZGlnZXN0")
+    ('scrypt', {'n': 1024, 'r': 8, 'p': 1}, b'salt', b'digest')
     """
-    Generates a random 256 byte long salt
+    if not hashed_password.startswith("$"):
+        hashed_bytes = base64.urlsafe_b64decode(hashed_password.encode("utf-8"))
+        return PBKDF2_SHA512, {"i": LEGACY_ITERATIONS}, hashed_bytes[DIGEST_LENGTH:], hashed_bytes[:DIGEST_LENGTH]
+    _, algorithm, encoded_parameters, salt, digest = hashed_password.split("$")
+    parameters = {}
+    for parameter in encoded_parameters.split(","):
+        key, value = parameter.split("=")
+        parameters[key] = int(value)
+    return algorithm, parameters, _b64decode(salt), _b64decode(digest)
 
-    >>> s = generate_salt()
+
+def generate_salt(length: int | None = None) -> bytes:
+    """
+    Generates a random salt
+
+    >>> s = generate_salt(32)
     >>> len(s)
-    256
+    32
 
-    :return: bytes 256 long, urlsafe b64 encoded
+    :param length: Number of bytes. Defaults to the salt length of the password hash policy.
+    :return: random bytes
     """
-    return get_random_bytes(256)
+    return get_random_bytes(length or get_password_hash_policy().salt_length)
 
 
-def hash_password(password: str, salt: bytes) -> str:
+def hash_password(password: str, salt: bytes, policy: PasswordHashPolicy | None = None) -> str:
     """
-    Hashes a password using PBKDF2 algorith
+    Hashes a password with the algorithm and cost of the password hash policy
 
     >>> s = b'salt'
-    >>> hash_password('Password', s)
-    '1OBCLoBuoHI9JCC662fmmxiLAXsOz8xbrBlsQzQ92TIWesr8knPRbL4waA0RKMABsurKCFdJrE3BI-cnAoo3sHNhbHQ='
+    >>> hash_password('Password', s, PasswordHashPolicy(pbkdf2_iterations=1000))
+    '$pbkdf2-sha512$i=1000$c2FsdA$-vQNajoG_kgS1BANpBAR1_86TgqMExaZnuqYO7P9mfeuymiOKnzcLGo1cNz5p5wXp4DQ-Zej7P9vv6feh6RmpA'
 
     :param password: password to be hashed
     :param salt: salt to use
-    :return: hashed password with salt as base64 encoded byte string
+    :param policy: Algorithm and cost to use. Defaults to the policy configured for the process.
+    :return: hash in the self describing format
     """
-    hashed_bytes = PBKDF2(password, salt, 64, 1000000, hmac_hash_module=SHA512)
-    hashed_bytes = base64.urlsafe_b64encode(hashed_bytes + salt)
-    hashed_value = hashed_bytes.decode("utf-8")
-    return hashed_value
+    policy = policy or get_password_hash_policy()
+    parameters = policy.parameters()
+    return _encode(policy.algorithm, parameters, salt, _derive(password, salt, policy.algorithm, parameters))
 
 
 def is_correct_password(in_password: str, hashed_password: str) -> bool:
     """
-    Verifies that provided password is same as hashed password
+    Verifies that provided password is same as hashed password.
+    The algorithm and cost are read from the hash, so hashes made with another policy can still be verified.
+    The raw digests are compared in constant time, nothing is encoded again.
 
-    >>> s = generate_salt()
-    >>> hashed = hash_password("Password", s)
+    >>> policy = PasswordHashPolicy(algorithm="scrypt", scrypt_n=1024)
+    >>> hashed = hash_password("Password", generate_salt(), policy)
     >>> is_correct_password('Password', hashed)
     True
 
-    >>> s = generate_salt()
-    >>> hashed = hash_password("Password", s)
     >>> is_correct_password("WrongPassword", hashed)
     False
 
+    >>> legacy = "1OBCLoBuoHI9JCC662fmmxiLAXsOz8xbrBlsQzQ92TIWesr8knPRbL4waA0RKMABsurKCFdJrE3BI-cnAoo3sHNhbHQ="
+    >>> is_correct_password("Password", legacy)
+    True
+
     :param in_password:
     :param hashed_password:
     :return: True of password is a match
     """
-    hashed_password_bytes = hashed_password.encode("utf-8")
-    hashed_password_bytes = base64.urlsafe_b64decode(hashed_password_bytes)
-    salt = hashed_password_bytes[64:]
-    hashed_in_password = hash_password(in_password, salt)
-    return hashed_in_password == hashed_password
+    algorithm, parameters, salt, digest = _parse(hashed_password)
+    return hmac.compare_digest(_derive(in_password, salt, algorithm, parameters), digest)
+
+
+def needs_rehash(hashed_password: str, policy: PasswordHashPolicy | None = None) -> bool:
+    """
+    Checks if a stored hash was made with another algorithm or cost than the policy, and should be replaced.
+
+    >>> policy = PasswordHashPolicy(pbkdf2_iterations=1000)
+    >>> needs_rehash(hash_password("Password", generate_salt(), policy), policy)
+    False
+    >>> needs_rehash(hash_password("Password", generate_salt(), policy), PasswordHashPolicy(algorithm="scrypt"))
+    True
+
+    :param hashed_password: The stored hash.
+    :param policy: Defaults to the policy configured for the process.
+    :return: True if the password should be hashed again.
+    """
+    policy = policy or get_password_hash_policy()
+    if not hashed_password.startswith("$"):
+        return True
+    algorithm, parameters, salt, _ = _parse(hashed_password)
+    return algorithm != policy.algorithm or parameters != policy.parameters() or len(salt) < policy.salt_length
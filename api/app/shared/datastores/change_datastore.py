@@ -0,0 +1,107 @@
+"""
+The change datastore.
+Append-only log of changes made to companies, users and roles, kept in its own collection so that the entity
+documents don't grow with their history.
+"""
+from fastapi import Depends
+
+from app.database.abstract.async_document_database import (
+    AsyncBaseDatastore,
+    AsyncDatabaseCollection,
+    AsyncDocument,
+    AsyncDocumentDatabase,
+)
+from app.database.dependencies.document_database import get_document_database
+from app.shared.models.db.change import Change
+
+CHANGES_COLLECTION = "changes"
+
+
+def to_change_document(entity_type: str, entity_id: str, change: Change) -> dict:
+    """
+    Converts a change to the document stored in the changes collection.
+    The id of the change is stored as change_id, since the document id is generated by the database.
+    :param entity_type: Name of the collection of the changed entity. IE: companies.
+    :param entity_id: ID of the changed entity.
+    :param change: The change.
+    :return: Document data as dict.
+    """
+    data = change.dict()
+    data["change_id"] = data.pop("id")
+    data.update({"entity_type": entity_type, "entity_id": entity_id})
+    return data
+
+
+def _from_change_document(doc: AsyncDocument) -> Change:
+    data = doc.to_dict()
+    data["id"] = data.pop("change_id")
+    return Change(**data)
+
+
+class ChangeDatastore(AsyncBaseDatastore):
+    """The datastore class."""
+
+    def __init__(self, db: AsyncDocumentDatabase):
+        super().__init__(db)
+
+    def __repr__(self):
+        return f"ChangeDatastore(db={self.db})"
+
+    @property
+    def _changes(self) -> AsyncDatabaseCollection:
+        """Accessor for changes collection."""
+        return self.db.collection(CHANGES_COLLECTION)
+
+    async def add_change(self, entity_type: str, entity_id: str, change: Change) -> Change:
+        """
+        Appends a change to the log of an entity.
+        :param entity_type: Name of the collection of the changed entity. IE: companies.
+        :param entity_id: ID of the changed entity.
+        :param change: The change.
+        :return: The change.
+        """
+        await self._changes.add(to_change_document(entity_type, entity_id, change))
+        return change
+
+    async def add_changes(self, entity_type: str, entity_id: str, changes: list[Change]) -> list[Change]:
+        """
+        Appends changes to the log of an entity in one round trip.
+        :param entity_type: Name of the collection of the changed entity. IE: companies.
+        :param entity_id: ID of the changed entity.
+        :param changes: The changes.
+        :return: The changes.
+        """
+        await self._changes.add_many([to_change_document(entity_type, entity_id, change) for change in changes])
+        return changes
+
+    async def add_entity_changes(self, entity_type: str, changes: list[tuple[str, Change]]) -> None:
+        """
+        Appends changes to the logs of several entities of the same type in one round trip.
+        :param entity_type: Name of the collection of the changed entities. IE: users.
+        :param changes: List of (entity_id, change).
+        """
+        await self._changes.add_many(
+            [to_change_document(entity_type, entity_id, change) for entity_id, change in changes]
+        )
+
+    async def get_changes(self, entity_id: str, skip: int, take: int) -> list[Change]:
+        """
+        Get the changes made to an entity, oldest first.
+        :param entity_id: ID of the entity.
+        :param skip: Offset.
+        :param take: Number of changes.
+        :return: List of Change.
+        """
+        docs = (
+            await self._changes.get({"entity_id": entity_id}).sort("changed_at", "asc").skip(skip).take(take).to_list()
+        )
+        return [_from_change_document(doc) for doc in docs]
+
+
+def get_change_datastore(db: AsyncDocumentDatabase = Depends(get_document_database)) -> ChangeDatastore:
+    """
+    Dependency injection method for change datastore.
+    :param db: DB reference.
+    :return: New ChangeDatastore.
+    """
+    return ChangeDatastore(db)
@@ -52,3 +52,23 @@ class UnsupportedTimezoneError(HTTPException):
             status_code=400,
             detail=f"Timezone '{timezone}' is not supported. " f"List of available timezones can be found here: " f"",
         )
+
+
+class InvalidContinuationTokenError(HTTPException):
+    """
+    Raised if a continuation token used for paging can't be decoded.
+    """
+
+    def __init__(self, token: str):
+        """Creates InvalidContinuationTokenError."""
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid continuation token '{token}'")
+
+
+class ServiceUnavailableError(HTTPException):
+    """
+    Raised if a resource the request depends on is not available right now.
+    """
+
+    def __init__(self, detail: str):
+        """Creates ServiceUnavailableError."""
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
@@ -49,17 +49,17 @@ class FileManager:
     async def _save_profile_picture(
         self, id_name: str, entity_id: str, upload_file: UploadFile, directory_path: str
     ) -> str:
-        self._logger.debug(f"save_profile_picture({id_name}={entity_id})")
+        self._logger.debug("save_profile_picture(%s=%s)", id_name, entity_id)
         file_name = entity_id + splitext(upload_file.filename)[1]
         file_path = join(directory_path, file_name)
-        self._logger.debug(f"save_profile_picture: file_path={file_path}")
+        self._logger.debug("save_profile_picture: file_path=%s", file_path)
 
         with open(file_path, mode="wb") as file:
             file.write(await upload_file.read())
-            self._logger.debug(f"save_profile_picture: File written to path {file_path}")
+            self._logger.debug("save_profile_picture: File written to path %s", file_path)
 
         url_path = f"/profile-pictures/{file_name}"
-        self._logger.debug(f"save_profile_picture: url_path={url_path}")
+        self._logger.debug("save_profile_picture: url_path=%s", url_path)
         return url_path
 
     def _ensure_folders_exist(self):
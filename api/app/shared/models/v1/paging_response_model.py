@@ -1,10 +1,11 @@
 """Contains PagingResponseModel class."""
-from typing import TypeVar, Generic
+from typing import Any, TypeVar, Generic
 
 from fastapi import Request
 from pydantic import BaseModel
 from pydantic.generics import GenericModel
 
+from app.shared.utils.continuation_token import ContinuationToken
 from app.shared.utils.query_parameter import QueryParameter
 from app.shared.utils.query_string_parser import QueryStringParser
 from app.shared.utils.request_utils import get_current_request_url_with_additions
@@ -12,24 +13,29 @@ from app.shared.utils.request_utils import get_current_request_url_with_addition
 T = TypeVar("T", bound=BaseModel)
 
 
-class PagingResponseModel(GenericModel, Generic[T]):
-    """Generic response model for paging responses when listing items."""
+def _total_pages(total_items: int | None, take: int) -> int | None:
+    """
+    >>> _total_pages(41, 20)
+    3
 
-    items: list[T]
-    url: str
-    number_of_items: int
-    items_per_page: int
-    page_number: int
-    next_page: str
-    previous_page: str | None
+    >>> _total_pages(0, 20)
+    0
+    """
+    if total_items is None:
+        return None
+    return -(-total_items // take)
 
-    @classmethod
-    def create(cls, items: list[T], skip: int, take: int, request: Request):
-        """Creates a paging responses for the given data."""
-        query = QueryStringParser(request.url.query)
-        query.remove("take")
-        query.remove("skip")
 
+def _skip_paging_fields(
+    number_of_items: int, skip: int, take: int, request: Request, total_items: int | None
+) -> dict[str, Any]:
+    """The fields of a paging response, except the items, when paging with skip and take."""
+    query = QueryStringParser(request.url.query)
+    query.remove("take")
+    query.remove("skip")
+
+    next_page_url: str | None = None
+    if total_items is None or skip + take < total_items:
         next_page_url = get_current_request_url_with_additions(
             request,
             query_parameters=tuple(query)
@@ -40,27 +46,124 @@ class PagingResponseModel(GenericModel, Generic[T]):
             include_query=False,
         )
 
-        previous_page_url: str | None = None
-        if skip > 0:
-            skip_previous_url: int = skip - take
-            if skip_previous_url < 0:
-                skip_previous_url = 0
-            previous_page_url = get_current_request_url_with_additions(
-                request,
-                query_parameters=tuple(query)
-                + (
-                    QueryParameter("skip", skip_previous_url),
-                    QueryParameter("take", take),
-                ),
-                include_query=False,
-            )
-
-        return cls(
-            items=items,
-            url=str(request.url),
-            number_of_items=len(items),
-            items_per_page=take,
-            page_number=int(skip / take) + 1,
-            next_page=next_page_url,
-            previous_page=previous_page_url,
+    previous_page_url: str | None = None
+    if skip > 0:
+        skip_previous_url: int = skip - take
+        if skip_previous_url < 0:
+            skip_previous_url = 0
+        previous_page_url = get_current_request_url_with_additions(
+            request,
+            query_parameters=tuple(query)
+            + (
+                QueryParameter("skip", skip_previous_url),
+                QueryParameter("take", take),
+            ),
+            include_query=False,
+        )
+
+    return {
+        "url": str(request.url),
+        "number_of_items": number_of_items,
+        "items_per_page": take,
+        "page_number": int(skip / take) + 1,
+        "next_page": next_page_url,
+        "previous_page": previous_page_url,
+        "continuation_token": None,
+        "total_items": total_items,
+        "total_pages": _total_pages(total_items, take),
+    }
+
+
+def _keyset_paging_fields(
+    number_of_items: int, take: int, next_token: ContinuationToken | None, request: Request, total_items: int | None
+) -> dict[str, Any]:
+    """The fields of a paging response, except the items, when keyset paging."""
+    query = QueryStringParser(request.url.query)
+    query.remove("take")
+    query.remove("skip")
+    query.remove("keyset")
+    query.remove("continuation_token")
+
+    continuation_token: str | None = None
+    next_page_url: str | None = None
+    if next_token is not None and number_of_items >= take:
+        continuation_token = next_token.encode()
+        next_page_url = get_current_request_url_with_additions(
+            request,
+            query_parameters=tuple(query)
+            + (
+                QueryParameter("take", take),
+                QueryParameter("continuation_token", continuation_token),
+            ),
+            include_query=False,
         )
+
+    return {
+        "url": str(request.url),
+        "number_of_items": number_of_items,
+        "items_per_page": take,
+        "page_number": None,
+        "next_page": next_page_url,
+        "previous_page": None,
+        "continuation_token": continuation_token,
+        "total_items": total_items,
+        "total_pages": _total_pages(total_items, take),
+    }
+
+
+class PagingResponseModel(GenericModel, Generic[T]):
+    """Generic response model for paging responses when listing items."""
+
+    items: list[T]
+    url: str
+    number_of_items: int
+    items_per_page: int
+    page_number: int | None
+    next_page: str | None
+    previous_page: str | None
+    continuation_token: str | None
+    total_items: int | None
+    total_pages: int | None
+
+    @classmethod
+    def create(cls, items: list[T], skip: int, take: int, request: Request, total_items: int | None = None):
+        """
+        Creates a paging responses for the given data.
+        If total_items is given, next_page is None on the last page.
+        """
+        return cls(items=items, **_skip_paging_fields(len(items), skip, take, request, total_items))
+
+    @classmethod
+    def create_from_token(
+        cls,
+        items: list[T],
+        take: int,
+        next_token: ContinuationToken | None,
+        request: Request,
+        total_items: int | None = None,
+    ):
+        """
+        Creates a paging response for keyset paging.
+        next_page is built from next_token, and is None when there are no more items.
+        Page numbers and previous page are not known when keyset paging.
+        """
+        return cls(items=items, **_keyset_paging_fields(len(items), take, next_token, request, total_items))
+
+    @staticmethod
+    def create_dict(items: list[dict], skip: int, take: int, request: Request, total_items: int | None = None) -> dict:
+        """
+        Same as create, for the read only listings whose items are already in the output shape, IE built by
+        dict_from_document of the out model. Nothing is validated, the dict is meant to be serialized as it is.
+        """
+        return {"items": items, **_skip_paging_fields(len(items), skip, take, request, total_items)}
+
+    @staticmethod
+    def create_dict_from_token(
+        items: list[dict],
+        take: int,
+        next_token: ContinuationToken | None,
+        request: Request,
+        total_items: int | None = None,
+    ) -> dict:
+        """Same as create_from_token, for items already in the output shape. See create_dict."""
+        return {"items": items, **_keyset_paging_fields(len(items), take, next_token, request, total_items)}
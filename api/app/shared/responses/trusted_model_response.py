@@ -0,0 +1,115 @@
+"""
+Response for output models built by the route itself.
+
+When a route returns a model, FastAPI turns it into a dict, validates the dict against response_model and encodes
+it with jsonable_encoder before serializing it. For the out models, that are built from database models by
+from_database_model, all of that is done twice for no reason. TrustedModelResponse serializes the model as it is,
+with orjson. The route keeps response_model, for the OpenAPI schema.
+
+The model has to be fully typed for the output to be the same, IE no field may hold another model type than
+declared, since nothing converts it. Set RESPONSE_VALIDATE_TRUSTED=true to validate the content against the
+response_model of the route anyway, and serialize what FastAPI would, when testing. The route passes its
+response_model to TrustedModelResponse for that.
+"""
+import functools
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.utils import create_response_field
+from pydantic import BaseModel, BaseSettings, Field, ValidationError
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse
+
+
+class ResponseSettings(BaseSettings):
+    validate_trusted: bool = Field(False)
+
+    class Config:
+        env_prefix = "RESPONSE_"
+
+
+@functools.lru_cache(None)
+def get_response_settings() -> ResponseSettings:
+    """The response settings of this process, read from the environment."""
+    return ResponseSettings()
+
+
+def _default(value: Any) -> Any:
+    """Models are serialized through dict, and what orjson doesn't know as FastAPI would."""
+    if isinstance(value, BaseModel):
+        return value.dict()
+    return jsonable_encoder(value)
+
+
+def _response_content(content: Any) -> Any:
+    """content with the models as dicts, as FastAPI prepares it for validation against response_model."""
+    if isinstance(content, BaseModel):
+        return content.dict(by_alias=True)
+    if isinstance(content, (list, tuple)):
+        return [_response_content(item) for item in content]
+    if isinstance(content, dict):
+        return {key: _response_content(value) for key, value in content.items()}
+    return content
+
+
+def validate_trusted(content: Any, response_model: Any) -> Any:
+    """
+    Validates content against the response_model of the route, as FastAPI does. Fields that response_model doesn't
+    declare are left out.
+
+    >>> from app.shared.models.v1.shared import Language
+    >>> class Text(BaseModel):
+    ...     language: Language
+    >>> class TranslatedText(Text):
+    ...     translator: str
+    >>> text = TranslatedText(language=Language.SV, translator="Nisse")
+    >>> validate_trusted([text], list[Text])
+    [Text(language=<Language.SV: 'SV'>)]
+    >>> text.language = "Klingon"
+    >>> validate_trusted(text, Text)
+    Traceback (most recent call last):
+    ...
+    pydantic.error_wrappers.ValidationError: 1 validation error for Text
+    ...
+
+    :param content: Model, list of models or anything else JSON serializable.
+    :param response_model: The response_model of the route.
+    :return: content, validated and created again as response_model.
+    :raise ValidationError: If content is not valid for response_model.
+    """
+    field = create_response_field(name="Response", type_=response_model)
+    value, errors = field.validate(_response_content(content), {}, loc=("response",))
+    if errors:
+        raise ValidationError(errors if isinstance(errors, list) else [errors], field.type_)
+    return value
+
+
+class TrustedModelResponse(JSONResponse):
+    """Serializes an out model, or list of out models, without validating it again. See module."""
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: dict | None = None,
+        background: BackgroundTask | None = None,
+        response_model: Any = None,
+        validate: bool | None = None,
+    ):
+        """
+        :param content: Model, list of models or anything else JSON serializable.
+        :param response_model: The response_model of the route, used when validating.
+        :param validate: Serialize content validated against response_model. Defaults to RESPONSE_VALIDATE_TRUSTED.
+        :raise ValueError: If validating without a response_model.
+        """
+        self._response_model = response_model
+        self._validate = get_response_settings().validate_trusted if validate is None else validate
+        if self._validate and response_model is None:
+            raise ValueError("TrustedModelResponse needs the response_model of the route to validate content.")
+        super().__init__(content, status_code, headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        if self._validate:
+            content = validate_trusted(content, self._response_model)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
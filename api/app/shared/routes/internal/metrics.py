@@ -0,0 +1,66 @@
+"""
+Internal endpoints for monitoring. Not part of the public api, so they are left out of the schema.
+
+The numbers are per process. With several uvicorn workers, every worker has its own pool and metrics, and the
+pid in the response tells which worker answered.
+"""
+import os
+
+from fastapi import APIRouter, Depends, Security
+from fastapi.concurrency import run_in_threadpool
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from app.authentication.dependencies.user import get_current_user
+from app.authentication.models.db.user import User
+from app.database.dependencies.mongo import get_local_mongo_client, get_mongo_settings
+from app.database.mongo.mongo_metrics import MongoMetrics, get_mongo_metrics
+from app.database.mongo.mongo_settings import MongoSettings
+from app.logging.log import AppLogger, AppLoggerInjector, LogPipeline, get_log_pipeline
+from app.shared.errors.errors import ServiceUnavailableError
+
+logger_injector = AppLoggerInjector("internal_metrics_router")
+
+router = APIRouter(prefix="/internal", tags=["Internal"], include_in_schema=False)
+
+
+@router.get("/health")
+async def health(
+    mongo_client: MongoClient = Depends(get_local_mongo_client),
+    logger: AppLogger = Depends(logger_injector),
+) -> dict:
+    """Pings the database. Answers 503 if it can't be reached."""
+    try:
+        await run_in_threadpool(mongo_client.admin.command, "ping")
+    except PyMongoError as err:
+        logger.error("Health check failed to ping database", exception=err)
+        raise ServiceUnavailableError("Database unavailable")
+    return {"status": "ok"}
+
+
+@router.get("/metrics/mongo")
+async def mongo_metrics(
+    authenticated_user: User = Security(get_current_user, scopes=("roles:superuser",)),
+    metrics: MongoMetrics = Depends(get_mongo_metrics),
+    settings: MongoSettings = Depends(get_mongo_settings),
+) -> dict:
+    """Connection pool state, check out wait times and command latencies of this process."""
+    return {
+        **metrics.snapshot(),
+        "settings": {
+            "max_pool_size": settings.max_pool_size,
+            "min_pool_size": settings.min_pool_size,
+            "wait_queue_timeout_ms": settings.wait_queue_timeout_ms,
+            "read_preference": settings.read_preference,
+            "compressors": settings.compressors,
+        },
+    }
+
+
+@router.get("/metrics/logging")
+async def logging_metrics(
+    authenticated_user: User = Security(get_current_user, scopes=("roles:superuser",)),
+    pipeline: LogPipeline = Depends(get_log_pipeline),
+) -> dict:
+    """Records waiting to be written, and records dropped because the log queue was full, in this process."""
+    return {"pid": os.getpid(), **pipeline.stats()}
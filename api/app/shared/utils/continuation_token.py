@@ -0,0 +1,126 @@
+"""
+Module for the ContinuationToken class.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections.abc import Mapping
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from app.shared.errors.errors import InvalidContinuationTokenError
+
+_DATETIME_TAG = "$date"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and _DATETIME_TAG in value:
+        return datetime.fromisoformat(value[_DATETIME_TAG])
+    return value
+
+
+def get_sort_value(item: Any, sort_by: str | None) -> Any:
+    """
+    Gets the value of the field sort_by from item, following the dot notation used in the database queries.
+
+    >>> get_sort_value({"name": {"sv": "Nisse"}}, "name.sv")
+    'Nisse'
+
+    >>> get_sort_value({"name": {}}, "name.sv") is None
+    True
+
+    :param item: Model or dict to read the value from.
+    :param sort_by: Field to read. Nested fields are accessed by the dot '.' operator.
+    :return: The value, or None if the field doesn't exist.
+    """
+    if sort_by is None:
+        return None
+    value = item
+    for key in sort_by.split("."):
+        if value is None:
+            return None
+        if isinstance(value, Mapping):
+            value = value.get(key)
+        else:
+            value = getattr(value, key, None)
+    return value
+
+
+class ContinuationToken:
+    """
+    Position in a sorted listing, used for keyset paging.
+    Holds the id and the value of the sorted field for the last item on a page, and is passed to the client as an
+    opaque string.
+
+    >>> token = ContinuationToken("62e00647e98e01ef28be554b", "name.sv", "Nisse", "desc")
+    >>> ContinuationToken.decode(token.encode()) == token
+    True
+    """
+
+    def __init__(self, last_id: str, sort_by: str | None, last_value: Any, sort_order: str | None):
+        """
+        Creates a continuation token.
+        :param last_id: ID of the last item on the page.
+        :param sort_by: Field the listing is sorted by, if any.
+        :param last_value: Value of sort_by for the last item on the page.
+        :param sort_order: asc or desc.
+        """
+        self.last_id = last_id
+        self.sort_by = sort_by
+        self.last_value = last_value
+        self.sort_order = sort_order
+
+    def __eq__(self, other):
+        if not isinstance(other, ContinuationToken):
+            return False
+        return vars(self) == vars(other)
+
+    def __repr__(self):
+        return (
+            f"ContinuationToken(last_id={self.last_id}, sort_by={self.sort_by}, last_value={self.last_value}, "
+            f"sort_order={self.sort_order})"
+        )
+
+    @classmethod
+    def after_item(cls, item: Any, sort_by: str | None, sort_order: str | None) -> "ContinuationToken":
+        """
+        Creates a token pointing to the position after item.
+        :param item: The last item on the current page. Needs an id.
+        :param sort_by: Field the listing is sorted by, if any.
+        :param sort_order: asc or desc.
+        :return: ContinuationToken.
+        """
+        return cls(get_sort_value(item, "id"), sort_by, get_sort_value(item, sort_by), sort_order)
+
+    def encode(self) -> str:
+        """
+        Encodes the token as url safe string, without base64 padding so it can be used in a query string as it is.
+        :return: The token as str.
+        """
+        data = {"i": self.last_id, "s": self.sort_by, "v": _encode_value(self.last_value), "o": self.sort_order}
+        return urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "ContinuationToken":
+        """
+        Decodes a token created by encode.
+        :param token: The token as str.
+        :return: ContinuationToken.
+        :raise InvalidContinuationTokenError: If the token can't be decoded.
+        """
+        try:
+            data = json.loads(urlsafe_b64decode(token.encode("ascii") + b"=" * (-len(token) % 4)))
+            if data["o"] not in (None, "asc", "desc") or not isinstance(data["s"], str | None):
+                raise ValueError(f"Invalid sorting in continuation token: {data}")
+            return cls(data["i"], data["s"], _decode_value(data["v"]), data["o"])
+        except (BinasciiError, UnicodeError, ValueError, KeyError, TypeError) as err:
+            raise InvalidContinuationTokenError(token) from err
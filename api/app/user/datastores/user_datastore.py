@@ -6,18 +6,22 @@ from datetime import datetime
 import pytz
 from fastapi import Depends, UploadFile
 
-from app.database.abstract.document_database import (
-    DocumentDatabase,
-    DatabaseCollection,
-    Document,
-    BaseDatastore,
+from app.authentication.cache.token_cache import get_token_cache
+from app.database.abstract.async_document_database import (
+    AsyncDocumentDatabase,
+    AsyncDatabaseCollection,
+    AsyncDocument,
+    AsyncBaseDatastore,
 )
+from app.database.abstract.document_database import BulkWriteItemResult, BulkWriteResult
 from app.database.dependencies.document_database import get_document_database
+from app.shared.datastores.change_datastore import ChangeDatastore
 from app.shared.errors.errors import (
     NotFoundError,
 )
 from app.shared.io.file_manager import FileManager, get_file_manager
 from app.shared.models.db.change import Change, ChangeType
+from app.shared.utils.continuation_token import ContinuationToken
 from app.user.errors.duplicate_error import DuplicateError
 from app.user.models.db.user import (
     User,
@@ -25,15 +29,15 @@ from app.user.models.db.user import (
 )
 from app.user.models.v1.user_api_models import UserAdd, UserRegister
 from app.user.datastores.role_datastore import RoleDatastore, get_role_datastore
-from app.shared.cryptography import password_hasher as hasher
+from app.shared.cryptography.hashing_pool import get_hashing_pool
 
 
-class UserDatastore(BaseDatastore):
+class UserDatastore(AsyncBaseDatastore):
     """
     Accesses user database.
     """
 
-    def __init__(self, db: DocumentDatabase, roles: RoleDatastore, file_manager: FileManager):
+    def __init__(self, db: AsyncDocumentDatabase, roles: RoleDatastore, file_manager: FileManager):
         """
         Creates a datastore.
         :param file_manager:
@@ -43,29 +47,47 @@ class UserDatastore(BaseDatastore):
         super().__init__(db)
         self._roles = roles
         self._file_manager = file_manager
+        self._change_log = ChangeDatastore(db)
 
     @property
-    def _users(self) -> DatabaseCollection:
+    def _users(self) -> AsyncDatabaseCollection:
         """
         Accessor for users collection
         :return:
         """
         return self.db.collection("users")
 
-    def get_users(self, take: int, skip: int) -> list[User]:
+    async def get_user_dicts(
+        self,
+        fields: list[str],
+        take: int,
+        skip: int,
+        keyset: bool = False,
+        continuation_token: ContinuationToken | None = None,
+        include_total: bool = False,
+    ) -> tuple[list[dict], int | None]:
         """
-        Get users.
+        Get users, for the listing. The given fields are returned as the plain dicts read from the database, without
+        building User models.
+        :param fields: The fields to read. Ids are always included.
         :param take: Number of users.
-        :param skip: Offset.
-        :return: List of UserDatabaseModel.
+        :param skip: Offset. Ignored when keyset paging.
+        :param keyset: Page by the id of the last user on the previous page instead of skipping.
+        :param continuation_token: Position of the last user on the previous page when keyset paging.
+        :param include_total: Also count all users, in the same round trip.
+        :return: List of user documents, and total number of users if include_total, otherwise None.
         """
-        docs = self._users.get_all().skip(skip).take(take).to_list()
-        result = []
-        for doc in docs:
-            result.append(User(**doc))
-        return result
+        users = self._users.get_all(fields)
+        if keyset or continuation_token is not None:
+            users = users.after(continuation_token.last_id if continuation_token else None)
+        else:
+            users = users.skip(skip)
+        users = users.take(take)
+        if include_total:
+            return await users.to_dicts_with_total()
+        return await users.to_dicts(), None
 
-    def get_users_with_role(self, role_name: str, reference: str | None = None) -> list[User]:
+    async def get_users_with_role(self, role_name: str, reference: str | None = None) -> list[User]:
         """
         Get users with specific role.
         :param role_name: Role name.
@@ -82,60 +104,62 @@ class UserDatastore(BaseDatastore):
             }
         else:
             filters = {"roles.role_name": role_name}
-        docs = self._users.get(filters).to_list()
+        docs = await self._users.get(filters).to_list()
         return [User(**doc) for doc in docs]
 
-    def get_company_users(self, company_id: str) -> list[User]:
+    async def get_company_users(self, company_id: str) -> list[User]:
         """
         Get users with access to specified company.
         :param company_id: ID of company.
         :return: List of UserDatabaseModel.
         """
         filters = {"roles.reference": company_id}
-        docs = self._users.get(filters).to_list()
+        docs = await self._users.get(filters).to_list()
         return [User(**doc) for doc in docs]
 
-    def get_user_by_id(self, user_id: str) -> User:
+    async def get_user_by_id(self, user_id: str) -> User:
         """
         Get user by user id.
         :raise NotFoundError: If no user with id is found
         :param user_id: ID of user.
         :return: UserDatabaseModel.
         """
-        return self._get_user(user_id)
+        return await self._get_user(user_id)
 
-    def add_user(self, user: UserRegister) -> User:
+    async def add_user(self, user: UserRegister) -> User:
         """
         Add new user.
         :raise DuplcateError: If e-mail is already registered.
+        :raise ServiceUnavailableError: If too many passwords are being hashed already.
         :param user: New user model
         :return: UserDatabaseModel for new user.
         """
         user.email = user.email.lower()
-        if self._users.exists({"email": user.email}):
+        if await self._users.exists({"email": user.email}):
             raise DuplicateError("There's already a user registered with this e-mail address")
 
         new_user = UserAdd(
-            password_hash=hasher.hash_password(user.password, hasher.generate_salt()),
+            password_hash=await get_hashing_pool().hash_password(user.password),
             created=datetime.now(pytz.utc),
             **user.dict(),
         )
-        doc = self._users.add(new_user.dict())
+        doc = await self._users.add(new_user.dict())
         return User(**doc)
 
-    def delete_user(self, user_id: str) -> None:
+    async def delete_user(self, user_id: str) -> None:
         """
         Delete user.
         :raise NotFoundError: If user with id doesn't exist.
         :param user_id: ID of user.
         :return: None.
         """
-        doc: Document = self._users.by_id(user_id)
+        doc: AsyncDocument = await self._users.by_id(user_id)
         if doc is None:
             raise NotFoundError(f"No user with id '{user_id}' was found")
-        doc.delete()
+        await doc.delete()
+        get_token_cache().invalidate_user(user_id)
 
-    def get_user_roles(
+    async def get_user_roles(
         self,
         user_id: str,
     ) -> list[UserRole]:
@@ -144,10 +168,10 @@ class UserDatastore(BaseDatastore):
         :param user_id: ID of user.
         :return: List of UserRoleDatabaseModel for user.
         """
-        user = self._get_user(user_id)
+        user = await self._get_user(user_id)
         return user.roles
 
-    def add_role_to_user(
+    async def add_role_to_user(
         self,
         authenticated_user: User,
         user_id: str,
@@ -166,38 +190,100 @@ class UserDatastore(BaseDatastore):
 
         :return: Updated UserDatabaseModel.
         """
-        role = self._roles.get_role(role_name)
+        role = await self._roles.get_role(role_name)
         user_role = UserRole.create(self.db.new_id(), role, reference).dict()
         change = Change.create(self.db.new_id(), "roles", ChangeType.add, authenticated_user.email, user_role)
         update_context = self.db.update_context()
         update_context.push_to_list("roles", user_role)
-        update_context.push_to_list("changes", change.dict())
-        self._users.update_document(user_id, update_context)
-        return self.get_user_by_id(user_id)
+        await self._users.update_document(user_id, update_context)
+        get_token_cache().invalidate_user(user_id)
+        await self._change_log.add_change("users", user_id, change)
+        return await self.get_user_by_id(user_id)
+
+    async def add_role_to_users(
+        self,
+        authenticated_user: User,
+        user_ids: list[str],
+        role_name: str,
+        reference: str | None = None,
+    ) -> BulkWriteResult:
+        """
+        Add role to several users with one bulk write.
+
+        :param authenticated_user: User performing the operation.
+        :param user_ids: IDs of the users the role is getting added to.
+        :param role_name: Name of role to add.
+        :param reference: Reference if role requires it.
+
+        :return: BulkWriteResult with one item per user id, in the order of user_ids with duplicates removed.
+            Users that don't exist, and ids that aren't valid ids, are reported as failed items.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        valid_ids = [user_id for user_id in user_ids if self.db.is_valid_id(user_id)]
+        role = await self._roles.get_role(role_name)
+        existing_ids = set()
+        if valid_ids:
+            existing_ids = {doc.id for doc in await self._users.get({"id": {"$in": valid_ids}}, ["_id"]).to_list()}
+        operations = self.db.bulk_operations()
+        changes = []
+        for user_id in user_ids:
+            if user_id not in existing_ids:
+                continue
+            user_role = UserRole.create(self.db.new_id(), role, reference).dict()
+            update_context = self.db.update_context()
+            update_context.push_to_list("roles", user_role)
+            operations.update(user_id, update_context)
+            changes.append(
+                (user_id, Change.create(self.db.new_id(), "roles", ChangeType.add, authenticated_user.email, user_role))
+            )
+
+        result = await self._users.bulk_write(operations, ordered=False)
+        token_cache = get_token_cache()
+        for user_id in existing_ids:
+            token_cache.invalidate_user(user_id)
+        written = iter(zip(result.items, changes))
+        items = []
+        succeeded = []
+        for index, user_id in enumerate(user_ids):
+            if user_id not in existing_ids:
+                items.append(
+                    BulkWriteItemResult(
+                        index=index, operation="update", doc_id=user_id, ok=False, error="User not found."
+                    )
+                )
+                continue
+            item, change = next(written)
+            items.append(item.copy(update={"index": index}))
+            if item.ok:
+                succeeded.append(change)
+        if succeeded:
+            await self._change_log.add_entity_changes("users", succeeded)
+        return result.copy(update={"items": items})
 
     async def save_profile_picture(self, user_id: str, file: UploadFile, authenticated_user: User) -> str:
         """Saves user profile picture to file storage and updates profile picture url."""
-        self._ensure_user_exists(user_id)
+        await self._ensure_user_exists(user_id)
         file_url = await self._file_manager.save_user_profile_picture(user_id, file)
         update_context = self.db.update_context()
         update_context.set_values({"profile_picture_url": file_url})
-        update_context.push_to_list(
-            "changes",
+        await self._users.update_document(user_id, update_context)
+        await self._change_log.add_change(
+            "users",
+            user_id,
             Change.create(
                 self.db.new_id(), "profile_picture_url", ChangeType.update, authenticated_user.email, file_url
-            ).dict(),
+            ),
         )
-        self._users.update_document(user_id, update_context)
         return file_url
 
-    def _get_user(self, user_id: str) -> User:
-        user_document = self._users.by_id(user_id)
+    async def _get_user(self, user_id: str) -> User:
+        user_document = await self._users.by_id(user_id)
         if user_document is None:
             raise NotFoundError(f"User '{user_id}' not found")
         return User(**user_document)
 
-    def _ensure_user_exists(self, user_id: str):
-        if not self._users.exists({"id": user_id}):
+    async def _ensure_user_exists(self, user_id: str):
+        if not await self._users.exists({"id": user_id}):
             raise NotFoundError(f"User '{user_id}' not found")
 
     def get_profile_picture_physical_path(self, image_file_name: str) -> str:
@@ -205,7 +291,7 @@ class UserDatastore(BaseDatastore):
 
 
 def get_user_datastore(
-    db: DocumentDatabase = Depends(get_document_database),
+    db: AsyncDocumentDatabase = Depends(get_document_database),
     roles: RoleDatastore = Depends(get_role_datastore),
     file_manager: FileManager = Depends(get_file_manager),
 ) -> UserDatastore:
@@ -1,6 +1,7 @@
 """
 Api model classes for user.
 """
+from collections.abc import Iterable
 from datetime import datetime
 
 from fastapi import Request, APIRouter
@@ -81,6 +82,32 @@ class UserOutModel(User, BaseOutModel):
             instance.profile_picture_url = None
         return instance
 
+    @classmethod
+    def document_fields(cls) -> list[str]:
+        """The fields to read from the user documents for dict_from_document. The password hash is never read."""
+        return [field for field in cls.__fields__ if field not in BaseOutModel.__fields__ and field != "id"]
+
+    @classmethod
+    def dict_from_document(cls, doc: dict, request: Request, router: APIRouter, language: Language) -> dict:
+        """
+        Creates the output of from_database_model as a plain dict, from a user document read with document_fields,
+        for the read only listing. No model is built or validated. The fields and their defaults are taken from the
+        model, only the url, the roles and the profile picture url are set here, as in from_database_model.
+        """
+        out = {
+            "operations": [],
+            "url": get_current_request_url_with_additions(request, (doc["id"],), include_query=False),
+            **_document_values(cls, doc, exclude=BaseOutModel.__fields__),
+        }
+        out["roles"] = [_document_values(UserRoleOutModel, role) for role in out["roles"]]
+        out["profile_picture_url"] = assemble_profile_picture_url(request, router, out["profile_picture_url"], language)
+        return out
+
+
+def _document_values(model: type[BaseModel], doc: dict, exclude: Iterable[str] = ()) -> dict:
+    """The values of the fields of model in doc, in the order of the model, with its defaults for missing fields."""
+    return {name: doc.get(name, field.get_default()) for name, field in model.__fields__.items() if name not in exclude}
+
 
 class UserRegister(User):
     """API model when adding new user via user registration."""
@@ -23,8 +23,8 @@ async def get_roles(
     logger: AppLogger = Depends(logger_injector),
 ) -> list[RoleOutModel]:
     """Gets a list of all roles."""
-    logger.debug(f"Incoming={get_url(request)}: user={user}")
-    role_datastore = role_datastore.get_roles()
+    logger.debug(lambda: f"Incoming={get_url(request)}: user={user}")
+    role_datastore = await role_datastore.get_roles()
     items = []
     for role in role_datastore:
         items.append(RoleOutModel(**role.dict()))
@@ -41,5 +41,5 @@ async def add_role(
     Adds new role.
     Only accessible to superusers.
     """
-    role = roles_datastore.add_role(body, user)
+    role = await roles_datastore.add_role(body, user)
     return RoleOutModel(**role.dict())
@@ -10,6 +10,7 @@ from app.user.datastores.user_datastore import UserDatastore, get_user_datastore
 from app.user.models.v1.user_api_models import UserOutModel, UserRoleOutModel
 from app.user.models.db.user import User
 from app.shared.utils.request_utils import get_url
+from app.shared.responses.trusted_model_response import TrustedModelResponse
 
 logger_injector = AppLoggerInjector("user_roles_router")
 
@@ -25,18 +26,21 @@ async def get_user_roles(
     logger: AppLogger = Depends(logger_injector),
 ) -> list[UserRoleOutModel]:
     """Get roles on user."""
-    logger.debug(f"Incoming={get_url(request)}: user_id={user_id}, user={user}")
-    return [UserRoleOutModel(**role.dict()) for role in user_datastore.get_user_roles(user_id)]
+    logger.debug(lambda: f"Incoming={get_url(request)}: user_id={user_id}, user={user}")
+    return [UserRoleOutModel(**role.dict()) for role in await user_datastore.get_user_roles(user_id)]
 
 
-@router.post("/{role_name}", response_model=UserOutModel)
+@router.post("/{role_name}", response_model=UserOutModel, response_class=TrustedModelResponse)
 async def add_role_to_user(
     user_datastore: UserDatastore = Depends(get_user_datastore),
     user_id: str = Path(...),
     role_name: str = Path(...),
     user: User = Security(get_current_user, scopes=("roles:superuser",)),
     essentials: Essentials = Depends(get_essentials),
-) -> UserOutModel:
+) -> TrustedModelResponse:
     """Adds a role to a user."""
-    updated_user = user_datastore.add_role_to_user(user, user_id, role_name)
-    return UserOutModel.from_database_model(updated_user, essentials.request, router, essentials.language)
+    updated_user = await user_datastore.add_role_to_user(user, user_id, role_name)
+    return TrustedModelResponse(
+        UserOutModel.from_database_model(updated_user, essentials.request, router, essentials.language),
+        response_model=UserOutModel,
+    )
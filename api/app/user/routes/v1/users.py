@@ -2,67 +2,119 @@
 Routing for users endpoint.
 """
 from fastapi import APIRouter, Depends, Body, Query, Request, Security, Path, UploadFile, File, status
-from fastapi.responses import PlainTextResponse, FileResponse
+from fastapi.responses import PlainTextResponse, FileResponse, ORJSONResponse
 
+from app.company.models.v1.paging_information import PagingInformation, get_paging_information
 from app.user.datastores.user_datastore import UserDatastore, get_user_datastore
 from app.shared.dependencies.essentials import Essentials, get_essentials
 from app.logging.log import AppLogger, AppLoggerInjector
 from app.authentication.dependencies.user import get_current_user
 from app.authentication.models.db.user import User
+from app.shared.datastores.change_datastore import ChangeDatastore, get_change_datastore
+from app.shared.models.db.change import Change
 from app.shared.models.v1.paging_response_model import PagingResponseModel
 from app.user.models.v1.user_api_models import UserRegister, UserOutModel
+from app.shared.utils.continuation_token import ContinuationToken
 from app.shared.utils.request_utils import get_url
 from app.shared.utils.url_utils import assemble_profile_picture_url
+from app.shared.responses.trusted_model_response import TrustedModelResponse
 
 logger_injector = AppLoggerInjector("users.router")
 
 router = APIRouter(prefix="/v1/{lang}/users", tags=["Users"])
 
 
-@router.post("/register", response_model=UserOutModel)
+@router.post("/register", response_model=UserOutModel, response_class=TrustedModelResponse)
 async def register(
     request: Request,
     user_datastore: UserDatastore = Depends(get_user_datastore),
     body: UserRegister = Body(...),
     essentials: Essentials = Depends(get_essentials),
-) -> UserOutModel:
+) -> TrustedModelResponse:
     """
     Register new user.
     """
-    user = user_datastore.add_user(body)
-    return UserOutModel.from_database_model(user, request, router, essentials.language)
+    user = await user_datastore.add_user(body)
+    return TrustedModelResponse(
+        UserOutModel.from_database_model(user, request, router, essentials.language), response_model=UserOutModel
+    )
 
 
-@router.get("/", response_model=PagingResponseModel[UserOutModel])
+@router.get("/", response_model=PagingResponseModel[UserOutModel], response_class=ORJSONResponse)
 async def get_users(
     user_datastore: UserDatastore = Depends(get_user_datastore),
-    take: int = Query(20),
-    skip: int = Query(0),
+    paging_information: PagingInformation = Depends(get_paging_information),
     authenticated_user: User = Security(get_current_user, scopes=("roles:superuser",)),
     logger: AppLogger = Depends(logger_injector),
     essentials: Essentials = Depends(get_essentials),
-) -> PagingResponseModel[UserOutModel]:
-    """Get list of users wrapped in a paging response object."""
-    logger.debug(f"Incoming={get_url(essentials.request)}: take={take}, skip={skip}, user={authenticated_user}")
-    all_users = user_datastore.get_users(take, skip)
-    items: list[UserOutModel] = []
-    for usr in all_users:
-        items.append(UserOutModel.from_database_model(usr, essentials.request, router, essentials.language))
-    return PagingResponseModel[UserOutModel].create(items, skip, take, essentials.request)
+) -> ORJSONResponse:
+    """
+    Get list of users wrapped in a paging response object.
+    Read only fast path, see get_companies.
+    """
+    logger.debug(
+        lambda: f"Incoming={get_url(essentials.request)}: paging_information={paging_information}, "
+        f"user={authenticated_user}"
+    )
+    all_users, total = await user_datastore.get_user_dicts(
+        UserOutModel.document_fields(),
+        paging_information.take,
+        paging_information.skip,
+        paging_information.keyset,
+        paging_information.continuation_token,
+        paging_information.include_total,
+    )
+    items = [UserOutModel.dict_from_document(usr, essentials.request, router, essentials.language) for usr in all_users]
+    if paging_information.keyset:
+        next_token = ContinuationToken.after_item(all_users[-1], None, "asc") if all_users else None
+        return ORJSONResponse(
+            PagingResponseModel.create_dict_from_token(
+                items, paging_information.take, next_token, essentials.request, total
+            )
+        )
+    return ORJSONResponse(
+        PagingResponseModel.create_dict(
+            items, paging_information.skip, paging_information.take, essentials.request, total
+        )
+    )
 
 
-@router.get("/{user_id}", response_model=UserOutModel)
+@router.get("/{user_id}", response_model=UserOutModel, response_class=TrustedModelResponse)
 async def get_user(
     user_id: str = Path(...),
     user_datastore: UserDatastore = Depends(get_user_datastore),
     authenticated_user: User = Security(get_current_user, scopes=("roles:superuser", "self:{user_id}")),
     essentials: Essentials = Depends(get_essentials),
     logger: AppLogger = Depends(logger_injector),
-) -> UserOutModel:
+) -> TrustedModelResponse:
     """Get user by id."""
-    logger.debug(f"Incoming={get_url(essentials.request)}: user_id={user_id}, authenticated_user={authenticated_user}")
-    user = user_datastore.get_user_by_id(user_id)
-    return UserOutModel.from_database_model(user, essentials.request, router, essentials.language)
+    logger.debug(
+        lambda: f"Incoming={get_url(essentials.request)}: user_id={user_id}, authenticated_user={authenticated_user}"
+    )
+    user = await user_datastore.get_user_by_id(user_id)
+    return TrustedModelResponse(
+        UserOutModel.from_database_model(user, essentials.request, router, essentials.language),
+        response_model=UserOutModel,
+    )
+
+
+@router.get("/{user_id}/changes", response_model=PagingResponseModel[Change])
+async def get_user_changes(
+    user_id: str = Path(...),
+    change_datastore: ChangeDatastore = Depends(get_change_datastore),
+    paging_information: PagingInformation = Depends(get_paging_information),
+    authenticated_user: User = Security(get_current_user, scopes=("roles:superuser", "self:{user_id}")),
+    essentials: Essentials = Depends(get_essentials),
+    logger: AppLogger = Depends(logger_injector),
+) -> PagingResponseModel[Change]:
+    """Get the change log of a user, oldest first."""
+    logger.debug(
+        lambda: f"Incoming={get_url(essentials.request)}: user_id={user_id}, authenticated_user={authenticated_user}"
+    )
+    changes = await change_datastore.get_changes(user_id, paging_information.skip, paging_information.take)
+    return PagingResponseModel[Change].create(
+        changes, paging_information.skip, paging_information.take, essentials.request
+    )
 
 
 @router.delete(
@@ -78,8 +130,8 @@ async def delete_user(
     logger: AppLogger = Depends(logger_injector),
 ) -> None:
     """Delete a user."""
-    logger.debug(f"Incoming={get_url(request)}: user_id={user_id}, user={user}")
-    user_datastore.delete_user(user_id)
+    logger.debug(lambda: f"Incoming={get_url(request)}: user_id={user_id}, user={user}")
+    await user_datastore.delete_user(user_id)
 
 
 @router.post("/{user_id}/profile-pictures", response_class=PlainTextResponse)
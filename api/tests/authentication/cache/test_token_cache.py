@@ -0,0 +1,85 @@
+import asyncio
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.authentication.cache import token_cache as token_cache_module
+from app.authentication.cache.token_cache import TokenCache
+from app.authentication.datastores.authentication_datastore import AuthenticationDatastore
+from app.authentication.dependencies.user import _resolve_token
+from app.authentication.models.v1.token import TokenData
+from app.authentication.routes.v1.token import create_access_token
+
+
+@pytest.fixture
+def token_data():
+    return TokenData(sub="nisse@perssons.se", verified=True)
+
+
+def test_get_returns_cached_token_until_it_expires(token_data, authenticated_user_default):
+    target = TokenCache(10, 60)
+    target.put("token", token_data, authenticated_user_default, time.time() + 30)
+    target.put("expired", token_data, authenticated_user_default, time.time() - 1)
+
+    assert target.get("token").user is authenticated_user_default
+    assert target.get("expired") is None
+    assert target.get("unknown") is None
+    assert len(target) == 1
+
+
+def test_entries_are_kept_at_most_max_ttl(monkeypatch, token_data, authenticated_user_default):
+    target = TokenCache(10, 5)
+    target.put("token", token_data, authenticated_user_default, time.time() + 3600)
+
+    now = time.time()
+    monkeypatch.setattr(token_cache_module.time, "time", lambda: now + 6)
+
+    assert target.get("token") is None
+
+
+def test_least_recently_used_is_evicted_when_full(token_data, authenticated_user_default):
+    target = TokenCache(2, 60)
+    exp = time.time() + 30
+    target.put("a", token_data, authenticated_user_default, exp)
+    target.put("b", token_data, authenticated_user_default, exp)
+    target.get("a")
+    target.put("c", token_data, authenticated_user_default, exp)
+
+    assert target.get("b") is None
+    assert target.get("a") is not None
+    assert target.get("c") is not None
+
+
+def test_invalidate_user_removes_all_tokens_of_user(token_data, authenticated_user_default):
+    target = TokenCache(10, 60)
+    other_user = authenticated_user_default.copy(update={"id": "other"})
+    exp = time.time() + 30
+    target.put("a", token_data, authenticated_user_default, exp)
+    target.put("b", token_data, authenticated_user_default, exp)
+    target.put("c", token_data, other_user, exp)
+
+    target.invalidate_user(authenticated_user_default.id)
+
+    assert target.get("a") is None
+    assert target.get("b") is None
+    assert target.get("c").user is other_user
+
+
+def test_resolve_token_reads_user_once_per_token(monkeypatch, authenticated_user_default):
+    monkeypatch.setattr("app.authentication.dependencies.user.get_token_cache", Mock(return_value=TokenCache(10, 60)))
+    token = create_access_token({"sub": "nisse@perssons.se", "verified": True}, timedelta(minutes=5))
+    datastore = Mock(AuthenticationDatastore)
+    datastore.get_user = AsyncMock(return_value=authenticated_user_default)
+
+    async def resolve_twice():
+        first = await _resolve_token(token, datastore, "Bearer")
+        second = await _resolve_token(token, datastore, "Bearer")
+        return first, second
+
+    (first_data, first_user), (second_data, second_user) = asyncio.run(resolve_twice())
+
+    datastore.get_user.assert_called_once_with("nisse@perssons.se")
+    assert first_user is second_user
+    assert first_data == second_data
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.authentication.datastores.authentication_datastore import AuthenticationDatastore
+from app.authentication.errors.invalid_username_or_password_error import InvalidUsernameOrPasswordError
+from app.database.mongo.mongo_document_database import MongoDBUpdateContext
+from app.shared.cryptography import password_hasher
+from app.shared.cryptography.password_hasher import PasswordHashPolicy
+from tests.fixtures.mongo_document_database_fixtures import get_async_document
+
+LEGACY_HASH = "1OBCLoBuoHI9JCC662fmmxiLAXsOz8xbrBlsQzQ92TIWesr8knPRbL4waA0RKMABsurKCFdJrE3BI-cnAoo3sHNhbHQ="
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    policy = PasswordHashPolicy(pbkdf2_iterations=1000)
+    monkeypatch.setattr(password_hasher, "get_password_hash_policy", lambda: policy)
+    return policy
+
+
+def _user_doc(password_hash: str) -> dict:
+    return {
+        "_id": ObjectId(),
+        "email": "nisse@perssons.se",
+        "password_hash": password_hash,
+        "verified": True,
+        "firstname": "Nisse",
+        "lastname": "Persson",
+        "roles": [],
+    }
+
+
+def test_authenticate_user_rehashes_legacy_hash(doc_database_collection_mocks, logger, policy):
+    db, collection = doc_database_collection_mocks
+    db.update_context.side_effect = MongoDBUpdateContext
+    collection.by_key.return_value = get_async_document(_user_doc(LEGACY_HASH), collection)
+
+    target = AuthenticationDatastore(db, logger)
+    user = asyncio.run(target.authenticate_user("nisse@perssons.se", "Password"))
+
+    collection.update_document.assert_called_once()
+    new_hash = collection.update_document.call_args.args[1].to_implementation_specific_update_syntax()["$set"][
+        "password_hash"
+    ]
+    assert new_hash.startswith("$pbkdf2-sha512$i=1000$")
+    assert user.password_hash == new_hash
+    assert password_hasher.is_correct_password("Password", new_hash)
+    assert not password_hasher.needs_rehash(new_hash, policy)
+
+
+def test_authenticate_user_keeps_hash_made_with_current_policy(doc_database_collection_mocks, logger, policy):
+    db, collection = doc_database_collection_mocks
+    current_hash = password_hasher.hash_password("Password", password_hasher.generate_salt(), policy)
+    collection.by_key.return_value = get_async_document(_user_doc(current_hash), collection)
+
+    target = AuthenticationDatastore(db, logger)
+    asyncio.run(target.authenticate_user("nisse@perssons.se", "Password"))
+
+    collection.update_document.assert_not_called()
+
+
+def test_authenticate_user_wrong_password_does_not_rehash(doc_database_collection_mocks, logger, policy):
+    db, collection = doc_database_collection_mocks
+    collection.by_key.return_value = get_async_document(_user_doc(LEGACY_HASH), collection)
+
+    target = AuthenticationDatastore(db, logger)
+    with pytest.raises(InvalidUsernameOrPasswordError):
+        asyncio.run(target.authenticate_user("nisse@perssons.se", "WrongPassword"))
+
+    collection.update_document.assert_not_called()
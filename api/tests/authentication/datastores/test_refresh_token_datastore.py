@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from pytz import utc
+
+from app.authentication.datastores.refresh_token_datastore import (
+    RefreshTokenDatastore,
+    RefreshTokenSettings,
+    hash_refresh_token,
+)
+from app.authentication.errors.invalid_refresh_token_error import InvalidRefreshTokenError
+from app.database.mongo.mongo_document_database import MongoDBUpdateContext
+from tests.fixtures.mongo_document_database_fixtures import get_async_document
+
+
+@pytest.fixture
+def target(doc_database_collection_mocks, logger):
+    db, _ = doc_database_collection_mocks
+    db.update_context.side_effect = MongoDBUpdateContext
+    return RefreshTokenDatastore(db, logger, RefreshTokenSettings(expire_days=14, max_lifetime_days=90))
+
+
+def _session_doc(token_hash: str, previous_token_hashes: list[str] | None = None, revoked: bool = False) -> dict:
+    now = datetime.now(utc)
+    return {
+        "_id": ObjectId(),
+        "user_id": "62c6e10d6ed4a1a4a3a8b0a1",
+        "scopes": ["roles"],
+        "token_hash": token_hash,
+        "previous_token_hashes": previous_token_hashes or [],
+        "created_at": now,
+        "expires_at": now + timedelta(days=14),
+        "absolute_expires_at": now + timedelta(days=90),
+        "revoked": revoked,
+    }
+
+
+def test_create_session_stores_hash_only(target, doc_database_collection_mocks):
+    _, collection = doc_database_collection_mocks
+
+    refresh_token = asyncio.run(target.create_session("62c6e10d6ed4a1a4a3a8b0a1", ["roles"]))
+
+    doc = collection.add.call_args.args[0]
+    assert doc["token_hash"] == hash_refresh_token(refresh_token)
+    assert refresh_token not in doc.values()
+    assert doc["scopes"] == ["roles"]
+    assert doc["expires_at"] - doc["created_at"] == timedelta(days=14)
+    assert doc["absolute_expires_at"] - doc["created_at"] == timedelta(days=90)
+
+
+def test_rotate_replaces_token_and_keeps_previous_hash(target, doc_database_collection_mocks):
+    _, collection = doc_database_collection_mocks
+    old_hash = hash_refresh_token("old")
+    doc = _session_doc(old_hash)
+    collection.by_key.return_value = get_async_document(doc, collection)
+    collection.find_one_and_update.return_value = get_async_document(doc, collection)
+
+    new_refresh_token, session = asyncio.run(target.rotate("old"))
+
+    doc_id, update_context = collection.find_one_and_update.call_args.args[:2]
+    updates = update_context.to_implementation_specific_update_syntax()["$set"]
+    assert doc_id == str(doc["_id"])
+    assert collection.find_one_and_update.call_args.kwargs["filters"]["token_hash"] == old_hash
+    assert updates["token_hash"] == hash_refresh_token(new_refresh_token)
+    assert updates["previous_token_hashes"] == [old_hash]
+    assert session.user_id == "62c6e10d6ed4a1a4a3a8b0a1"
+    assert session.scopes == ["roles"]
+
+
+def test_rotate_fails_if_session_changed_since_read(target, doc_database_collection_mocks):
+    _, collection = doc_database_collection_mocks
+    collection.by_key.return_value = get_async_document(_session_doc(hash_refresh_token("old")), collection)
+    collection.find_one_and_update.return_value = None
+
+    with pytest.raises(InvalidRefreshTokenError):
+        asyncio.run(target.rotate("old"))
+
+
+def test_reused_refresh_token_revokes_session(target, doc_database_collection_mocks):
+    _, collection = doc_database_collection_mocks
+    doc = _session_doc(hash_refresh_token("new"), [hash_refresh_token("old")])
+    collection.by_key.side_effect = [None, get_async_document(doc, collection)]
+
+    with pytest.raises(InvalidRefreshTokenError):
+        asyncio.run(target.rotate("old"))
+
+    assert collection.by_key.call_args.args[:2] == ("previous_token_hashes", hash_refresh_token("old"))
+    collection.patch_document.assert_called_once_with(str(doc["_id"]), {"revoked": True})
+    collection.find_one_and_update.assert_not_called()
+
+
+def test_unknown_refresh_token_is_rejected(target, doc_database_collection_mocks):
+    _, collection = doc_database_collection_mocks
+    collection.by_key.return_value = None
+
+    with pytest.raises(InvalidRefreshTokenError):
+        asyncio.run(target.rotate("unknown"))
+
+    collection.patch_document.assert_not_called()
+
+
+def test_revoke(target, doc_database_collection_mocks):
+    _, collection = doc_database_collection_mocks
+    doc = _session_doc(hash_refresh_token("current"))
+    collection.by_key.return_value = get_async_document(doc, collection)
+
+    asyncio.run(target.revoke("current"))
+
+    collection.patch_document.assert_called_once_with(str(doc["_id"]), {"revoked": True})
@@ -0,0 +1,45 @@
+from app.authentication.models.db.user import User
+
+
+def _user_doc(roles: list[dict]) -> dict:
+    return {
+        "id": "62c6e10d6ed4a1a4a3a8b0a1",
+        "password_hash": "hash",
+        "email": "nisse@perssons.se",
+        "verified": True,
+        "firstname": "Nisse",
+        "lastname": "Persson",
+        "roles": roles,
+    }
+
+
+def test_create_indexes_roles():
+    user = User.create(
+        _user_doc(
+            [
+                {"role_name": "company_admin", "reference": "1"},
+                {"role_name": "company_admin", "reference": "2"},
+                {"role_name": "verified"},
+            ]
+        )
+    )
+
+    assert not user.is_superuser()
+    assert user.has_role("company_admin", "1")
+    assert user.has_role("company_admin", "2")
+    assert not user.has_role("company_admin", "3")
+    assert user.has_role("company_admin", None)
+    assert user.has_role("verified", None)
+    assert not user.has_role("superuser", None)
+    assert user.get_role_refs("company_admin") == {"1", "2"}
+    assert sorted(user.get_roles("company_admin")) == ["company_admin:1", "company_admin:2"]
+    assert user.get_roles("verified") == ["verified"]
+
+
+def test_index_follows_roles_on_copy(authenticated_user_default):
+    assert not authenticated_user_default.is_superuser()
+
+    superuser = authenticated_user_default.copy(update={"roles": ["superuser"]})
+
+    assert superuser.is_superuser()
+    assert not authenticated_user_default.is_superuser()
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import APIRouter, HTTPException, Security
+
+from app.authentication.dependencies.user import compile_route_scopes, get_current_user
+from app.authentication.errors.claim_type_not_supported_error import ClaimTypeNotSupportedError
+from app.authentication.models.v1.token import TokenData
+from app.authentication.oauth2.scope_rules import compile_scopes
+from app.shared.errors.errors import InvalidOperationError
+
+
+def test_compile_scopes_is_done_once_per_set_of_scopes():
+    scopes = ("roles:company_admin:{company_id}", "roles:company_member:{company_id}")
+
+    assert compile_scopes(scopes) is compile_scopes(scopes)
+
+
+@pytest.mark.parametrize(
+    ("scopes", "error"),
+    [
+        (("roles",), HTTPException),
+        (("roles:a:b:c",), HTTPException),
+        (("admin:true",), ClaimTypeNotSupportedError),
+        (("self:*",), InvalidOperationError),
+    ],
+)
+def test_compile_scopes_rejects_invalid_scopes(scopes, error):
+    with pytest.raises(error):
+        compile_scopes(scopes)
+
+
+def test_rules_resolve_references_from_path_params():
+    rules = compile_scopes(("roles:company_admin:{company_id}", "self:{user_id}"))
+    token = TokenData(sub="nisse@perssons.se", roles=["company_admin:1"])
+
+    assert rules.user_has_required_roles(token, {"company_id": "1", "user_id": "x"}, "user")
+    assert not rules.user_has_required_roles(token, {"company_id": "2", "user_id": "x"}, "user")
+    assert rules.user_has_required_roles(token, {"company_id": "2", "user_id": "user"}, "user")
+
+
+def test_compile_route_scopes_compiles_scopes_of_secured_routes():
+    router = APIRouter()
+
+    @router.get("/{company_id}")
+    def secured(user=Security(get_current_user, scopes=("roles:company_admin:{company_id}", "verified:True"))):
+        return user
+
+    @router.get("/")
+    def unsecured():
+        return None
+
+    assert compile_route_scopes(router.routes) == 1
+    assert compile_scopes(("roles:company_admin:{company_id}", "verified:True")).verified is True
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+from Crypto.PublicKey import ECC, RSA
+from jose import JWTError
+
+from app.authentication.oauth2 import signing_keys
+from app.authentication.oauth2.signing_keys import ES256, KeySet, SigningKeySettings, SigningKeyStore, generate_key
+from app.shared.errors.errors import InvalidOperationError
+
+
+def _write_ec_key(keys_dir, kid: str) -> ECC.EccKey:
+    key = ECC.generate(curve="P-256")
+    (keys_dir / f"{kid}.pem").write_text(key.export_key(format="PEM"))
+    return key
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return SigningKeySettings(keys_dir=str(tmp_path), reload_interval_seconds=0)
+
+
+def test_rs256_key_from_file_signs_and_verifies(tmp_path, settings, logger):
+    (tmp_path / "2026-01.pem").write_bytes(RSA.generate(2048).export_key())
+    key_set = SigningKeyStore(settings, logger).key_set()
+
+    token = key_set.encode({"sub": "nisse@perssons.se"})
+
+    assert key_set.decode(token) == {"sub": "nisse@perssons.se"}
+    assert key_set.get("2026-01").algorithm == "RS256"
+    assert key_set.jwks()["keys"][0]["kid"] == "2026-01"
+    assert "d" not in key_set.jwks()["keys"][0]
+
+
+def test_public_keys_only_verify(tmp_path, settings, logger):
+    private_key = _write_ec_key(tmp_path, "2026-01")
+    issuer = SigningKeyStore(settings, logger).key_set()
+    token = issuer.encode({"sub": "nisse@perssons.se"})
+    verifier_dir = tmp_path / "verifier"
+    verifier_dir.mkdir()
+    (verifier_dir / "2026-01.pem").write_text(private_key.public_key().export_key(format="PEM"))
+
+    verifier = SigningKeyStore(SigningKeySettings(keys_dir=str(verifier_dir)), logger).key_set()
+
+    assert verifier.decode(token) == {"sub": "nisse@perssons.se"}
+    assert verifier.active_kid is None
+    with pytest.raises(InvalidOperationError):
+        verifier.encode({"sub": "nisse@perssons.se"})
+
+
+def test_rotation_keeps_old_key_for_verification(tmp_path, settings, logger):
+    _write_ec_key(tmp_path, "2026-01")
+    store = SigningKeyStore(settings, logger)
+    old_token = store.key_set().encode({"sub": "nisse@perssons.se"})
+
+    _write_ec_key(tmp_path, "2026-02")
+
+    key_set = store.key_set()
+    assert key_set.active_kid == "2026-02"
+    assert key_set.decode(old_token) == {"sub": "nisse@perssons.se"}
+
+    os.remove(tmp_path / "2026-01.pem")
+
+    with pytest.raises(JWTError):
+        store.key_set().decode(old_token)
+
+
+def test_unchanged_files_are_not_parsed_again(tmp_path, settings, logger, monkeypatch):
+    _write_ec_key(tmp_path, "2026-01")
+    store = SigningKeyStore(settings, logger)
+    parsed = []
+    parse_key = signing_keys.parse_key
+    monkeypatch.setattr(signing_keys, "parse_key", lambda kid, pem: parsed.append(kid) or parse_key(kid, pem))
+
+    store.key_set()
+    _write_ec_key(tmp_path, "2026-02")
+    store.key_set()
+    store.key_set()
+
+    assert parsed == ["2026-02"]
+
+
+def test_failed_reload_keeps_previous_keys(tmp_path, settings, logger):
+    _write_ec_key(tmp_path, "2026-01")
+    store = SigningKeyStore(settings, logger)
+
+    (tmp_path / "2026-02.pem").write_text("not a key")
+
+    assert store.key_set().active_kid == "2026-01"
+
+
+def test_token_with_unknown_kid_is_rejected():
+    token = KeySet([generate_key("a", ES256)]).encode({"sub": "nisse@perssons.se"})
+
+    with pytest.raises(JWTError):
+        KeySet([generate_key("b", ES256)]).decode(token)
+
+
+def test_active_kid_has_to_be_private_key():
+    with pytest.raises(InvalidOperationError):
+        KeySet([generate_key("a", ES256)], active_kid="b")
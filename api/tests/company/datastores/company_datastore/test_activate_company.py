@@ -1,9 +1,10 @@
+import asyncio
 from unittest.mock import Mock, ANY
 
 from app.company.datastores.company_datastore import CompanyDatastore
 from app.company.models.shared.enums import CompanyStatus
 from app.database.abstract.document_database import DocumentDatabaseUpdateContext
-from app.database.mongo.mongo_document_database import MongoDocument
+from tests.fixtures.mongo_document_database_fixtures import get_async_document
 
 
 def test_activate_company(
@@ -17,15 +18,18 @@ def test_activate_company(
 ):
     db, collection = doc_database_collection_mocks
     company_id, company_doc = fake_company_data
-    collection.by_id.return_value = MongoDocument(company_doc, collection)
+    collection.by_id.return_value = get_async_document(company_doc, collection)
     update_context_mock = Mock(DocumentDatabaseUpdateContext)
     db.update_context.return_value = update_context_mock
 
     target = CompanyDatastore(db, logger)
-    result = target.activate_company(company_id, authenticated_user_default)
+    result = asyncio.run(target.activate_company(company_id, authenticated_user_default))
 
-    db.collection.assert_called_with("companies")
+    db.collection.assert_any_call("companies")
+    db.collection.assert_any_call("changes")
     update_context_mock.set_values.assert_called_once_with({"status": CompanyStatus.active})
-    update_context_mock.push_to_list.assert_called_once_with("changes", ANY)
+    update_context_mock.push_to_list.assert_not_called()
     collection.update_document.assert_called_once_with(company_id, update_context_mock)
+    collection.add.assert_called_once_with(ANY)
+    assert collection.add.call_args.args[0]["path"] == "status"
     assert result is not None
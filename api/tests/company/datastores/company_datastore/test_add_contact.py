@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import ANY
 
 from app.company.datastores.company_datastore import CompanyDatastore
@@ -16,6 +17,6 @@ def test_add_contact_adds_contact(
     add_contact_model = get_add_contact_model()
 
     target = CompanyDatastore(db, logger)
-    target.add_contact(company_id, add_contact_model, authenticated_user_default)
+    asyncio.run(target.add_contact(company_id, add_contact_model, authenticated_user_default))
 
     collection.push_to_list.assert_called_with(company_id, "contacts", ANY)
@@ -0,0 +1,52 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, call
+
+from app.company.datastores.company_datastore import CompanyDatastore
+from app.company.models.shared.enums import CompanyStatus, SortOrder
+from app.database.abstract.async_document_database import AsyncDocumentCollection
+
+
+def _cursor(docs, total):
+    cursor = Mock(AsyncDocumentCollection)
+    cursor.sort.return_value = cursor
+    cursor.skip.return_value = cursor
+    cursor.take.return_value = cursor
+    cursor.after.return_value = cursor
+    cursor.to_dicts = AsyncMock(return_value=docs)
+    cursor.to_dicts_with_total = AsyncMock(return_value=(docs, total))
+    return cursor
+
+
+def test_get_company_dicts_sorts_before_paging_and_returns_total(
+    doc_database_collection_mocks, logger, fake_company_data
+):
+    db, collection = doc_database_collection_mocks
+    company_id, company_doc = fake_company_data
+    doc = {**company_doc, "id": company_id}
+    cursor = _cursor([doc], 41)
+    collection.get.return_value = cursor
+
+    target = CompanyDatastore(db, logger)
+    companies, total = asyncio.run(
+        target.get_company_dicts(20, 10, "created_date", SortOrder.desc, None, include_total=True)
+    )
+
+    collection.get.assert_called_once()
+    assert collection.get.call_args.args[0] == {"status": CompanyStatus.active}
+    assert cursor.mock_calls[:3] == [call.sort("created_date", "desc"), call.skip(20), call.take(10)]
+    cursor.to_dicts.assert_not_called()
+    assert (companies, total) == ([doc], 41)
+
+
+def test_get_company_dicts_without_total(doc_database_collection_mocks, logger):
+    db, collection = doc_database_collection_mocks
+    cursor = _cursor([], None)
+    collection.get.return_value = cursor
+
+    target = CompanyDatastore(db, logger)
+    companies, total = asyncio.run(target.get_company_dicts(0, 10))
+
+    cursor.to_dicts_with_total.assert_not_called()
+    cursor.skip.assert_not_called()
+    assert companies == []
+    assert total is None
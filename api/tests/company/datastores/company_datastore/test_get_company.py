@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.company.datastores.company_datastore import CompanyDatastore
+from app.company.models.db.company import Company
+from app.shared.errors.errors import NotFoundError
+from tests.fixtures.mongo_document_database_fixtures import get_async_document
+
+
+def test_get_company_only_reads_brief_fields_and_included_sub_collections(
+    doc_database_collection_mocks, logger, fake_company_data, authenticated_user_default
+):
+    db, collection = doc_database_collection_mocks
+    company_id, company_doc = fake_company_data
+    collection.by_id.return_value = get_async_document(company_doc, collection)
+
+    company = asyncio.run(CompanyDatastore(db, logger).get_company(company_id, authenticated_user_default))
+
+    collection.by_id.assert_called_once_with(company_id, Company.brief() + ["contacts"])
+    assert company.id == company_id
+
+
+def test_get_company_not_active_is_not_found_for_anonymous(doc_database_collection_mocks, logger, fake_company_data):
+    db, collection = doc_database_collection_mocks
+    company_id, company_doc = fake_company_data
+    company_doc["status"] = "created"
+    collection.by_id.return_value = get_async_document(company_doc, collection)
+
+    with pytest.raises(NotFoundError):
+        asyncio.run(CompanyDatastore(db, logger).get_company(company_id, None))
+
+
+def test_get_lazy_company_loads_sub_collection_once(
+    doc_database_collection_mocks, logger, fake_company_data, authenticated_user_default
+):
+    db, collection = doc_database_collection_mocks
+    company_id, company_doc = fake_company_data
+    orders_doc = {
+        "_id": company_doc["_id"],
+        "orders": [{"id": "62e00647e98e01ef28be554b", "product_id": "62e00647e98e01ef28be554c", "description": {}}],
+    }
+    collection.by_id = AsyncMock(
+        side_effect=[get_async_document(company_doc, collection), get_async_document(orders_doc, collection)]
+    )
+
+    company = asyncio.run(CompanyDatastore(db, logger).get_lazy_company(company_id, authenticated_user_default))
+    orders = asyncio.run(company.orders())
+    asyncio.run(company.orders())
+
+    assert company.id == company_id
+    assert [order.id for order in orders] == ["62e00647e98e01ef28be554b"]
+    assert collection.by_id.call_count == 2
+    collection.by_id.assert_called_with(company_id, ["orders"])
+    with pytest.raises(AttributeError):
+        _ = company.contacts_not_a_field
+
+
+def test_get_company_languages_only_reads_languages(doc_database_collection_mocks, logger, fake_company_data):
+    db, collection = doc_database_collection_mocks
+    company_id, company_doc = fake_company_data
+    collection.by_id.return_value = get_async_document(
+        {"_id": company_doc["_id"], "content_languages_iso": ["sv"]}, collection
+    )
+
+    languages = asyncio.run(CompanyDatastore(db, logger).get_company_languages(company_id))
+
+    collection.by_id.assert_called_once_with(company_id, ["content_languages_iso"])
+    assert languages == ["sv"]
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.company.datastores.company_datastore import CompanyDatastore
+from app.company.models.v1.company_api_models import CompanyUpdateModel
+from app.database.mongo.mongo_document_database import MongoDBUpdateContext
+from app.shared.errors.errors import NotFoundError
+from tests.fixtures.mongo_document_database_fixtures import get_async_document
+
+
+def test_update_company_updates_in_one_operation_and_logs_changed_fields(
+    doc_database_collection_mocks, logger, fake_company_data, authenticated_user_default
+):
+    db, collection = doc_database_collection_mocks
+    company_id, company_doc = fake_company_data
+    company_doc["company_types"] = ["producer"]
+    db.update_context.side_effect = MongoDBUpdateContext
+    collection.find_one_and_update.return_value = get_async_document(company_doc, collection)
+    model = CompanyUpdateModel(
+        company_types=["producer"], content_languages_iso=["SV"], external_website_url="https://nisse.se"
+    )
+
+    company = asyncio.run(CompanyDatastore(db, logger).update_company(company_id, model, authenticated_user_default))
+
+    assert collection.find_one_and_update.call_args.kwargs["return_updated"] is False
+    collection.replace.assert_not_called()
+    assert sorted(change["path"] for change in collection.add_many.call_args.args[0]) == [
+        "content_languages_iso",
+        "external_website_url",
+    ]
+    assert company.external_website_url == "https://nisse.se"
+    assert [language.value for language in company.content_languages_iso] == ["SV"]
+
+
+def test_delete_contact_pulls_contact(doc_database_collection_mocks, logger, company_id, authenticated_user_default):
+    db, collection = doc_database_collection_mocks
+    db.update_context.side_effect = MongoDBUpdateContext
+    collection.find_one_and_update.return_value = get_async_document({"_id": company_id}, collection)
+
+    asyncio.run(CompanyDatastore(db, logger).delete_contact(company_id, "c1", authenticated_user_default))
+
+    doc_id, update_context = collection.find_one_and_update.call_args.args
+    assert doc_id == company_id
+    assert update_context.to_implementation_specific_update_syntax() == {"$pull": {"contacts": {"id": "c1"}}}
+    assert collection.add.call_args.args[0]["path"] == "company.contacts.c1"
+
+
+def test_delete_contact_not_found(doc_database_collection_mocks, logger, company_id, authenticated_user_default):
+    db, collection = doc_database_collection_mocks
+    collection.find_one_and_update.return_value = None
+    collection.exists.return_value = True
+
+    with pytest.raises(NotFoundError, match="No contact with id 'c1' was found."):
+        asyncio.run(CompanyDatastore(db, logger).delete_contact(company_id, "c1", authenticated_user_default))
@@ -1,46 +1,46 @@
 """Tests for CompanyDatastore class."""
+import asyncio
 from datetime import datetime
 
 import pytest
 from pytz import utc
 
 from app.company.models.shared.enums import ContactType
-from app.database.mongo.mongo_document_database import MongoDocument
 from app.company.datastores.company_datastore import CompanyDatastore
+from app.database.mongo.mongo_document_database import MongoDBUpdateContext
 from app.shared.errors.errors import NotFoundError
 from app.shared.models.db.change import ChangeType
-
-
-def add_contact_to_company_doc_dict(company_doc_dict, contact_model):
-    company_doc_dict["contacts"].append(
-        {
-            "id": contact_model.id,
-            "type": ContactType.email.value,
-            "value": "old_email@shit.com",
-            "created_by": "user@email.com",
-            "created_at": datetime.now(utc),
-            "changed_by": None,
-            "changed_at": None,
-        }
-    )
-
-
-def perform_operation(
-    db_collection,
-    logger,
-    fake_company_data,
-    authenticated_user,
-    contact_model,
-    verification_function,
-):
+from tests.fixtures.mongo_document_database_fixtures import get_async_document
+
+
+def get_updated_contact_doc(company_doc_dict, contact_model, user_email):
+    return {
+        "_id": company_doc_dict["_id"],
+        "contacts": [
+            {
+                "id": contact_model.id,
+                "type": contact_model.type.value,
+                "value": contact_model.value,
+                "description": contact_model.description,
+                "created_by": "user@email.com",
+                "created_at": datetime.now(utc),
+                "changed_by": user_email,
+                "changed_at": datetime.now(utc),
+            }
+        ],
+    }
+
+
+def perform_operation(db_collection, logger, fake_company_data, authenticated_user, contact_model):
     db, collection = db_collection
     company_id, company_doc_dict = fake_company_data
-    add_contact_to_company_doc_dict(company_doc_dict, contact_model)
-    collection.by_id.return_value = MongoDocument(company_doc_dict, collection)
-    collection.replace = verification_function
+    db.update_context.side_effect = MongoDBUpdateContext
+    collection.find_one_and_update.return_value = get_async_document(
+        get_updated_contact_doc(company_doc_dict, contact_model, authenticated_user.email), collection
+    )
 
     target = CompanyDatastore(db, logger)
-    target.update_contact(company_id, contact_model.id, contact_model, authenticated_user)
+    return asyncio.run(target.update_contact(company_id, contact_model.id, contact_model, authenticated_user))
 
 
 def test_update_contact_raises_not_found_error_if_company_not_found(
@@ -51,75 +51,79 @@ def test_update_contact_raises_not_found_error_if_company_not_found(
     contact_model,
 ):
     db, collection = doc_database_collection_mocks
-    collection.by_id.return_value = None
+    collection.find_one_and_update.return_value = None
+    collection.exists.return_value = False
 
     target = CompanyDatastore(db, logger)
     with pytest.raises(NotFoundError, match=f"Company with id '{company_id}' not found"):
-        target.update_contact(company_id, contact_model.id, contact_model, authenticated_user_default)
+        asyncio.run(target.update_contact(company_id, contact_model.id, contact_model, authenticated_user_default))
 
 
 def test_update_contact_raises_not_found_error_if_contact_not_found(
     doc_database_collection_mocks,
     logger,
-    fake_company_data,
+    company_id,
     authenticated_user_default,
     contact_model,
 ):
     db, collection = doc_database_collection_mocks
-    company_id, company_doc_dict = fake_company_data
-    collection.by_id.return_value = MongoDocument(company_doc_dict, collection)
+    collection.find_one_and_update.return_value = None
+    collection.exists.return_value = True
 
     target = CompanyDatastore(db, logger)
     with pytest.raises(
         NotFoundError, match=f"Contact with id '{contact_model.id}' not found on company '{company_id}'."
     ):
-        target.update_contact(company_id, contact_model.id, contact_model, authenticated_user_default)
+        asyncio.run(target.update_contact(company_id, contact_model.id, contact_model, authenticated_user_default))
 
 
-def test_update_contact_calls_replace(
+def test_update_contact_updates_only_the_contact(
     doc_database_collection_mocks,
     logger,
     fake_company_data,
     authenticated_user_default,
     contact_model,
 ):
-    db, collection = doc_database_collection_mocks
-    company_id, company_doc_dict = fake_company_data
-    add_contact_to_company_doc_dict(company_doc_dict, contact_model)
-    collection.by_id.return_value = MongoDocument(company_doc_dict, collection)
-
-    target = CompanyDatastore(db, logger)
-    target.update_contact(company_id, contact_model.id, contact_model, authenticated_user_default)
-
-    collection.replace.assert_called_once()
+    _, collection = doc_database_collection_mocks
+    company_id, _ = fake_company_data
 
+    perform_operation(
+        doc_database_collection_mocks, logger, fake_company_data, authenticated_user_default, contact_model
+    )
 
-def test_update_contact_changes_contact(
+    collection.replace.assert_not_called()
+    collection.by_id.assert_not_called()
+    doc_id, update_context = collection.find_one_and_update.call_args.args
+    assert doc_id == company_id
+    assert collection.find_one_and_update.call_args.kwargs == {
+        "filters": {"contacts.id": contact_model.id},
+        "fields": ["contacts.$"],
+    }
+    updates = update_context.to_implementation_specific_update_syntax()["$set"]
+    assert updates["contacts.$[i0].type"] == contact_model.type
+    assert updates["contacts.$[i0].value"] == contact_model.value
+    assert updates["contacts.$[i0].description"] == contact_model.description
+    assert updates["contacts.$[i0].changed_by"] == authenticated_user_default.email
+    assert updates["contacts.$[i0].changed_at"].date() == datetime.now(utc).date()
+    assert update_context.array_filters() == [{"i0.id": contact_model.id}]
+
+
+def test_update_contact_returns_updated_contact(
     doc_database_collection_mocks,
     logger,
     fake_company_data,
     authenticated_user_default,
     contact_model,
 ):
-    def _verify_contact_changed(_, doc_dict):
-        contact = next((d for d in doc_dict["contacts"] if d["id"] == contact_model.id), None)
-        assert contact["type"] == contact_model.type
-        assert contact["value"] == contact_model.value
-        assert contact["description"] == contact_model.description
-        assert contact["changed_by"] == authenticated_user_default.email
-        assert contact["changed_at"].year == datetime.now(utc).year
-        assert contact["changed_at"].month == datetime.now(utc).month
-        assert contact["changed_at"].day == datetime.now(utc).day
-
-    perform_operation(
-        doc_database_collection_mocks,
-        logger,
-        fake_company_data,
-        authenticated_user_default,
-        contact_model,
-        _verify_contact_changed,
+    contact = perform_operation(
+        doc_database_collection_mocks, logger, fake_company_data, authenticated_user_default, contact_model
     )
 
+    assert contact.id == contact_model.id
+    assert contact.type == ContactType(contact_model.type)
+    assert contact.value == contact_model.value
+    assert contact.changed_by == authenticated_user_default.email
+
 
 def test_update_contact_changes_added(
     doc_database_collection_mocks,
@@ -128,18 +132,17 @@ def test_update_contact_changes_added(
     authenticated_user_default,
     contact_model,
 ):
-    def _verify_change_added(_, doc_dict):
-        change = next((d for d in doc_dict["changes"]), None)
-        assert change is not None
-        assert change["path"] == f"contacts.{contact_model.id}"
-        assert change["change_type"] == ChangeType.update
-        assert change["actor_username"] == authenticated_user_default.email
+    db, collection = doc_database_collection_mocks
+    company_id, _ = fake_company_data
 
     perform_operation(
-        doc_database_collection_mocks,
-        logger,
-        fake_company_data,
-        authenticated_user_default,
-        contact_model,
-        _verify_change_added,
+        doc_database_collection_mocks, logger, fake_company_data, authenticated_user_default, contact_model
     )
+
+    db.collection.assert_called_with("changes")
+    change = collection.add.call_args.args[0]
+    assert change["entity_type"] == "companies"
+    assert change["entity_id"] == company_id
+    assert change["path"] == f"contacts.{contact_model.id}"
+    assert change["change_type"] == ChangeType.update
+    assert change["actor_username"] == authenticated_user_default.email
@@ -0,0 +1,71 @@
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi import APIRouter, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from pytz import utc
+
+from app.company.models.db.company import Company
+from app.company.models.v1.company_api_models import CompanyOutListModel
+from app.shared.models.v1.paging_response_model import PagingResponseModel
+from app.shared.models.v1.shared import Language
+from app.shared.utils.continuation_token import ContinuationToken
+from app.shared.utils.request_utils import get_current_request_url_with_additions
+
+
+def _request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("localhost", 8000),
+            "path": "/v1/SV/companies/",
+            "root_path": "",
+            "query_string": b"take=2&keyset=true",
+            "headers": [],
+        }
+    )
+
+
+def _company_doc(name: str, activation_date: datetime | None) -> dict:
+    return {
+        "id": str(ObjectId()),
+        "name": {"EN": f"{name} EN", "SV": f"{name} SV"},
+        "status": "active",
+        "created_date": datetime(2022, 8, 1, 10, 30, 15, 123000, tzinfo=utc),
+        "company_types": ["producer"],
+        "content_languages_iso": ["EN", "SV"],
+        "activation_date": activation_date,
+        "description": {"EN": "Potatoes"},
+        "external_website_url": None,
+        "profile_picture_url": "62e00647e98e01ef28be554b/profile-picture" if activation_date else None,
+    }
+
+
+def test_dict_from_document_gives_same_json_as_model():
+    request = _request()
+    router = APIRouter(prefix="/v1/{lang}/companies")
+    docs = [_company_doc("Nisses", datetime(2022, 8, 2, tzinfo=utc)), _company_doc("Perssons", None)]
+    next_token = ContinuationToken.after_item(docs[-1], "name.SV", "asc")
+
+    models = [
+        CompanyOutListModel.from_database_model(Company(**doc), Language.SV, "Europe/Stockholm", request, router, None)
+        for doc in docs
+    ]
+    expected = jsonable_encoder(
+        PagingResponseModel[CompanyOutListModel].create_from_token(models, 2, next_token, request)
+    )
+
+    url = get_current_request_url_with_additions(request)
+    items = [
+        CompanyOutListModel.dict_from_document(doc, Language.SV, "Europe/Stockholm", url, request, router)
+        for doc in docs
+    ]
+    fast = ORJSONResponse(PagingResponseModel.create_dict_from_token(items, 2, next_token, request))
+
+    assert json.loads(fast.body) == expected
+    assert expected["items"][1]["description"] == "Potatoes"
+    assert expected["continuation_token"] is not None
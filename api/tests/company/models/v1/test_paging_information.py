@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from fastapi import Depends, FastAPI
+
+from app.company.models.v1.paging_information import PagingInformation, get_paging_information
+
+
+def _create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def get_items(paging_information: PagingInformation = Depends(get_paging_information)):
+        return {
+            "take": paging_information.take,
+            "skip": paging_information.skip,
+            "keyset": paging_information.keyset,
+            "include_total": paging_information.include_total,
+        }
+
+    return app
+
+
+def _get(app: FastAPI, path: str, query_string: bytes) -> tuple[int, dict]:
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string,
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 8000),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"], json.loads(b"".join(message.get("body", b"") for message in messages[1:]))
+
+
+def test_route_resolves_paging_information_from_query():
+    status, body = _get(_create_app(), "/items", b"take=5&skip=10&include_total=true")
+
+    assert status == 200
+    assert body == {"take": 5, "skip": 10, "keyset": False, "include_total": True}
+
+
+def test_route_resolves_paging_information_defaults():
+    status, body = _get(_create_app(), "/items", b"")
+
+    assert status == 200
+    assert body == {"take": 20, "skip": 0, "keyset": False, "include_total": False}
@@ -1,7 +1,23 @@
 """config for tests."""
+import os
+
+import pytest
 
 pytest_plugins = [
     "tests.fixtures.mongo_document_database_fixtures",
     "tests.fixtures.user_fixtures",
     "tests.fixtures.common_fixtures",
 ]
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: timing test, only run when RUN_BENCHMARKS is set.")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, set RUN_BENCHMARKS=1 to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,96 @@
+"""Tests for index provisioning."""
+from unittest.mock import Mock
+
+import pytest
+
+from app.database.abstract.document_database import DocumentDatabase, IndexDefinition
+from app.database.indexes.provisioning import plan_indexes, apply_index_plan, ensure_indexes
+from app.database.indexes.registry import INDEXES
+from app.database.mongo.mongo_document_database import MongoDatabaseCollection
+
+ID_INDEX = IndexDefinition(name="_id_", keys=[("_id", "asc")])
+EMAIL_INDEX = IndexDefinition(name="email_1", keys=[("email", "asc")], unique=True)
+
+
+@pytest.fixture
+def db_with_collection():
+    collection = Mock(MongoDatabaseCollection)
+    db = Mock(DocumentDatabase)
+    db.collection.return_value = collection
+    return db, collection
+
+
+def test_plan_reports_missing_index(db_with_collection):
+    db, collection = db_with_collection
+    collection.list_indexes.return_value = [ID_INDEX]
+
+    plans = plan_indexes(db, {"users": [EMAIL_INDEX]})
+
+    assert plans[0].missing == [EMAIL_INDEX]
+    assert plans[0].changed == []
+    assert plans[0].unknown == []
+
+
+def test_plan_reports_changed_index(db_with_collection):
+    db, collection = db_with_collection
+    collection.list_indexes.return_value = [ID_INDEX, IndexDefinition(name="email_1", keys=[("email", "asc")])]
+
+    plans = plan_indexes(db, {"users": [EMAIL_INDEX]})
+
+    assert plans[0].missing == []
+    assert plans[0].changed == [EMAIL_INDEX]
+
+
+def test_plan_reports_unknown_index_but_not_id_index(db_with_collection):
+    db, collection = db_with_collection
+    other = IndexDefinition(name="other_1", keys=[("other", "asc")])
+    collection.list_indexes.return_value = [ID_INDEX, EMAIL_INDEX, other]
+
+    plans = plan_indexes(db, {"users": [EMAIL_INDEX]})
+
+    assert not plans[0].has_changes()
+    assert plans[0].unknown == [other]
+
+
+def test_apply_recreates_changed_and_leaves_unknown(db_with_collection, logger):
+    db, collection = db_with_collection
+    collection.list_indexes.return_value = [
+        IndexDefinition(name="email_1", keys=[("email", "asc")]),
+        IndexDefinition(name="other_1", keys=[("other", "asc")]),
+    ]
+
+    apply_index_plan(db, plan_indexes(db, {"users": [EMAIL_INDEX]}), logger)
+
+    collection.drop_index.assert_called_once_with("email_1")
+    collection.create_index.assert_called_once_with(EMAIL_INDEX)
+
+
+def test_apply_drops_unknown_when_asked(db_with_collection, logger):
+    db, collection = db_with_collection
+    collection.list_indexes.return_value = [EMAIL_INDEX, IndexDefinition(name="other_1", keys=[("other", "asc")])]
+
+    apply_index_plan(db, plan_indexes(db, {"users": [EMAIL_INDEX]}), logger, drop_unknown=True)
+
+    collection.drop_index.assert_called_once_with("other_1")
+    collection.create_index.assert_not_called()
+
+
+def test_ensure_indexes_creates_whole_registry_on_empty_database(db_with_collection, logger):
+    db, collection = db_with_collection
+    collection.list_indexes.return_value = [ID_INDEX]
+
+    ensure_indexes(db, logger)
+
+    assert collection.create_index.call_count == sum(len(indexes) for indexes in INDEXES.values())
+
+
+def test_ensure_indexes_creates_missing_but_does_not_recreate_changed(db_with_collection, logger):
+    db, collection = db_with_collection
+    collection.list_indexes.return_value = [ID_INDEX, IndexDefinition(name="email_1", keys=[("email", "asc")])]
+
+    ensure_indexes(db, logger)
+
+    collection.drop_index.assert_not_called()
+    created = [call.args[0].name for call in collection.create_index.call_args_list]
+    assert "email_1" not in created
+    assert logger.warn.called
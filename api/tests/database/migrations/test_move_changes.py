@@ -0,0 +1,42 @@
+from unittest.mock import Mock
+
+from bson import ObjectId
+
+from app.database.abstract.document_database import DocumentDatabase, DatabaseCollection, DocumentCollection
+from app.database.mongo.mongo_document_database import MongoDocument, MongoDBUpdateContext
+from app.database.migrations.move_changes import move_changes
+from app.shared.models.db.change import Change, ChangeType
+
+
+def test_move_changes_copies_new_changes_and_unsets_field(logger):
+    company_id = ObjectId()
+    moved = Change.create(str(ObjectId()), "init", ChangeType.add, "nisse@perssons.se", None)
+    already_moved = Change.create(str(ObjectId()), "name", ChangeType.update, "nisse@perssons.se", {"sv": "Nisse"})
+    changes = Mock(DatabaseCollection)
+    changes.get.return_value.to_list.return_value = iter(
+        [MongoDocument({"_id": ObjectId(), "change_id": already_moved.id}, changes)]
+    )
+    companies = Mock(DatabaseCollection)
+    docs = Mock(DocumentCollection)
+    docs.to_list.return_value = iter(
+        [MongoDocument({"_id": company_id, "changes": [moved.dict(), already_moved.dict()]}, companies)]
+    )
+    companies.get.return_value = docs
+    empty = Mock(DatabaseCollection)
+    empty.get.return_value.to_list.return_value = iter([])
+    db = Mock(DocumentDatabase)
+    db.collection.side_effect = lambda name: {"changes": changes, "companies": companies}.get(name, empty)
+    db.update_context.side_effect = MongoDBUpdateContext
+
+    assert move_changes(db, logger) == 1
+
+    changes.get.assert_called_once_with({"change_id": {"$in": [moved.id, already_moved.id]}}, ["change_id"])
+    changes.exists.assert_not_called()
+    changes.add_many.assert_called_once()
+    (added,) = changes.add_many.call_args.args[0]
+    assert added["change_id"] == moved.id
+    assert added["entity_id"] == str(company_id)
+    companies.update_document.assert_called_once()
+    doc_id, update_context = companies.update_document.call_args.args
+    assert doc_id == str(company_id)
+    assert update_context.to_implementation_specific_update_syntax() == {"$unset": {"changes": ""}}
@@ -0,0 +1,73 @@
+"""Tests for async_mongo_document_database module."""
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from bson import ObjectId
+
+from app.database.mongo import async_mongo_document_database
+from app.database.mongo.async_mongo_document_database import (
+    AsyncMongoDatabaseCollection,
+    AsyncMongoDocument,
+    AsyncMongoDocumentCollection,
+)
+from app.database.mongo.mongo_document_database import MongoDocument, MongoDocumentCollection
+
+
+async def _collect(documents):
+    return [doc async for doc in documents]
+
+
+def test_by_id_wraps_document(mongo_database_collection_mock, obj_id):
+    mongo_database_collection_mock.by_id.return_value = MongoDocument(
+        {"_id": obj_id, "name": "Nisse"}, mongo_database_collection_mock
+    )
+    target = AsyncMongoDatabaseCollection(mongo_database_collection_mock)
+
+    doc = asyncio.run(target.by_id(str(obj_id)))
+
+    assert isinstance(doc, AsyncMongoDocument)
+    assert doc.id == str(obj_id)
+    assert doc["name"] == "Nisse"
+    mongo_database_collection_mock.by_id.assert_called_once_with(str(obj_id), None)
+
+
+def test_by_id_returns_none_if_not_found(mongo_database_collection_mock, doc_id):
+    mongo_database_collection_mock.by_id.return_value = None
+    target = AsyncMongoDatabaseCollection(mongo_database_collection_mock)
+
+    assert asyncio.run(target.by_id(doc_id)) is None
+
+
+def test_document_replace_goes_through_async_collection(mongo_database_collection_mock, obj_id):
+    mongo_database_collection_mock.by_id.return_value = MongoDocument({"_id": obj_id}, mongo_database_collection_mock)
+    target = AsyncMongoDatabaseCollection(mongo_database_collection_mock)
+    doc = asyncio.run(target.by_id(str(obj_id)))
+
+    asyncio.run(doc.replace({"id": str(obj_id), "name": "Egon"}))
+
+    mongo_database_collection_mock.replace.assert_called_once_with(str(obj_id), {"id": str(obj_id), "name": "Egon"})
+
+
+@pytest.mark.parametrize("number_of_docs", [0, 3, async_mongo_document_database.ITERATION_BATCH_SIZE * 2 + 1])
+def test_async_iteration_yields_all_documents(mongo_database_collection_mock, number_of_docs):
+    docs = [MongoDocument({"_id": ObjectId()}, mongo_database_collection_mock) for _ in range(number_of_docs)]
+    cursor = Mock(MongoDocumentCollection)
+    cursor.to_list.return_value = iter(docs)
+    target = AsyncMongoDocumentCollection(cursor, AsyncMongoDatabaseCollection(mongo_database_collection_mock))
+
+    result = asyncio.run(_collect(target))
+
+    assert [doc.id for doc in result] == [doc.id for doc in docs]
+
+
+def test_to_list_returns_list(mongo_database_collection_mock):
+    docs = [MongoDocument({"_id": ObjectId()}, mongo_database_collection_mock) for _ in range(2)]
+    cursor = Mock(MongoDocumentCollection)
+    cursor.to_list.return_value = iter(docs)
+    target = AsyncMongoDocumentCollection(cursor, AsyncMongoDatabaseCollection(mongo_database_collection_mock))
+
+    result = asyncio.run(target.to_list())
+
+    assert len(result) == 2
+    assert all(isinstance(doc, AsyncMongoDocument) for doc in result)
@@ -0,0 +1,77 @@
+"""Tests for bson_conversion."""
+from enum import Enum
+from unittest.mock import Mock
+
+import bson
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from pymongo.database import Database
+
+from app.database.mongo.bson_conversion import codec_options, from_mongo, to_mongo, TYPE_REGISTRY
+from app.database.mongo.mongo_document_database import MongoDocumentDatabase
+from app.shared.models.v1.shared import Language
+
+
+class TestEnum(Enum):
+    """Enum used for test."""
+
+    value1 = "value1"
+
+
+def encode(data: dict) -> dict:
+    return bson.decode(bson.encode(data, codec_options=codec_options(CodecOptions())))
+
+
+def test_codec_encodes_enum_values():
+    assert encode({"value": TestEnum.value1}) == {"value": "value1"}
+
+
+def test_codec_encodes_enums_in_nested_lists_and_dicts():
+    data = {"sub_list": [TestEnum.value1], "things": [{"val": TestEnum.value1}], "sub_dict": {"$in": [TestEnum.value1]}}
+    assert encode(data) == {"sub_list": ["value1"], "things": [{"val": "value1"}], "sub_dict": {"$in": ["value1"]}}
+
+
+def test_to_mongo_converts_enum_keys_in_place():
+    nested = {Language.SV: "Detta är text"}
+    data = {"name": nested, "items": [{Language.EN: "Text"}]}
+
+    result = to_mongo(data, map_ids=False)
+
+    assert result is data
+    assert data["name"] is nested
+    assert data == {"name": {"SV": "Detta är text"}, "items": [{"EN": "Text"}]}
+
+
+def test_to_mongo_converts_ids_in_operators():
+    ids = [str(ObjectId()), str(ObjectId())]
+    assert to_mongo({"id": {"$in": ids, "$ne": ids[0]}}) == {
+        "_id": {"$in": [ObjectId(item) for item in ids], "$ne": ObjectId(ids[0])}
+    }
+
+
+def test_to_mongo_keeps_ids_without_map_ids():
+    assert to_mongo({"contacts": [{"id": "c1"}]}, map_ids=False) == {"contacts": [{"id": "c1"}]}
+
+
+def test_to_mongo_leaves_scalars():
+    assert to_mongo("value") == "value"
+    assert to_mongo(TestEnum.value1) is TestEnum.value1
+
+
+def test_from_mongo_does_not_change_document():
+    obj_id = ObjectId()
+    doc = {"_id": obj_id, "sub": {"_id": obj_id}}
+
+    assert from_mongo(doc) == {"id": str(obj_id), "sub": {"id": str(obj_id)}}
+    assert doc == {"_id": obj_id, "sub": {"_id": obj_id}}
+
+
+def test_collections_get_type_registry_of_codec():
+    db = Mock(Database)
+    db.codec_options = CodecOptions(tz_aware=True)
+
+    MongoDocumentDatabase(db, Mock()).collection("companies")
+
+    options = db.get_collection.call_args.kwargs["codec_options"]
+    assert options.type_registry is TYPE_REGISTRY
+    assert options.tz_aware
@@ -1,13 +1,22 @@
 from unittest.mock import Mock, PropertyMock
 
+import bson
 import pytest
 from bson import ObjectId
+from bson.codec_options import CodecOptions
+from pymongo import ReturnDocument, InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError
 from pymongo.collection import Collection
 from pymongo.results import UpdateResult
 
-from app.company.models.shared.enums import CompanyStatus
-from app.database.abstract.document_database import DatabaseCollection
-from app.database.mongo.mongo_document_database import MongoDatabaseCollection
+from app.company.models.shared.enums import CompanyStatus, ContactType
+from app.database.mongo.bson_conversion import codec_options
+from app.database.abstract.document_database import DatabaseCollection, IndexDefinition
+from app.database.mongo.mongo_document_database import (
+    MongoDatabaseCollection,
+    MongoDBUpdateContext,
+    MongoDBBulkOperations,
+)
 from app.shared.errors.errors import NotFoundError
 
 
@@ -26,6 +35,11 @@ def get_target(collection, logger):
     return doc_id, target
 
 
+def encoded(value):
+    """value as written by pymongo, with enums encoded by the codec of the collection."""
+    return bson.decode(bson.encode({"value": value}, codec_options=codec_options(CodecOptions())))["value"]
+
+
 def configure_collection(collection, modified_count):
     type(collection.update_one.return_value).modified_count = PropertyMock(return_value=modified_count)
 
@@ -36,7 +50,8 @@ def test_patch_document_document_found(collection, logger):
     doc_id, target = get_target(collection, logger)
     target.patch_document(doc_id, {"field_name": "new_value", "enum_val": CompanyStatus.active})
 
-    collection.update_one.assert_called_once_with(
+    collection.update_one.assert_called_once()
+    assert encoded(list(collection.update_one.call_args.args)) == [
         {"_id": ObjectId(doc_id)},
         {
             "$set": {
@@ -44,7 +59,7 @@ def test_patch_document_document_found(collection, logger):
                 "enum_val": CompanyStatus.active.value,
             }
         },
-    )
+    ]
 
 
 def test_patch_document_document_not_found(collection, logger):
@@ -57,3 +72,282 @@ def test_patch_document_document_not_found(collection, logger):
         match=f"No document with key='{doc_id}' " f"was found in collection='stuff'",
     ):
         target.patch_document(doc_id, {"key": "value"})
+
+
+def test_list_indexes_converts_index_information(collection, logger):
+    collection.index_information.return_value = {
+        "_id_": {"v": 2, "key": [("_id", 1)]},
+        "status_1_created_date_-1": {"v": 2, "key": [("status", 1), ("created_date", -1)], "unique": True},
+    }
+
+    _, target = get_target(collection, logger)
+
+    assert target.list_indexes() == [
+        IndexDefinition(name="_id_", keys=[("_id", "asc")]),
+        IndexDefinition(
+            name="status_1_created_date_-1", keys=[("status", "asc"), ("created_date", "desc")], unique=True
+        ),
+    ]
+
+
+def test_create_index_uses_mongo_syntax(collection, logger):
+    _, target = get_target(collection, logger)
+
+    target.create_index(IndexDefinition(name="email_1", keys=[("email", "asc")], unique=True))
+
+    collection.create_index.assert_called_once_with([("email", 1)], name="email_1", unique=True)
+
+
+def test_get_applies_sort_skip_and_limit_when_iterated(collection, logger):
+    cursor = collection.find.return_value
+    cursor.sort.return_value = cursor
+    cursor.skip.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.__iter__ = Mock(return_value=iter([]))
+    _, target = get_target(collection, logger)
+
+    docs = target.get({"status": CompanyStatus.active}, ["name"]).take(10).skip(20).sort("name.sv", "desc")
+    collection.find.assert_not_called()
+    list(docs.to_list())
+
+    collection.find.assert_called_once_with({"status": CompanyStatus.active}, {"name": 1})
+    assert encoded(collection.find.call_args.args[0]) == {"status": "active"}
+    cursor.sort.assert_called_once_with([("name.sv", -1)])
+    cursor.skip.assert_called_once_with(20)
+    cursor.limit.assert_called_once_with(10)
+
+
+def test_after_filters_on_sort_key_and_id(collection, logger):
+    cursor = collection.find.return_value
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.__iter__ = Mock(return_value=iter([]))
+    last_id = ObjectId()
+    _, target = get_target(collection, logger)
+
+    list(target.get({"status": "active"}).after(str(last_id), "status", CompanyStatus.created, "asc").take(5).to_list())
+
+    collection.find.assert_called_once()
+    assert collection.find.call_args.args[1] is None
+    assert encoded(collection.find.call_args.args[0]) == {
+        "$and": [
+            {"status": "active"},
+            {"$or": [{"status": {"$gt": "created"}}, {"status": "created", "_id": {"$gt": last_id}}]},
+        ]
+    }
+    cursor.sort.assert_called_once_with([("status", 1), ("_id", 1)])
+    cursor.skip.assert_not_called()
+    cursor.limit.assert_called_once_with(5)
+
+
+def test_after_without_position_only_sorts(collection, logger):
+    cursor = collection.find.return_value
+    cursor.sort.return_value = cursor
+    cursor.__iter__ = Mock(return_value=iter([]))
+    _, target = get_target(collection, logger)
+
+    list(target.get_all().after(None, None, None, "desc").to_list())
+
+    collection.find.assert_called_once_with({}, None)
+    cursor.sort.assert_called_once_with([("_id", -1)])
+
+
+def test_to_list_with_total_uses_facet(collection, logger):
+    doc_id = ObjectId()
+    collection.aggregate.return_value = iter([{"items": [{"_id": doc_id}], "total": [{"count": 41}]}])
+    _, target = get_target(collection, logger)
+
+    docs, total = (
+        target.get({"status": "active"}, ["name"]).sort("name.sv", "asc").skip(20).take(10).to_list_with_total()
+    )
+
+    collection.aggregate.assert_called_once_with(
+        [
+            {"$match": {"status": "active"}},
+            {
+                "$facet": {
+                    "items": [
+                        {"$match": {}},
+                        {"$sort": {"name.sv": 1}},
+                        {"$skip": 20},
+                        {"$limit": 10},
+                        {"$project": {"name": 1}},
+                    ],
+                    "total": [{"$count": "count"}],
+                }
+            },
+        ]
+    )
+    assert [doc.id for doc in docs] == [str(doc_id)]
+    assert total == 41
+
+
+def test_to_list_with_total_no_matches(collection, logger):
+    collection.aggregate.return_value = iter([{"items": [], "total": []}])
+    _, target = get_target(collection, logger)
+
+    assert target.get_all().to_list_with_total() == ([], 0)
+
+
+def test_to_dicts_returns_plain_dicts_with_str_id(collection, logger):
+    doc_id = ObjectId()
+    cursor = collection.find.return_value
+    cursor.limit.return_value = cursor
+    cursor.__iter__ = Mock(return_value=iter([{"_id": doc_id, "name": {"SV": "Nisse"}}]))
+    collection.aggregate.return_value = iter([{"items": [{"_id": doc_id}], "total": [{"count": 1}]}])
+    _, target = get_target(collection, logger)
+
+    assert target.get_all(["name"]).take(1).to_dicts() == [{"id": str(doc_id), "name": {"SV": "Nisse"}}]
+    collection.find.assert_called_once_with({}, {"name": 1})
+    assert target.get_all().to_dicts_with_total() == ([{"id": str(doc_id)}], 1)
+
+
+def test_find_one_and_update_uses_array_filters_and_returns_updated(collection, logger):
+    doc_id, target = get_target(collection, logger)
+    collection.find_one_and_update.return_value = {"_id": ObjectId(doc_id), "contacts": [{"id": "c1"}]}
+    update_context = MongoDBUpdateContext()
+    update_context.set_in_list("contacts", "c1", {"type": ContactType.email})
+
+    doc = target.find_one_and_update(doc_id, update_context, {"contacts.id": "c1"}, ["contacts.$"])
+
+    collection.find_one_and_update.assert_called_once_with(
+        {"_id": ObjectId(doc_id), "contacts.id": "c1"},
+        {"$set": {"contacts.$[i0].type": ContactType.email}},
+        projection={"contacts.$": 1},
+        array_filters=[{"i0.id": "c1"}],
+        return_document=ReturnDocument.AFTER,
+    )
+    assert doc.id == doc_id
+
+
+def test_find_one_and_update_returns_none_if_not_matched(collection, logger):
+    doc_id, target = get_target(collection, logger)
+    collection.find_one_and_update.return_value = None
+    update_context = MongoDBUpdateContext()
+    update_context.pull_from_list("contacts", "c1")
+
+    assert target.find_one_and_update(doc_id, update_context, return_updated=False) is None
+    assert collection.find_one_and_update.call_args.args[1] == {"$pull": {"contacts": {"id": "c1"}}}
+    assert collection.find_one_and_update.call_args.kwargs["return_document"] == ReturnDocument.BEFORE
+
+
+def test_add_returns_document_without_reading_it_back(collection, logger):
+    inserted_id = ObjectId()
+    collection.insert_one.return_value.inserted_id = inserted_id
+    _, target = get_target(collection, logger)
+    data = {"status": CompanyStatus.active}
+
+    doc = target.add(data)
+
+    collection.insert_one.assert_called_once_with({"status": CompanyStatus.active, "_id": inserted_id})
+    assert encoded(collection.insert_one.call_args.args[0]) == {"status": "active", "_id": inserted_id}
+    collection.find_one.assert_not_called()
+    assert doc.id == str(inserted_id)
+    assert doc["status"] == CompanyStatus.active
+    assert "_id" not in data
+
+
+def test_add_with_verify_reads_document_back(collection, logger):
+    inserted_id = ObjectId()
+    collection.insert_one.return_value.inserted_id = inserted_id
+    collection.find_one.return_value = {"_id": inserted_id, "status": "active"}
+    _, target = get_target(collection, logger)
+
+    doc = target.add({"status": "active"}, verify=True)
+
+    collection.find_one.assert_called_once_with({"_id": inserted_id}, None)
+    assert doc.id == str(inserted_id)
+
+
+def test_add_many_inserts_in_one_round_trip(collection, logger):
+    inserted_ids = [ObjectId(), ObjectId()]
+    collection.insert_many.return_value.inserted_ids = inserted_ids
+    _, target = get_target(collection, logger)
+
+    docs = target.add_many([{"name": "a"}, {"name": "b"}], ordered=False)
+
+    collection.insert_many.assert_called_once()
+    assert collection.insert_many.call_args.kwargs == {"ordered": False}
+    assert [(doc.id, doc["name"]) for doc in docs] == [(str(inserted_ids[0]), "a"), (str(inserted_ids[1]), "b")]
+    assert target.add_many([]) == []
+
+
+def test_bulk_write_maps_mixed_operations_to_one_call(collection, logger):
+    collection.bulk_write.return_value.bulk_api_result = {
+        "nInserted": 1,
+        "nMatched": 1,
+        "nModified": 1,
+        "nUpserted": 1,
+        "nRemoved": 1,
+        "upserted": [{"index": 2, "_id": ObjectId("62e00647e98e01ef28be554b")}],
+        "writeErrors": [],
+    }
+    doc_id, target = get_target(collection, logger)
+    operations = MongoDBBulkOperations()
+    inserted_id = operations.insert({"status": CompanyStatus.active})
+    update_context = MongoDBUpdateContext()
+    update_context.set_values({"status": CompanyStatus.deactivated})
+    operations.update(doc_id, update_context)
+    operations.upsert({"name.sv": "Potatis"}, update_context)
+    operations.delete(doc_id)
+
+    result = target.bulk_write(operations, ordered=False)
+
+    requests = collection.bulk_write.call_args.args[0]
+    assert collection.bulk_write.call_args.kwargs == {"ordered": False}
+    assert requests == [
+        InsertOne({"status": CompanyStatus.active, "_id": ObjectId(inserted_id)}),
+        UpdateOne({"_id": ObjectId(doc_id)}, {"$set": {"status": CompanyStatus.deactivated}}),
+        UpdateOne({"name.sv": "Potatis"}, {"$set": {"status": CompanyStatus.deactivated}}, upsert=True),
+        DeleteOne({"_id": ObjectId(doc_id)}),
+    ]
+    assert result.ok
+    assert [(item.operation, item.doc_id) for item in result.items] == [
+        ("insert", inserted_id),
+        ("update", doc_id),
+        ("upsert", "62e00647e98e01ef28be554b"),
+        ("delete", doc_id),
+    ]
+    assert (result.inserted_count, result.upserted_count, result.deleted_count) == (1, 1, 1)
+
+
+def test_bulk_write_reports_failed_items_instead_of_raising(collection, logger):
+    collection.bulk_write.side_effect = BulkWriteError(
+        {"nInserted": 1, "writeErrors": [{"index": 1, "code": 11000, "errmsg": "E11000 duplicate key error"}]}
+    )
+    type(collection).name = PropertyMock(return_value="products")
+    _, target = get_target(collection, logger)
+    operations = MongoDBBulkOperations()
+    for name in ["a", "b", "c"]:
+        operations.insert({"name": name})
+
+    result = target.bulk_write(operations)
+
+    assert not result.ok
+    assert [item.ok for item in result.items] == [True, False, False]
+    assert result.items[1].error == "E11000 duplicate key error"
+    assert result.inserted_count == 1
+
+
+def test_bulk_write_without_operations_does_not_call_database(collection, logger):
+    _, target = get_target(collection, logger)
+
+    result = target.bulk_write(MongoDBBulkOperations())
+
+    collection.bulk_write.assert_not_called()
+    assert result.items == []
+
+
+def test_filters_and_data_of_caller_are_not_changed(collection, logger):
+    collection.count_documents.return_value = 1
+    doc_id, target = get_target(collection, logger)
+    filters = {"id": doc_id}
+    data = {"id": doc_id, "name": "Nisse"}
+
+    target.get(filters)
+    target.exists(filters)
+    target.replace(doc_id, data)
+
+    assert filters == {"id": doc_id}
+    assert data == {"id": doc_id, "name": "Nisse"}
+    collection.count_documents.assert_called_once_with({"_id": ObjectId(doc_id)}, limit=1)
@@ -79,3 +79,8 @@ def test_replacing_doc_works_by_passing_doc(mongo_database_collection_mock, obj_
     target = MongoDocument({"_id": obj_id, "name": "Nisse"}, mongo_database_collection_mock)
     target["name"] = "Egon"
     target.replace(target)
+
+
+def test_iter_yields_id_without_copying(basic_target):
+    assert list(basic_target) == ["id", "name"]
+    assert dict(basic_target) == {"id": basic_target.id, "name": "Nisse"}
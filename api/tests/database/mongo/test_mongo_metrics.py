@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from pymongo.monitoring import (
+    CommandFailedEvent,
+    CommandSucceededEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutStartedEvent,
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCreatedEvent,
+)
+
+from app.database.mongo.mongo_metrics import MongoMetrics
+
+ADDRESS = ("localhost", 27017)
+
+
+def test_pool_metrics_track_checked_out_connections_and_wait_time():
+    target = MongoMetrics()
+
+    target.connection_created(ConnectionCreatedEvent(ADDRESS, 1))
+    target.connection_check_out_started(ConnectionCheckOutStartedEvent(ADDRESS))
+    target.connection_checked_out(ConnectionCheckedOutEvent(ADDRESS, 1))
+    target.connection_check_out_started(ConnectionCheckOutStartedEvent(ADDRESS))
+    target.connection_check_out_failed(ConnectionCheckOutFailedEvent(ADDRESS, "timeout"))
+    pool = target.snapshot()["pools"]["localhost:27017"]
+
+    assert pool["open_connections"] == 1
+    assert pool["checked_out"] == 1
+    assert pool["waiting"] == 0
+    assert pool["max_waiting"] == 1
+    assert pool["check_out_failures"] == {"timeout": 1}
+    assert pool["check_out_wait"]["count"] == 2
+
+    target.connection_checked_in(ConnectionCheckedInEvent(ADDRESS, 1))
+
+    assert target.snapshot()["pools"]["localhost:27017"]["checked_out"] == 0
+    assert target.snapshot()["pools"]["localhost:27017"]["max_checked_out"] == 1
+
+
+def test_command_metrics_are_histograms_per_command_name():
+    target = MongoMetrics()
+
+    target.succeeded(CommandSucceededEvent(timedelta(milliseconds=3), {"ok": 1}, "find", 1, ADDRESS, 1))
+    target.succeeded(CommandSucceededEvent(timedelta(milliseconds=300), {"ok": 1}, "find", 2, ADDRESS, 2))
+    target.failed(CommandFailedEvent(timedelta(milliseconds=1), {"ok": 0}, "insert", 3, ADDRESS, 3))
+    commands = target.snapshot()["commands"]
+
+    assert commands["find"]["count"] == 2
+    assert commands["find"]["buckets"]["5"] == 1
+    assert commands["find"]["buckets"]["500"] == 1
+    assert commands["find"]["failures"] == 0
+    assert commands["insert"]["failures"] == 1
@@ -0,0 +1,29 @@
+import pytest
+from pydantic import ValidationError
+
+from app.database.mongo.mongo_settings import MongoSettings
+
+
+def test_settings_are_read_from_environment(monkeypatch):
+    monkeypatch.setenv("MONGO_URI", "mongodb://db:27017/produce_exchange_hub")
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "20")
+    monkeypatch.setenv("MONGO_MIN_POOL_SIZE", "5")
+    monkeypatch.setenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "1000")
+    monkeypatch.setenv("MONGO_READ_PREFERENCE", "secondaryPreferred")
+
+    target = MongoSettings()
+
+    assert target.uri == "mongodb://db:27017/produce_exchange_hub"
+    assert target.client_options() == {
+        "maxPoolSize": 20,
+        "minPoolSize": 5,
+        "readPreference": "secondaryPreferred",
+        "waitQueueTimeoutMS": 1000,
+    }
+
+
+def test_settings_reject_unknown_read_preference(monkeypatch):
+    monkeypatch.setenv("MONGO_READ_PREFERENCE", "fastest")
+
+    with pytest.raises(ValidationError):
+        MongoSettings()
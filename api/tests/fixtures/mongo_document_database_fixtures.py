@@ -4,8 +4,15 @@ from unittest.mock import Mock
 import pytest
 from bson import ObjectId
 
-from app.database.abstract.document_database import DocumentDatabase, DocumentCollection
-from app.database.mongo.mongo_document_database import MongoDatabaseCollection
+from app.database.abstract.async_document_database import AsyncDocumentDatabase
+from app.database.abstract.document_database import DocumentCollection
+from app.database.mongo.async_mongo_document_database import AsyncMongoDatabaseCollection, AsyncMongoDocument
+from app.database.mongo.mongo_document_database import MongoDatabaseCollection, MongoDocument
+
+
+def get_async_document(data: dict, collection) -> AsyncMongoDocument:
+    """Creates an AsyncMongoDocument for data, with writes going to given collection mock."""
+    return AsyncMongoDocument(MongoDocument(data, Mock(MongoDatabaseCollection)), collection)
 
 
 @pytest.fixture
@@ -29,22 +36,17 @@ def doc_id(obj_id):
 @pytest.fixture
 def doc_database_collection_mocks(doc_id):
     """
-    Fixture setting up mock of app.database.document_database.DocumentDatabase.
-    Is also setup for using the transaction decorator.
-    :return: Mock(DocumentDatabase)
-        with collection.return_value = Mock(MongoDatabaseCollection)
-        as tuple[Mock[DocumentDatabase], Mock[MongoDatabaseCollection]]
+    Fixture setting up mock of app.database.abstract.async_document_database.AsyncDocumentDatabase.
+    :return: Mock(AsyncDocumentDatabase)
+        with collection.return_value = Mock(AsyncMongoDatabaseCollection)
+        as tuple[Mock[AsyncDocumentDatabase], Mock[AsyncMongoDatabaseCollection]]
     """
+    collection_mock = Mock(AsyncMongoDatabaseCollection)
+    db_mock = Mock(AsyncDocumentDatabase)
 
-    def fake_decorator_function(datastore, function, *args, **kwargs):
-        return function(datastore, *args, **kwargs)
-
-    collection_mock = Mock(MongoDatabaseCollection)
-    db_mock = Mock(DocumentDatabase)
-
-    db_mock.transaction = fake_decorator_function
     db_mock.collection.return_value = collection_mock
     db_mock.new_id.return_value = doc_id
+    db_mock.is_valid_id.side_effect = ObjectId.is_valid
     return db_mock, collection_mock
 
 
@@ -54,4 +56,5 @@ def document_collection_mock():
     mock.skip.return_value = mock
     mock.take.return_value = mock
     mock.sort.return_value = mock
+    mock.after.return_value = mock
     return mock
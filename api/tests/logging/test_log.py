@@ -0,0 +1,148 @@
+import threading
+from logging import DEBUG, ERROR, INFO, WARNING, Handler, LogRecord, getLogger
+from unittest.mock import Mock
+
+import pytest
+from pydantic import ValidationError
+
+from app.logging.log import AppLogger, AppLoggerInjector, LogPipeline, LogSettings
+
+
+class _RecordingHandler(Handler):
+    def __init__(self, release: threading.Event | None = None):
+        super().__init__(DEBUG)
+        self.records: list[tuple[str, str]] = []
+        self._release = release
+
+    def emit(self, record: LogRecord) -> None:
+        if self._release is not None:
+            self._release.wait(5)
+        self.records.append((threading.current_thread().name, self.format(record)))
+
+
+def _logger(name: str, pipeline: LogPipeline):
+    logger = getLogger(name)
+    logger.setLevel(DEBUG)
+    logger.propagate = False
+    logger.handlers = [pipeline.queue_handler]
+    return logger
+
+
+def test_records_are_written_by_listener_thread():
+    handler = _RecordingHandler()
+    pipeline = LogPipeline(100, [handler])
+    values = ["first"]
+
+    _logger("test_log.listener", pipeline).debug("values=%s", values)
+    values.append("second")
+    pipeline.stop()
+
+    assert handler.records == [(handler.records[0][0], "values=['first']")]
+    assert handler.records[0][0] != threading.current_thread().name
+
+
+def test_full_queue_drops_records_without_blocking():
+    release = threading.Event()
+    handler = _RecordingHandler(release)
+    pipeline = LogPipeline(2, [handler])
+    logger = _logger("test_log.full", pipeline)
+
+    for i in range(10):
+        logger.info("message %s", i)
+    logger.error("error")
+
+    stats = pipeline.stats()
+    release.set()
+    pipeline.stop()
+
+    assert stats["queue_size"] == 2
+    assert sum(stats["dropped"].values()) == 11 - len(handler.records)
+    assert stats["dropped"]["INFO"] >= 7
+
+
+def test_injection_does_not_add_handlers(http_request):
+    http_request.method = "GET"
+    injector = AppLoggerInjector("test_log.injection")
+    python_logger = injector().logger
+    handlers = list(python_logger.handlers)
+
+    for _ in range(5000):
+        injector(http_request)
+        AppLogger("test_log.injection")
+
+    assert python_logger.handlers == handlers
+    assert len(handlers) == 1
+
+
+def test_bound_logger_adds_context_and_shares_python_logger(http_request):
+    http_request.method = "GET"
+    logger = AppLoggerInjector("test_log.bound")()
+
+    bound = AppLoggerInjector("test_log.bound")(http_request)
+
+    assert bound.logger is logger.logger
+    assert bound._context == "method=GET|path=/v1|"
+    assert logger._context == ""
+
+
+class _CountingStr:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "value"
+
+
+def _recorded_app_logger(name: str, level: int) -> tuple[AppLogger, _RecordingHandler]:
+    handler = _RecordingHandler()
+    logger = AppLogger(name)
+    logger.logger.setLevel(level)
+    logger.logger.propagate = False
+    logger.logger.handlers = [handler]
+    return logger, handler
+
+
+def test_disabled_debug_is_not_formatted():
+    logger, handler = _recorded_app_logger("test_log.disabled", INFO)
+    value = _CountingStr()
+    message = Mock(return_value="message")
+
+    logger.debug("value=%s", value)
+    logger.debug(message)
+
+    assert value.calls == 0
+    message.assert_not_called()
+    assert handler.records == []
+
+
+def test_enabled_debug_formats_args_and_callables():
+    logger, handler = _recorded_app_logger("test_log.enabled", DEBUG)
+    bound = logger.bind(path="/v1/100%")
+
+    bound.debug("value=%s", _CountingStr())
+    bound.debug(lambda: "from callable")
+    bound.error("failed", exception=ValueError("error"))
+
+    assert [message.split("\n")[0] for _, message in handler.records] == [
+        "path=/v1/100%|value=value",
+        "path=/v1/100%|from callable",
+        "path=/v1/100%|failed",
+    ]
+    assert "ValueError: error" in handler.records[2][1]
+
+
+def test_levels_per_logger_from_environment(monkeypatch):
+    monkeypatch.setenv("LOG_LEVEL", "warning")
+    monkeypatch.setenv("LOG_LEVELS", "CompanyDatastore=DEBUG, dependencies.user=error")
+
+    settings = LogSettings()
+
+    assert settings.level_for("CompanyDatastore") == DEBUG
+    assert settings.level_for("dependencies.user") == ERROR
+    assert settings.level_for("main") == WARNING
+
+
+def test_invalid_level_is_rejected():
+    with pytest.raises(ValidationError):
+        LogSettings(levels="CompanyDatastore=LOUD")
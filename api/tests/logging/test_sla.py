@@ -0,0 +1,105 @@
+import asyncio
+import time
+from unittest.mock import Mock
+
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.logging.sla import RequestTimingListener, SLALogger, SLAMiddleware, SLASettings, auth_timer
+
+
+def _create_app(settings: SLASettings) -> tuple[FastAPI, Mock]:
+    app = FastAPI()
+    sla_logger = Mock(SLALogger)
+    app.add_middleware(SLAMiddleware, settings=settings, sla_logger=sla_logger)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        with auth_timer():
+            time.sleep(0.001)
+        listener = RequestTimingListener()
+        await run_in_threadpool(listener.succeeded, Mock(duration_micros=2000))
+        await run_in_threadpool(listener.succeeded, Mock(duration_micros=3000))
+        return {"id": item_id}
+
+    @app.get("/fails")
+    async def fails():
+        raise HTTPException(503, "Unavailable")
+
+    return app, sla_logger
+
+
+def _get(app: FastAPI, path: str) -> list[dict]:
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 8000),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages
+
+
+def test_logs_route_template_and_timings():
+    app, sla_logger = _create_app(SLASettings())
+
+    messages = _get(app, "/items/42")
+
+    entry = sla_logger.log_sla.call_args.args[0]
+    assert entry["method"] == "GET"
+    assert entry["route"] == "/items/{item_id}"
+    assert entry["status"] == 200
+    assert entry["db_calls"] == 2
+    assert entry["db_ms"] == 5
+    assert entry["auth_ms"] >= 1
+    assert entry["response_bytes"] == len(messages[1]["body"]) == len(b'{"id":"42"}')
+    assert entry["latency_ms"] >= entry["auth_ms"]
+    assert entry["sampled"] is True
+
+
+def test_unsampled_requests_are_not_logged_unless_failed_or_slow():
+    app, sla_logger = _create_app(SLASettings(sample_rate=0))
+
+    _get(app, "/items/42")
+    sla_logger.log_sla.assert_not_called()
+
+    _get(app, "/fails")
+    assert sla_logger.log_sla.call_args.args[0]["status"] == 503
+    assert sla_logger.log_sla.call_args.args[0]["sampled"] is False
+
+    app, sla_logger = _create_app(SLASettings(sample_rate=0, slow_threshold_ms=0))
+    _get(app, "/items/42")
+    assert sla_logger.log_sla.call_args.args[0]["sampled"] is False
+
+
+def test_unmatched_route():
+    app, sla_logger = _create_app(SLASettings())
+
+    _get(app, "/nothing/here")
+
+    entry = sla_logger.log_sla.call_args.args[0]
+    assert entry["route"] == "unmatched"
+    assert entry["status"] == 404
+
+
+def test_disabled():
+    app, sla_logger = _create_app(SLASettings(enabled=False))
+
+    _get(app, "/items/42")
+
+    sla_logger.log_sla.assert_not_called()
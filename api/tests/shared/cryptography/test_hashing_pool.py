@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.shared.cryptography import password_hasher
+from app.shared.cryptography.hashing_pool import HashingPool
+from app.shared.errors.errors import ServiceUnavailableError
+
+
+def test_hash_and_verify_are_awaitable():
+    target = HashingPool(1, 1)
+
+    async def run():
+        hashed = await target.hash_password("Password", b"salt")
+        return hashed, await target.is_correct_password("Password", hashed)
+
+    hashed, correct = asyncio.run(run())
+
+    assert hashed == password_hasher.hash_password("Password", b"salt")
+    assert correct
+    assert target.pending == 0
+
+
+def test_rejects_when_pool_is_full(monkeypatch):
+    release = threading.Event()
+
+    def blocking_hash(password: str, salt: bytes) -> str:
+        release.wait(5)
+        return "hash"
+
+    monkeypatch.setattr(password_hasher, "hash_password", blocking_hash)
+    target = HashingPool(1, 2)
+
+    async def run():
+        running = [asyncio.create_task(target.hash_password("Password", b"salt")) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert target.pending == 2
+        with pytest.raises(ServiceUnavailableError):
+            await target.hash_password("Password", b"salt")
+        release.set()
+        return await asyncio.gather(*running)
+
+    assert asyncio.run(run()) == ["hash", "hash"]
+    assert target.pending == 0
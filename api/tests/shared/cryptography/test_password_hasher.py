@@ -0,0 +1,56 @@
+"""Tests for password_hasher. The benchmarks run with RUN_BENCHMARKS=1."""
+import time
+
+import pytest
+
+from app.shared.cryptography import password_hasher
+from app.shared.cryptography.password_hasher import PasswordHashPolicy, PBKDF2_SHA512, SCRYPT
+
+ROUNDS = 20
+
+
+def _best_of(function, *args) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _assert_no_more_than_key_derivation(policy: PasswordHashPolicy) -> None:
+    salt = password_hasher.generate_salt(policy.salt_length)
+    hashed = password_hasher.hash_password("Password", salt, policy)
+    derive = _best_of(password_hasher._derive, "Password", salt, policy.algorithm, policy.parameters())
+    hash_time = _best_of(password_hasher.hash_password, "Password", salt, policy)
+    verify = _best_of(password_hasher.is_correct_password, "Password", hashed)
+    timings = f"derive={derive * 1000:.3f}ms, hash={hash_time * 1000:.3f}ms, verify={verify * 1000:.3f}ms"
+
+    assert hash_time < derive * 1.5, timings
+    assert verify < derive * 1.5, timings
+
+
+@pytest.mark.benchmark
+def test_benchmark_pbkdf2_hash_and_verify_cost_no_more_than_key_derivation():
+    _assert_no_more_than_key_derivation(PasswordHashPolicy(algorithm=PBKDF2_SHA512, pbkdf2_iterations=10000))
+
+
+@pytest.mark.benchmark
+def test_benchmark_scrypt_hash_and_verify_cost_no_more_than_key_derivation():
+    _assert_no_more_than_key_derivation(PasswordHashPolicy(algorithm=SCRYPT, scrypt_n=2**10))
+
+
+def test_is_correct_password_compares_in_constant_time(monkeypatch):
+    compared = []
+
+    def compare_digest(a, b):
+        compared.append((a, b))
+        return a == b
+
+    monkeypatch.setattr(password_hasher.hmac, "compare_digest", compare_digest)
+    policy = PasswordHashPolicy(pbkdf2_iterations=1000)
+    hashed = password_hasher.hash_password("Password", b"salt" * 8, policy)
+
+    assert password_hasher.is_correct_password("Password", hashed)
+    assert len(compared) == 1
+    assert all(isinstance(value, bytes) and len(value) == password_hasher.DIGEST_LENGTH for value in compared[0])
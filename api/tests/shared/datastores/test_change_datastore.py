@@ -0,0 +1,43 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from bson import ObjectId
+
+from app.database.abstract.async_document_database import AsyncDocumentCollection
+from app.shared.datastores.change_datastore import ChangeDatastore
+from app.shared.models.db.change import Change, ChangeType
+from tests.fixtures.mongo_document_database_fixtures import get_async_document
+
+
+def test_add_change_stores_change_with_entity(doc_database_collection_mocks, doc_id):
+    db, collection = doc_database_collection_mocks
+    change = Change.create(doc_id, "status", ChangeType.update, "nisse@perssons.se", "active")
+
+    asyncio.run(ChangeDatastore(db).add_change("companies", "62e00647e98e01ef28be554b", change))
+
+    db.collection.assert_called_with("changes")
+    data = collection.add.call_args.args[0]
+    assert data["change_id"] == doc_id
+    assert "id" not in data
+    assert data["entity_type"] == "companies"
+    assert data["entity_id"] == "62e00647e98e01ef28be554b"
+
+
+def test_get_changes_pages_in_time_order(doc_database_collection_mocks, doc_id):
+    db, collection = doc_database_collection_mocks
+    change = Change.create(doc_id, "status", ChangeType.update, "nisse@perssons.se", "active")
+    stored = {"_id": ObjectId(), "change_id": doc_id, **change.dict(exclude={"id"})}
+    cursor = Mock(AsyncDocumentCollection)
+    cursor.sort.return_value = cursor
+    cursor.skip.return_value = cursor
+    cursor.take.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=[get_async_document(stored, collection)])
+    collection.get.return_value = cursor
+
+    result = asyncio.run(ChangeDatastore(db).get_changes("62e00647e98e01ef28be554b", 20, 10))
+
+    collection.get.assert_called_once_with({"entity_id": "62e00647e98e01ef28be554b"})
+    cursor.sort.assert_called_once_with("changed_at", "asc")
+    cursor.skip.assert_called_once_with(20)
+    cursor.take.assert_called_once_with(10)
+    assert result == [change]
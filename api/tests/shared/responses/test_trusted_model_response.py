@@ -0,0 +1,149 @@
+"""Tests for TrustedModelResponse, compared with the body FastAPI renders with response_model."""
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import APIRouter, Request
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import ValidationError
+from pytz import utc
+from starlette.responses import JSONResponse
+
+from app.company.models.db.company import Company
+from app.company.models.db.contact import Contact
+from app.company.models.shared.enums import ContactType
+from app.company.models.v1.company_api_models import CompanyOutListModel, CompanyOutModel
+from app.shared.models.v1.paging_response_model import PagingResponseModel
+from app.shared.models.v1.shared import Language
+from app.shared.responses.trusted_model_response import TrustedModelResponse
+
+ROUNDS = 20
+ROUTER = APIRouter(prefix="/v1/{lang}/companies")
+
+
+def _request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("localhost", 8000),
+            "path": "/v1/SV/companies/",
+            "root_path": "",
+            "query_string": b"take=100",
+            "headers": [],
+        }
+    )
+
+
+def _company(index: int) -> Company:
+    return Company(
+        id=str(ObjectId()),
+        name={"SV": f"Företag {index}", "EN": f"Company {index}"},
+        status="active",
+        created_date=datetime(2022, 8, 1, 10, 30, 15, 123000, tzinfo=utc),
+        company_types=["producer"],
+        content_languages_iso=[Language.SV, Language.EN],
+        activation_date=datetime(2022, 8, 2, tzinfo=utc),
+        description={"SV": "Potatis och morötter"},
+        external_website_url="https://perssons.se",
+        profile_picture_url=f"{index}/profile-picture",
+        contacts=[
+            Contact(
+                id=str(ObjectId()),
+                type=ContactType.email,
+                value="nisse@perssons.se",
+                description=None,
+                created_by="nisse@perssons.se",
+                created_at=datetime(2022, 8, 1, tzinfo=utc),
+            )
+        ],
+    )
+
+
+def _page(request: Request) -> PagingResponseModel[CompanyOutListModel]:
+    items = [
+        CompanyOutListModel.from_database_model(_company(index), Language.SV, "Europe/Stockholm", request, ROUTER, None)
+        for index in range(100)
+    ]
+    return PagingResponseModel[CompanyOutListModel].create(items, 0, 100, _request(), 1000)
+
+
+async def _validated_body(response_model, content) -> bytes:
+    """The body FastAPI renders for a route returning content, with response_model."""
+    field = create_response_field(name="Response", type_=response_model)
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+def test_same_body_as_validated_response():
+    request = _request()
+    company = CompanyOutModel.from_database_model(_company(1), Language.EN, "Europe/Stockholm", request, ROUTER, None)
+    page = _page(request)
+
+    assert TrustedModelResponse(company, validate=False).body == asyncio.run(_validated_body(CompanyOutModel, company))
+    assert TrustedModelResponse(page, validate=False).body == asyncio.run(
+        _validated_body(PagingResponseModel[CompanyOutListModel], page)
+    )
+    assert json.loads(TrustedModelResponse(company, validate=False).body)["contacts"][0]["operations"] == []
+
+
+def test_list_of_models_and_status_code():
+    company = CompanyOutModel.from_database_model(_company(1), Language.SV, "UTC", _request(), ROUTER, None)
+
+    response = TrustedModelResponse([company], 201, validate=False)
+
+    assert response.status_code == 201
+    assert response.body == asyncio.run(_validated_body(list[CompanyOutModel], [company]))
+
+
+def test_validate_serializes_validated_models():
+    company = CompanyOutModel.from_database_model(_company(1), Language.SV, "UTC", _request(), ROUTER, None)
+    company.status = "unknown"
+
+    assert json.loads(TrustedModelResponse(company, validate=False).body)["status"] == "unknown"
+    with pytest.raises(ValidationError):
+        TrustedModelResponse(company, response_model=CompanyOutModel, validate=True)
+
+
+class AuditedCompanyOutModel(CompanyOutModel):
+    audited_by: str
+
+
+def test_validate_filters_by_response_model_as_fastapi():
+    company = CompanyOutModel.from_database_model(_company(1), Language.SV, "UTC", _request(), ROUTER, None)
+    audited = AuditedCompanyOutModel(**company.dict(), audited_by="nisse@perssons.se")
+
+    response = TrustedModelResponse([audited], response_model=list[CompanyOutModel], validate=True)
+
+    assert response.body == asyncio.run(_validated_body(list[CompanyOutModel], [audited]))
+    assert "audited_by" not in json.loads(response.body)[0]
+
+
+def test_validate_needs_response_model():
+    with pytest.raises(ValueError):
+        TrustedModelResponse({}, validate=True)
+
+
+@pytest.mark.benchmark
+def test_benchmark_page_of_100_companies_is_faster_without_validation():
+    page = _page(_request())
+    response_model = PagingResponseModel[CompanyOutListModel]
+
+    async def benchmark() -> tuple[float, float]:
+        validated, trusted = [], []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            await _validated_body(response_model, page)
+            validated.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            TrustedModelResponse(page, validate=False)
+            trusted.append(time.perf_counter() - start)
+        return min(validated), min(trusted)
+
+    validated, trusted = asyncio.run(benchmark())
+
+    assert trusted < validated, f"response_model={validated * 1000:.3f}ms, trusted={trusted * 1000:.3f}ms"
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+import pytest
+
+from app.company.models.shared.enums import CompanyStatus
+from app.shared.errors.errors import InvalidContinuationTokenError
+from app.shared.utils.continuation_token import ContinuationToken
+
+
+@pytest.mark.parametrize("last_value", [None, "Nisse", 12, datetime(2022, 7, 26, 14, 30, 5, 123000)])
+def test_encode_decode_round_trip(last_value):
+    token = ContinuationToken("62e00647e98e01ef28be554b", "created_date", last_value, "desc")
+
+    encoded = token.encode()
+
+    assert "=" not in encoded
+    assert ContinuationToken.decode(encoded) == token
+
+
+def test_after_item_reads_id_and_sort_value():
+    item = {"id": "62e00647e98e01ef28be554b", "status": CompanyStatus.active}
+
+    token = ContinuationToken.decode(ContinuationToken.after_item(item, "status", "asc").encode())
+
+    assert token.last_id == "62e00647e98e01ef28be554b"
+    assert token.last_value == "active"
+    assert token.sort_by == "status"
+    assert token.sort_order == "asc"
+
+
+@pytest.mark.parametrize(
+    "token", ["not a token", "bm90IGpzb24", "eyJpIjoiMSJ9", "eyJpIjoiMSIsInMiOm51bGwsInYiOm51bGwsIm8iOiJ4In0"]
+)
+def test_decode_invalid_token_raises(token):
+    with pytest.raises(InvalidContinuationTokenError):
+        ContinuationToken.decode(token)
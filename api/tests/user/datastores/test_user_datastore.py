@@ -1,15 +1,20 @@
 """Tests for user_datastore module."""
+import asyncio
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 from bson import ObjectId
 from pytz import utc
 
-from app.database.mongo.mongo_document_database import MongoDocument
+from app.authentication.cache.token_cache import TokenCache
+from app.database.abstract.async_document_database import AsyncDocumentCollection
+from app.database.abstract.document_database import BulkWriteItemResult, BulkWriteResult
+from app.database.mongo.mongo_document_database import MongoDBBulkOperations, MongoDBUpdateContext
 from app.shared.models.v1.shared import RoleType
 from app.user.datastores.role_datastore import RoleDatastore
 from app.user.datastores.user_datastore import UserDatastore
 from app.user.models.db.role import RoleDatabaseModel
+from tests.fixtures.mongo_document_database_fixtures import get_async_document
 
 
 def test_add_role_to_user_can_add_role(
@@ -34,10 +39,99 @@ def test_add_role_to_user_can_add_role(
     db, collection = doc_database_collection_mocks
     role_datastore = Mock(RoleDatastore)
     role_datastore.get_role.return_value = fake_role
-    collection.by_id.return_value = MongoDocument(fake_user, collection)
+    collection.by_id.return_value = get_async_document(fake_user, collection)
     db.collection.return_value = collection
 
     target = UserDatastore(db, role_datastore, file_manager)
-    target.add_role_to_user(authenticated_user_default, doc_id, "company_admin", company_id)
+    asyncio.run(target.add_role_to_user(authenticated_user_default, doc_id, "company_admin", company_id))
 
     collection.update_document.assert_called_once()
+
+
+def test_add_role_to_users_uses_one_bulk_write(
+    authenticated_user_default, company_id, file_manager, doc_database_collection_mocks
+):
+    user_ids = [str(ObjectId()), str(ObjectId()), str(ObjectId())]
+    fake_role = RoleDatabaseModel(id=str(ObjectId()), name="company_member", type=RoleType.company_role)
+    db, collection = doc_database_collection_mocks
+    db.update_context.side_effect = MongoDBUpdateContext
+    db.bulk_operations.side_effect = MongoDBBulkOperations
+    role_datastore = Mock(RoleDatastore)
+    role_datastore.get_role.return_value = fake_role
+    existing_users = Mock(AsyncDocumentCollection)
+    existing_users.to_list = AsyncMock(
+        return_value=[
+            get_async_document({"_id": ObjectId(user_ids[2])}, collection),
+            get_async_document({"_id": ObjectId(user_ids[0])}, collection),
+        ]
+    )
+    collection.get.return_value = existing_users
+    collection.bulk_write.return_value = BulkWriteResult(
+        items=[
+            BulkWriteItemResult(index=0, operation="update", doc_id=user_ids[0], ok=True),
+            BulkWriteItemResult(index=1, operation="update", doc_id=user_ids[2], ok=False, error="Failed"),
+        ],
+        matched_count=1,
+        modified_count=1,
+    )
+
+    target = UserDatastore(db, role_datastore, file_manager)
+    result = asyncio.run(
+        target.add_role_to_users(authenticated_user_default, user_ids + [user_ids[0]], "company_member", company_id)
+    )
+
+    collection.get.assert_called_once_with({"id": {"$in": user_ids}}, ["_id"])
+    operations = collection.bulk_write.call_args.args[0]
+    assert len(operations) == 2
+    assert collection.bulk_write.call_args.kwargs == {"ordered": False}
+    assert [(item.index, item.doc_id, item.ok) for item in result.items] == [
+        (0, user_ids[0], True),
+        (1, user_ids[1], False),
+        (2, user_ids[2], False),
+    ]
+    assert result.items[1].error == "User not found."
+    collection.add_many.assert_called_once()
+    assert [change["entity_id"] for change in collection.add_many.call_args.args[0]] == [user_ids[0]]
+
+
+def test_delete_user_invalidates_cached_tokens(monkeypatch, file_manager, doc_database_collection_mocks, doc_id):
+    token_cache = Mock(TokenCache)
+    monkeypatch.setattr("app.user.datastores.user_datastore.get_token_cache", Mock(return_value=token_cache))
+    db, collection = doc_database_collection_mocks
+    collection.by_id.return_value = get_async_document({"_id": ObjectId(doc_id)}, collection)
+
+    target = UserDatastore(db, Mock(RoleDatastore), file_manager)
+    asyncio.run(target.delete_user(doc_id))
+
+    collection.delete.assert_called_once_with(doc_id)
+    token_cache.invalidate_user.assert_called_once_with(doc_id)
+
+
+def test_add_role_to_users_reports_invalid_ids_as_not_found(
+    authenticated_user_default, company_id, file_manager, doc_database_collection_mocks
+):
+    user_id = str(ObjectId())
+    db, collection = doc_database_collection_mocks
+    db.update_context.side_effect = MongoDBUpdateContext
+    db.bulk_operations.side_effect = MongoDBBulkOperations
+    role_datastore = Mock(RoleDatastore)
+    role_datastore.get_role.return_value = RoleDatabaseModel(
+        id=str(ObjectId()), name="company_member", type=RoleType.company_role
+    )
+    existing_users = Mock(AsyncDocumentCollection)
+    existing_users.to_list = AsyncMock(return_value=[get_async_document({"_id": ObjectId(user_id)}, collection)])
+    collection.get.return_value = existing_users
+    collection.bulk_write.return_value = BulkWriteResult(
+        items=[BulkWriteItemResult(index=0, operation="update", doc_id=user_id, ok=True)]
+    )
+
+    target = UserDatastore(db, role_datastore, file_manager)
+    result = asyncio.run(
+        target.add_role_to_users(authenticated_user_default, ["not-an-id", user_id], "company_member", company_id)
+    )
+
+    collection.get.assert_called_once_with({"id": {"$in": [user_id]}}, ["_id"])
+    assert [(item.doc_id, item.ok, item.error) for item in result.items] == [
+        ("not-an-id", False, "User not found."),
+        (user_id, True, None),
+    ]
@@ -1,8 +1,12 @@
+import json
+
 from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 
 from app.shared.models.v1.shared import Language, CountryCode
 from app.user.models.v1.user_api_models import UserOutModel
-from tests.fixtures.user_fixtures import get_user
+from tests.fixtures.user_fixtures import get_role, get_user
 
 
 def test_user_out_model_from_database_model(http_request):
@@ -23,3 +27,44 @@ def test_user_out_model_from_database_model(http_request):
         Language.SV,
     )
     assert result is not None
+
+
+def test_user_out_model_dict_from_document_gives_same_json_as_model(http_request):
+    user = get_user(
+        user_id="62dff56418a15da3e2708434",
+        email="modscorpiogrl@gmail.com",
+        firstname="Cecilia",
+        lastname="Miller",
+        city="Visby",
+        country_iso=CountryCode.SE,
+        timezone="Europe/Stockholm",
+        language_iso=Language.SV,
+        verified=True,
+        roles=[get_role(reference="62e00647e98e01ef28be554b").dict()],
+    )
+    doc = json.loads(user.json(include={"id", *UserOutModel.document_fields()}))
+    doc["created"] = user.created
+
+    expected = jsonable_encoder(UserOutModel.from_database_model(user, http_request, APIRouter(), Language.SV))
+    result = ORJSONResponse(UserOutModel.dict_from_document(doc, http_request, APIRouter(), Language.SV))
+
+    assert json.loads(result.body) == expected
+    assert "password_hash" not in UserOutModel.document_fields()
+
+
+def test_user_out_model_dict_from_document_uses_model_defaults(http_request):
+    doc = {
+        "id": "62dff56418a15da3e2708434",
+        "email": "nisse@perssons.se",
+        "firstname": "Nisse",
+        "lastname": "Persson",
+        "city": "Visby",
+        "country_iso": "SE",
+        "created": "2022-08-01T10:30:15",
+    }
+
+    result = UserOutModel.dict_from_document(doc, http_request, APIRouter(), Language.SV)
+
+    assert list(result) == list(UserOutModel.__fields__)
+    assert (result["timezone"], result["language_iso"], result["verified"]) == ("Europe/Stockholm", Language.SV, True)
+    assert (result["roles"], result["last_logged_in"], result["profile_picture_url"]) == ([], None, None)